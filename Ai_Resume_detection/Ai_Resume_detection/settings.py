@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -135,6 +136,33 @@ USE_TZ = True
 
 STATIC_URL = '/static/'
 
+# NLP models
+# Serving processes load these in ExtractorConfig.ready() instead of on the first
+# request. `runserver` always does; other servers (uvicorn, streamlit) opt in
+# with NLP_WARMUP=1. Management commands never do. Under gunicorn.conf.py the
+# master process loads every model once before forking the workers instead.
+NLP_WARMUP = os.environ.get("NLP_WARMUP") == "1"
+NLP_WARMUP_MODELS = ["extractor"]
+
+# PDF text extraction (see extractor/pdf_text.py)
+# Backend is "auto", "pypdf2" or "pdfplumber"; None disables a limit.
+PDF_BACKEND = "auto"
+PDF_MAX_PAGES = 50
+PDF_MAX_CHARS = 200_000
+
+# ATS job-description keyword cache (see extractor/jd_cache.py)
+# Set the alias to a shared cache (e.g. Redis or memcached) so all workers reuse entries.
+ATS_JD_CACHE_SIZE = 256
+ATS_JD_CACHE_ALIAS = None
+
+# Streaming bulk ATS endpoint (see extractor/ats_stream.py): largest resume file accepted.
+# Each file is spooled to disk past FILE_UPLOAD_MAX_MEMORY_SIZE and scored as soon as it arrives.
+ATS_STREAM_MAX_FILE_SIZE = 10 * 1024 * 1024
+
+# `manage.py benchmark` compares its results with this file; record it with
+# --save-baseline on the machine the numbers should be tracked on.
+BENCHMARK_BASELINE = BASE_DIR / "benchmark_baseline.json"
+
 # Default primary key field type
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
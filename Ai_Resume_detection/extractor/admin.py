@@ -1,3 +1,32 @@
 from django.contrib import admin
+from django.contrib.admin.views.main import ORDER_VAR
+from django.db.models import Case, IntegerField, Value, When
 
-# Register your models here.
+from .models import Resume
+from .search import search_ids
+
+
+@admin.register(Resume)
+class ResumeAdmin(admin.ModelAdmin):
+    list_display = ("name", "email", "skills", "uploaded_at")
+    search_fields = ("name", "email")
+    search_help_text = 'Searches resume text: words, "phrases" and prefixes like devel*'
+
+    def get_search_results(self, request, queryset, search_term):
+        """Full-text matches in BM25 order, then name/email matches, unless a column header was clicked."""
+        matches, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if not search_term:
+            return matches, may_have_duplicates
+
+        ids = search_ids(search_term)
+        # Keep any list filters already applied to ``queryset``
+        queryset = matches | queryset.filter(pk__in=ids)
+        if ORDER_VAR not in request.GET:
+            queryset = queryset.annotate(
+                search_rank=Case(
+                    *[When(pk=pk, then=Value(position)) for position, pk in enumerate(ids)],
+                    default=Value(len(ids)),
+                    output_field=IntegerField(),
+                )
+            ).order_by("search_rank", "-pk")
+        return queryset, may_have_duplicates
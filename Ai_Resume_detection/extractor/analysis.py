@@ -0,0 +1,105 @@
+from .model_registry import get_model
+from .sections import index_sections
+
+
+# Components no extractor reads; they are never loaded
+UNUSED_COMPONENTS = ["tagger", "parser", "attribute_ruler", "lemmatizer"]
+
+
+def load_pipeline(name="en_core_web_sm"):
+    """
+    Load ``name`` with only the components the extractors use: NER for company
+    names and a rule-based sentencizer (instead of the parser) for summaries.
+    """
+    import spacy
+
+    nlp = spacy.load(name, exclude=UNUSED_COMPONENTS)
+    if "sentencizer" not in nlp.pipe_names:
+        nlp.add_pipe("sentencizer", first=True)
+    return nlp
+
+
+def components_for(nlp, needs):
+    """Return the pipe names to disable when only the ``needs`` annotations are wanted."""
+    wanted = set()
+    if "sents" in needs:
+        wanted.add("sentencizer")
+    if "ents" in needs:
+        wanted.add("ner")
+        # Only run the shared tok2vec when NER listens to it
+        if "tok2vec" in nlp.pipe_names:
+            listeners = getattr(nlp.get_pipe("tok2vec"), "listening_components", [])
+            if "ner" in listeners:
+                wanted.add("tok2vec")
+    return [name for name in nlp.pipe_names if name not in wanted]
+
+
+class ResumeAnalysis:
+    """
+    Per-resume state shared by the field extractors.
+
+    The section index is built once, and the text is run through spaCy at most
+    once: only when a field has no section to slice from, and only with the
+    components those fallbacks need. ``nlp`` defaults to the shared "extractor"
+    model, which is not loaded until a Doc is actually needed.
+    """
+
+    def __init__(self, text, nlp=None):
+        self.text = text or ""
+        self._nlp = nlp
+        self._sections = None
+        self._doc = None
+
+    @property
+    def nlp(self):
+        if self._nlp is None:
+            self._nlp = get_model("extractor")
+        return self._nlp
+
+    @property
+    def sections(self):
+        if self._sections is None:
+            self._sections = index_sections(self.text)
+        return self._sections
+
+    @property
+    def needs(self):
+        """Annotations the fallback paths will ask for."""
+        needs = set()
+        if not self.sections.get("summary"):
+            needs.add("sents")
+        if not self.sections.get("experience"):
+            needs.add("ents")
+        return needs
+
+    @property
+    def doc(self):
+        if self._doc is None:
+            self._doc = self.nlp(self.text, disable=components_for(self.nlp, self.needs))
+        return self._doc
+
+
+def parse_many(analyses, nlp=None, batch_size=32):
+    """
+    Fill in the Doc of every analysis that will need one, with ``nlp.pipe``.
+
+    Analyses are grouped by the annotations they need, so each group runs
+    through the same trimmed pipeline in batches.
+    """
+    nlp = nlp or get_model("extractor")
+    groups = {}
+    for analysis in analyses:
+        needs = frozenset(analysis.needs)
+        if needs and analysis._doc is None:
+            groups.setdefault(needs, []).append(analysis)
+
+    for needs, group in groups.items():
+        docs = nlp.pipe(
+            (analysis.text for analysis in group),
+            disable=components_for(nlp, needs),
+            batch_size=batch_size,
+        )
+        for analysis, doc in zip(group, docs):
+            analysis._nlp = nlp
+            analysis._doc = doc
+
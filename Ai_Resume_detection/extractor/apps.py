@@ -1,6 +1,36 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
+from django.db.models.signals import post_migrate
+
+
+def is_serving_process():
+    """True for processes that answer requests, false for migrate/shell/etc."""
+    if settings.NLP_WARMUP:
+        return True
+    # With the autoreloader, only the child process (RUN_MAIN) serves requests
+    return sys.argv[1:2] == ["runserver"] and (
+        os.environ.get("RUN_MAIN") == "true" or "--noreload" in sys.argv
+    )
+
+
+def ensure_search_triggers(using="default", **kwargs):
+    # Table rebuilds in SQLite migrations drop the full-text sync triggers
+    from .search import ensure_sqlite_triggers
+    ensure_sqlite_triggers(using)
 
 
 class ExtractorConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'extractor'
+
+    def ready(self):
+        post_migrate.connect(ensure_search_triggers, sender=self)
+        if is_serving_process():
+            from .model_registry import warm_up_in_background
+            from .nlp_service import service_available
+            # With the shared NLP service running, this process never needs its own models
+            if not service_available():
+                warm_up_in_background(settings.NLP_WARMUP_MODELS)
@@ -0,0 +1,82 @@
+"""
+Batch ATS scoring.
+
+Scores many resumes against many job descriptions at once: every document is
+tokenized a single time into a sparse binary term matrix, and all match
+counts come out of one sparse matrix product. Scores are the same as
+``utils.ats_checker`` computes pair by pair.
+"""
+import numpy as np
+from sklearn.feature_extraction.text import CountVectorizer
+
+
+# Same tokens as ats_checker: runs of ASCII letters in the lowercased text
+TOKEN_PATTERN = r"\b[a-zA-Z]+\b"
+
+
+def _term_matrices(resume_texts, job_descriptions):
+    vectorizer = CountVectorizer(lowercase=True, token_pattern=TOKEN_PATTERN, binary=True, dtype=np.int32)
+    matrix = vectorizer.fit_transform(list(resume_texts) + list(job_descriptions)).tocsr()
+    n = len(resume_texts)
+    return matrix[:n], matrix[n:], vectorizer.get_feature_names_out()
+
+
+def _matched_terms(rows, vector, vocabulary):
+    """For each row of ``rows``, the terms it shares with the single-row ``vector``."""
+    shared = rows.multiply(vector).tocsr()
+    # Vocabulary indices are alphabetical, so sorted indices give sorted terms
+    shared.sort_indices()
+    return [
+        vocabulary[shared.indices[shared.indptr[i]:shared.indptr[i + 1]]].tolist()
+        for i in range(shared.shape[0])
+    ]
+
+
+def ats_score_matrix(resume_texts, job_descriptions, with_keywords=True):
+    """
+    Score every resume against every job description.
+
+    Returns a list with one row per resume, each holding one ``ats_checker``
+    style result per job description. Matched keywords are sorted
+    alphabetically; pass ``with_keywords=False`` to skip building them.
+    """
+    resume_texts = [text or "" for text in resume_texts]
+    job_descriptions = [text or "" for text in job_descriptions]
+    if not resume_texts or not job_descriptions:
+        return [[] for _ in resume_texts]
+
+    try:
+        resumes, jobs, vocabulary = _term_matrices(resume_texts, job_descriptions)
+    except ValueError:
+        # No document had a single token
+        return [[{"error": "No keywords found in job description."} for _ in job_descriptions] for _ in resume_texts]
+
+    matched = (resumes @ jobs.T).toarray()
+    totals = jobs.getnnz(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        percentages = np.where(totals > 0, matched * 100.0 / totals, 0.0)
+
+    keywords = None
+    if with_keywords:
+        # Walk whichever side is shorter, one sparse row-wise product per step
+        if len(resume_texts) <= len(job_descriptions):
+            keywords = [_matched_terms(jobs, resumes[i], vocabulary) for i in range(len(resume_texts))]
+        else:
+            per_job = [_matched_terms(resumes, jobs[j], vocabulary) for j in range(len(job_descriptions))]
+            keywords = [list(row) for row in zip(*per_job)]
+
+    results = []
+    for i in range(len(resume_texts)):
+        row = []
+        for j in range(len(job_descriptions)):
+            if not totals[j]:
+                row.append({"error": "No keywords found in job description."})
+                continue
+            row.append({
+                "total_jd_keywords": int(totals[j]),
+                "matched_keywords": keywords[i][j] if keywords else [],
+                "match_count": int(matched[i, j]),
+                "match_percentage": round(float(percentages[i, j]), 2),
+            })
+        results.append(row)
+    return results
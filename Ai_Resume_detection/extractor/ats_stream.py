@@ -0,0 +1,212 @@
+"""
+Streaming bulk ATS scoring.
+
+A multipart request is read part by part with the pieces Django's own
+MultiPartParser is built from, instead of parsing the whole body up front.
+Each resume file is spooled (in memory up to FILE_UPLOAD_MAX_MEMORY_SIZE,
+then on disk), scored against the job description, and closed before the
+next part is read, so the server holds one file at a time and the first
+result goes out while later files are still uploading.
+
+Results are newline-delimited JSON: one line per resume, then a summary line.
+"""
+import os
+import json
+import logging
+import tempfile
+
+from django.conf import settings
+from django.http.multipartparser import FIELD, FILE, ChunkIter, LazyStream, MultiPartParserError, Parser, exhaust
+from django.utils.encoding import force_str
+from django.utils.http import parse_header_parameters
+
+from .blobs import cached_text, stored_resume_text
+from .utils import ats_checker
+
+logger = logging.getLogger(__name__)
+
+# WSGI reads block until a chunk is full, so results trail the upload by up to one chunk
+CHUNK_SIZE = 16 * 1024
+DEFAULT_MAX_FILE_SIZE = 10 * 1024 * 1024
+# Stored resumes fetched per query
+ID_CHUNK = 200
+
+
+class StreamError(Exception):
+    pass
+
+
+def file_type_of(file_name):
+    file_name = (file_name or "").lower()
+    if file_name.endswith(".pdf"):
+        return "pdf"
+    if file_name.endswith(".docx"):
+        return "docx"
+    return None
+
+
+def parse_ids(values):
+    """Resume ids from repeated fields and/or comma-separated values; anything else is kept for the error."""
+    ids = []
+    for value in values:
+        for part in str(value).split(","):
+            part = part.strip()
+            if part:
+                # isdigit() alone also accepts digits such as "²", which int() rejects
+                ids.append(int(part) if part.isascii() and part.isdigit() else part)
+    return ids
+
+
+# ------------------- Multipart -------------------
+def iter_multipart(request):
+    """
+    Yield ("field", name, value) and ("file", name, file_name, spooled file)
+    items in body order. A file is only valid until the next item is requested.
+    """
+    content_type, params = parse_header_parameters(request.META.get("CONTENT_TYPE", ""))
+    boundary = params.get("boundary")
+    if content_type != "multipart/form-data" or not boundary:
+        raise StreamError("Expected a multipart/form-data body.")
+    try:
+        length = int(request.META.get("CONTENT_LENGTH") or 0)
+    except ValueError:
+        length = 0
+
+    max_file_size = getattr(settings, "ATS_STREAM_MAX_FILE_SIZE", DEFAULT_MAX_FILE_SIZE)
+    max_field_size = settings.DATA_UPLOAD_MAX_MEMORY_SIZE
+    max_fields = settings.DATA_UPLOAD_MAX_NUMBER_FIELDS
+    encoding = request.encoding or settings.DEFAULT_CHARSET
+    fields = 0
+
+    stream = LazyStream(ChunkIter(request, CHUNK_SIZE), length or None)
+    try:
+        for item_type, meta_data, part in Parser(stream, boundary.encode("ascii")):
+            try:
+                disposition = meta_data.get("content-disposition")
+                if not disposition:
+                    continue
+                name = force_str(disposition[1].get("name", ""), encoding, errors="replace").strip()
+
+                if item_type == FIELD:
+                    fields += 1
+                    if max_fields is not None and fields > max_fields:
+                        raise StreamError("Too many fields.")
+                    limit = max_field_size + 1 if max_field_size is not None else -1
+                    raw = part.read(limit)
+                    if max_field_size is not None and len(raw) > max_field_size:
+                        raise StreamError(f"Field {name!r} is too large.")
+                    yield ("field", name, raw.decode(encoding, "replace"))
+
+                elif item_type == FILE:
+                    # Only the base name, as Django's own parser keeps it
+                    file_name = os.path.basename(force_str(disposition[1].get("filename", ""), encoding, errors="replace"))
+                    with tempfile.SpooledTemporaryFile(max_size=settings.FILE_UPLOAD_MAX_MEMORY_SIZE) as spool:
+                        size = 0
+                        for chunk in part:
+                            size += len(chunk)
+                            if size > max_file_size:
+                                break
+                            spool.write(chunk)
+                        if size > max_file_size:
+                            yield ("error", name, file_name, f"File is larger than {max_file_size} bytes.")
+                        else:
+                            spool.seek(0)
+                            yield ("file", name, file_name, spool)
+            finally:
+                # Skip whatever the consumer did not read of this part
+                exhaust(part)
+        exhaust(stream)
+    except MultiPartParserError as exc:
+        raise StreamError(str(exc)) from exc
+
+
+# ------------------- Scoring -------------------
+def _line(item):
+    return json.dumps(item) + "\n"
+
+
+def _score_file(file_name, spool, job_description):
+    file_type = file_type_of(file_name)
+    if file_type is None:
+        return {"file": file_name, "error": "Unsupported file type."}
+    # One bad file must not end the stream before the others and the summary line
+    try:
+        text = cached_text(spool, file_type)
+        if not text:
+            return {"file": file_name, "error": "Failed to extract text from the resume."}
+        return {"file": file_name, "ats_result": ats_checker(text, job_description)}
+    except Exception:
+        logger.exception("Scoring %s failed", file_name)
+        return {"file": file_name, "error": "Failed to score the resume."}
+
+
+def _score_ids(ids, job_description):
+    from .models import Resume
+
+    for start in range(0, len(ids), ID_CHUNK):
+        chunk = ids[start:start + ID_CHUNK]
+        stored = Resume.objects.select_related("blob").in_bulk([pk for pk in chunk if isinstance(pk, int)])
+        for pk in chunk:
+            resume = stored.get(pk) if isinstance(pk, int) else None
+            if resume is None:
+                yield {"resume_id": pk, "error": "Resume not found."}
+                continue
+            try:
+                ats_result = ats_checker(stored_resume_text(resume), job_description)
+            except Exception:
+                logger.exception("Scoring resume %s failed", resume.pk)
+                yield {"resume_id": resume.pk, "error": "Failed to score the resume."}
+                continue
+            yield {"resume_id": resume.pk, "name": resume.name, "ats_result": ats_result}
+
+
+def stream_multipart(request):
+    """
+    NDJSON results for a multipart batch. ``job_description`` must come before
+    the files (browsers and HTTP clients send fields in the order they were
+    added); ``resume_ids`` fields may appear anywhere.
+    """
+    job_description = ""
+    scored = errors = 0
+    try:
+        for item in iter_multipart(request):
+            kind, name = item[0], item[1]
+            if kind == "field" and name == "job_description":
+                job_description = item[2].strip()
+                continue
+            if kind == "field" and name == "resume_ids":
+                if not job_description:
+                    raise StreamError("Send job_description before resume_ids.")
+                results = _score_ids(parse_ids([item[2]]), job_description)
+            elif kind in ("file", "error"):
+                if not job_description:
+                    raise StreamError("Send job_description before the resume files.")
+                if kind == "error":
+                    results = [{"file": item[2], "error": item[3]}]
+                else:
+                    results = [_score_file(item[2], item[3], job_description)]
+            else:
+                continue
+
+            for result in results:
+                if "error" in result or "error" in result.get("ats_result", {}):
+                    errors += 1
+                else:
+                    scored += 1
+                yield _line(result)
+    except StreamError as exc:
+        yield _line({"error": str(exc)})
+        errors += 1
+    yield _line({"done": True, "scored": scored, "errors": errors})
+
+
+def stream_ids(job_description, ids):
+    """NDJSON results for stored resumes, fetched ``ID_CHUNK`` at a time."""
+    scored = errors = 0
+    for result in _score_ids(ids, job_description):
+        if "error" in result or "error" in result.get("ats_result", {}):
+            errors += 1
+        else:
+            scored += 1
+        yield _line(result)
+    yield _line({"done": True, "scored": scored, "errors": errors})
@@ -0,0 +1,134 @@
+"""
+Latency, throughput and memory measurements for ``manage.py benchmark``.
+
+Each target is a function called once per item. Timing and memory are taken
+in separate passes, since tracemalloc slows down every allocation: the timed
+passes record the latency of every call and the wall time of the whole run,
+and one more pass under tracemalloc records the peak of Python allocations
+(numpy and spaCy report theirs too) above what was allocated before it.
+
+Results are plain dicts, so they can be written to and compared with a JSON
+baseline.
+"""
+import gc
+import json
+import math
+import time
+import platform
+import tracemalloc
+
+# Metric -> True when a higher value is worse
+METRICS = {
+    "p50_ms": True,
+    "p90_ms": True,
+    "p99_ms": True,
+    "throughput": False,
+    "peak_kib": True,
+}
+# Compared with the baseline by default; p99 over a few dozen calls is mostly noise
+COMPARED_METRICS = ["p50_ms", "p90_ms", "throughput", "peak_kib"]
+
+
+def percentile(sorted_values, q):
+    """The ``q``-th percentile (0-100) of ``sorted_values``, interpolating between ranks."""
+    if not sorted_values:
+        return 0.0
+    rank = (len(sorted_values) - 1) * q / 100
+    low, high = math.floor(rank), math.ceil(rank)
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def measure(fn, items, repeat=3, warmup=1, memory_items=None):
+    """
+    Call ``fn`` on every item ``repeat`` times after ``warmup`` untimed calls.
+    ``memory_items`` (default: ``items``) are run once more under tracemalloc;
+    targets with side effects pass fresh ones.
+    """
+    items = list(items)
+    for item in items[:warmup]:
+        fn(item)
+
+    latencies = []
+    gc.collect()
+    started = time.perf_counter()
+    for _ in range(repeat):
+        for item in items:
+            call_started = time.perf_counter()
+            fn(item)
+            latencies.append(time.perf_counter() - call_started)
+    wall = time.perf_counter() - started
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        baseline = tracemalloc.get_traced_memory()[0]
+        for item in items if memory_items is None else memory_items:
+            fn(item)
+        peak = tracemalloc.get_traced_memory()[1] - baseline
+    finally:
+        tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "calls": len(latencies),
+        "mean_ms": round(sum(latencies) / max(len(latencies), 1) * 1000, 4),
+        "p50_ms": round(percentile(latencies, 50) * 1000, 4),
+        "p90_ms": round(percentile(latencies, 90) * 1000, 4),
+        "p99_ms": round(percentile(latencies, 99) * 1000, 4),
+        "max_ms": round(latencies[-1] * 1000, 4) if latencies else 0.0,
+        "throughput": round(len(latencies) / wall, 2) if wall > 0 else 0.0,
+        "peak_kib": round(max(peak, 0) / 1024, 1),
+    }
+
+
+# ------------------- Baselines -------------------
+def environment():
+    return {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "system": platform.system(),
+    }
+
+
+def save_baseline(path, corpus, results):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"corpus": corpus, "environment": environment(), "results": results}, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _per_call_ms(metric, value):
+    if metric == "throughput":
+        return 1000 / value if value else math.inf
+    return value
+
+
+def compare(results, baseline, tolerance=0.2, min_delta_ms=0.1, metrics=COMPARED_METRICS):
+    """
+    Changes against ``baseline["results"]`` as (target, metric, before, after,
+    relative change, regressed) tuples. A metric regressed when it got worse by
+    more than ``tolerance`` (0.2 = 20%); latency and throughput changes also
+    have to add at least ``min_delta_ms`` per call, since microsecond targets
+    swing by more than any tolerance between runs. Targets missing on either
+    side are skipped.
+    """
+    changes = []
+    for target, result in results.items():
+        before_result = baseline.get("results", {}).get(target)
+        if before_result is None:
+            continue
+        for metric in metrics:
+            before, after = before_result.get(metric), result.get(metric)
+            if before is None or after is None:
+                continue
+            change = (after - before) / before if before else 0.0
+            worse = change if METRICS[metric] else -change
+            regressed = worse > tolerance
+            if metric != "peak_kib":
+                regressed = regressed and abs(_per_call_ms(metric, after) - _per_call_ms(metric, before)) >= min_delta_ms
+            changes.append((target, metric, before, after, change, regressed))
+    return changes
@@ -0,0 +1,102 @@
+import hashlib
+
+from django.db import IntegrityError, transaction
+
+from .models import ResumeBlob
+from .utils import EXTRACTOR_VERSION, TEXT_VERSION, extract_text, extract_fields
+
+
+def content_hash(file):
+    """SHA-256 of an uploaded or opened file, leaving it rewound for the next reader."""
+    digest = hashlib.sha256()
+    if hasattr(file, "chunks"):
+        for chunk in file.chunks():
+            digest.update(chunk)
+    else:
+        file.seek(0)
+        for chunk in iter(lambda: file.read(1024 * 1024), b""):
+            digest.update(chunk)
+    file.seek(0)
+    return digest.hexdigest()
+
+
+def get_or_create_blob(file, file_type):
+    """Return the blob for this content, storing the file only if it is new."""
+    digest = content_hash(file)
+    blob = ResumeBlob.objects.filter(pk=digest).first()
+    if blob is not None:
+        return blob
+
+    blob = ResumeBlob(sha256=digest, file_type=file_type)
+    blob.file.save(getattr(file, "name", None) or f"{digest}.{file_type}", file, save=False)
+    try:
+        with transaction.atomic():
+            blob.save(force_insert=True)
+    except IntegrityError:
+        # Someone stored the same content meanwhile; keep theirs and drop the copy just written
+        existing = ResumeBlob.objects.get(pk=digest)
+        if existing.file.name != blob.file.name:
+            blob.file.delete(save=False)
+        return existing
+    except BaseException:
+        blob.file.delete(save=False)
+        raise
+    return blob
+
+
+def has_current_text(blob):
+    return blob.text is not None and blob.text_version == TEXT_VERSION
+
+
+def blob_text(blob, file=None):
+    """Extracted text of ``blob``; the file is only parsed again when ``TEXT_VERSION`` changes."""
+    if not has_current_text(blob):
+        source = file if file is not None else blob.file.open("rb")
+        try:
+            blob.text = extract_text(source, blob.file_type) or ""
+        finally:
+            if file is None:
+                source.close()
+            else:
+                file.seek(0)
+        blob.text_version = TEXT_VERSION
+        blob.save(update_fields=["text", "text_version"])
+    return blob.text
+
+
+def blob_data(blob, file=None):
+    """``extract_resume_data`` output for ``blob``, cached per content hash."""
+    if blob.data is None or blob.extractor_version != EXTRACTOR_VERSION or not has_current_text(blob):
+        blob.data = extract_fields(blob_text(blob, file))
+        blob.extractor_version = EXTRACTOR_VERSION
+        blob.save(update_fields=["data", "extractor_version"])
+    return blob.data
+
+
+def cached_text(file, file_type):
+    """Text of an uploaded file, reusing a stored blob's text when the content is known."""
+    blob = ResumeBlob.objects.filter(
+        pk=content_hash(file), text__isnull=False, text_version=TEXT_VERSION,
+    ).only("text").first()
+    if blob is not None:
+        return blob.text
+    return extract_text(file, file_type)
+
+
+def stored_resume_text(resume):
+    """Full text of a stored Resume; rows saved before blobs existed fall back to their fields."""
+    if resume.blob_id:
+        blob = resume.blob
+        if not has_current_text(blob):
+            try:
+                blob_text(blob)
+            except OSError:
+                # The stored file is gone; older text beats none
+                pass
+        if blob.text:
+            return blob.text
+    return "\n".join(filter(None, [
+        resume.summary, resume.experience, resume.skills, resume.education,
+        resume.projects, resume.achievements,
+    ]))
+
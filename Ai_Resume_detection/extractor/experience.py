@@ -0,0 +1,183 @@
+"""
+Work experience timeline of a resume.
+
+Every date range in the text ("Jan 2020 - Mar 2022", "2019 – Present",
+"03/2018 to 06/2019") becomes a role span counted in whole months. The spans
+are then merged, so roles held at the same time are not counted twice, and
+the total is the length of the merged periods.
+
+Date tokens go through a month-name table and a memo cache instead of trying
+``strptime`` formats, so a backfill over a whole corpus parses each distinct
+token once.
+"""
+import re
+from datetime import date
+from functools import lru_cache
+
+
+MONTHS = {}
+for number, names in enumerate([
+    ["jan", "january"], ["feb", "february"], ["mar", "march"], ["apr", "april"],
+    ["may"], ["jun", "june"], ["jul", "july"], ["aug", "august"],
+    ["sep", "sept", "september"], ["oct", "october"], ["nov", "november"], ["dec", "december"],
+], start=1):
+    for name in names:
+        MONTHS[name] = number
+
+PRESENT_WORDS = ["present", "current", "currently", "now", "today", "ongoing", "till date", "to date"]
+
+# Years outside this window are phone numbers, ids and the like
+MIN_YEAR = 1950
+
+_MONTH_ALT = "|".join(sorted(MONTHS, key=len, reverse=True))
+_DATE = (
+    rf"(?:(?:{_MONTH_ALT})\.?,?[ \t]*\d{{4}}"  # Jan 2020, Sept. 2019, March, 2018
+    r"|\d{1,2}/\d{4}"                           # 03/2020
+    r"|\d{4}[/-]\d{1,2}(?!\d)"                  # 2020-03
+    r"|\d{4})"                                  # 2020
+)
+_PRESENT = "|".join(r"[ \t]+".join(word.split()) for word in sorted(PRESENT_WORDS, key=len, reverse=True))
+RANGE_RE = re.compile(
+    rf"\b(?P<start>{_DATE})[ \t]*(?:[-–—]+|to|till|until|through)[ \t]*(?P<end>{_DATE}|{_PRESENT})\b",
+    re.IGNORECASE,
+)
+_TOKEN_RE = re.compile(rf"(?:(?P<name>[a-z]+)\.?,?\s*(?P<year>\d{{4}})|(?P<m1>\d{{1,2}})/(?P<y1>\d{{4}})"
+                       rf"|(?P<y2>\d{{4}})[/-](?P<m2>\d{{1,2}})|(?P<y3>\d{{4}}))")
+
+# parse_date_token result for "present"; the month it stands for depends on the day
+PRESENT = -1
+
+
+def month_index(year, month):
+    return year * 12 + month - 1
+
+
+def format_month(index):
+    year, month = divmod(index, 12)
+    return f"{year:04d}-{month + 1:02d}"
+
+
+@lru_cache(maxsize=4096)
+def parse_date_token(token):
+    """
+    Month index (``year * 12 + month - 1``) of a date token such as
+    "Jan 2020" or "2020-01", ``PRESENT``, or None when it is not a date.
+    A bare year stands for its January.
+    """
+    token = " ".join(token.lower().split())
+    if token in PRESENT_WORDS:
+        return PRESENT
+    match = _TOKEN_RE.fullmatch(token)
+    if not match:
+        return None
+    if match["name"]:
+        month = MONTHS.get(match["name"])
+        year = int(match["year"])
+    elif match["y1"]:
+        month, year = int(match["m1"]), int(match["y1"])
+    elif match["y2"]:
+        month, year = int(match["m2"]), int(match["y2"])
+    else:
+        month, year = 1, int(match["y3"])
+    if not month or not 1 <= month <= 12 or year < MIN_YEAR:
+        return None
+    return month_index(year, month)
+
+
+class Role:
+    """One date range found in the resume; ``end`` is exclusive and None while it is ongoing."""
+
+    __slots__ = ("start", "end", "months", "current", "text")
+
+    def __init__(self, start, end, months, current, text):
+        self.start = start
+        self.end = end
+        self.months = months
+        self.current = current
+        self.text = text
+
+    def as_dict(self):
+        return {
+            "start": format_month(self.start),
+            "end": None if self.current else format_month(self.end),
+            "months": self.months,
+            "current": self.current,
+            "text": self.text,
+        }
+
+
+class ExperienceTimeline:
+    """Role spans in resume order, and the merged periods they cover."""
+
+    __slots__ = ("roles", "periods", "total_months")
+
+    def __init__(self, roles, periods):
+        self.roles = roles
+        self.periods = periods
+        self.total_months = sum(end - start for start, end in periods)
+
+    @property
+    def overlap_months(self):
+        """Months counted more than once when the roles are simply added up."""
+        return sum(role.months for role in self.roles) - self.total_months
+
+    def describe(self):
+        if self.total_months == 0:
+            return "Fresher (No prior work experience found)"
+        years, months = divmod(self.total_months, 12)
+        return f"{years} years {months} months" if years else f"{months} months"
+
+    def as_dict(self):
+        return {
+            "roles": [role.as_dict() for role in self.roles],
+            "periods": [{"start": format_month(start), "end": format_month(end), "months": end - start}
+                        for start, end in self.periods],
+            "total_months": self.total_months,
+            "overlap_months": self.overlap_months,
+        }
+
+
+def merge_intervals(spans):
+    """Merge overlapping or touching (start, end) spans; sorting makes it O(n log n)."""
+    merged = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1][1] = end
+        else:
+            merged.append([start, end])
+    return [tuple(span) for span in merged]
+
+
+def _line_around(text, start, end):
+    line_start = text.rfind("\n", 0, start) + 1
+    line_end = text.find("\n", end)
+    line = text[line_start:start] + " " + text[end:len(text) if line_end == -1 else line_end]
+    return " ".join(line.strip(" \t|,–—-:()").split())[:200]
+
+
+def experience_timeline(text, today=None):
+    """The ``ExperienceTimeline`` of ``text``; "present" means the month of ``today``."""
+    today = today or date.today()
+    now = month_index(today.year, today.month)
+    latest = now + 12
+
+    roles = []
+    for match in RANGE_RE.finditer(text or ""):
+        start = parse_date_token(match["start"])
+        end = parse_date_token(match["end"])
+        if start is None or start == PRESENT or end is None:
+            continue
+        current = end == PRESENT
+        if current:
+            end = now
+        if end <= start or start > latest or end > latest:
+            continue
+        roles.append(Role(start, end, end - start, current, _line_around(text, match.start(), match.end())))
+    return ExperienceTimeline(roles, merge_intervals((role.start, role.end) for role in roles))
+
+
+def experience_timelines(texts, today=None):
+    """Batch version of ``experience_timeline`` for backfills; "present" is resolved once."""
+    today = today or date.today()
+    return [experience_timeline(text, today) for text in texts]
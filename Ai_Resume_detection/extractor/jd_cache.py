@@ -0,0 +1,137 @@
+"""
+Cache of tokenized job descriptions for the ATS checker.
+
+The same job description is checked against resume after resume, so its
+keyword set is kept in a size-bounded LRU in each process, keyed by a hash of
+the normalized text. Set ``ATS_JD_CACHE_ALIAS`` to a Django cache alias to
+share entries between worker processes as well.
+"""
+import re
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+
+from django.conf import settings
+
+
+# Same tokens as ats_checker has always used
+KEYWORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+
+DEFAULT_SIZE = 256
+KEY_PREFIX = "ats:jd:v1:"
+
+
+class JobKeywords:
+    """Keywords of one job description, with each keyword's share of all keyword occurrences."""
+
+    __slots__ = ("keywords", "weights")
+
+    def __init__(self, keywords, weights):
+        self.keywords = keywords
+        self.weights = weights
+
+    def __getstate__(self):
+        return (self.keywords, self.weights)
+
+    def __setstate__(self, state):
+        self.keywords, self.weights = state
+
+
+def normalize(job_description):
+    """Lowercase and collapse whitespace; texts that differ only in case or spacing share an entry."""
+    return " ".join(job_description.lower().split())
+
+
+def cache_key(job_description):
+    return hashlib.sha256(normalize(job_description).encode("utf-8")).hexdigest()
+
+
+def tokenize(job_description):
+    counts = Counter(KEYWORD_RE.findall(job_description.lower()))
+    total = sum(counts.values())
+    weights = {word: count / total for word, count in counts.items()}
+    return JobKeywords(frozenset(counts), weights)
+
+
+class JobDescriptionCache:
+    def __init__(self, maxsize=DEFAULT_SIZE, shared_alias=None):
+        self.maxsize = maxsize
+        self.shared_alias = shared_alias
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    def _shared(self):
+        if not self.shared_alias:
+            return None
+        from django.core.cache import caches
+        return caches[self.shared_alias]
+
+    def _remember(self, key, entry):
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def get(self, job_description):
+        """Keywords of ``job_description``, tokenizing it only on a miss."""
+        key = cache_key(job_description)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry
+
+        shared = self._shared()
+        entry = shared.get(KEY_PREFIX + key) if shared is not None else None
+        if entry is not None:
+            with self._lock:
+                self.shared_hits += 1
+        else:
+            entry = tokenize(job_description)
+            with self._lock:
+                self.misses += 1
+            if shared is not None:
+                shared.set(KEY_PREFIX + key, entry)
+
+        self._remember(key, entry)
+        return entry
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.shared_hits = self.misses = 0
+
+    def stats(self):
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+            }
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_jd_cache():
+    """The process-wide cache, sized from ``ATS_JD_CACHE_SIZE``."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = JobDescriptionCache(
+                maxsize=getattr(settings, "ATS_JD_CACHE_SIZE", DEFAULT_SIZE),
+                shared_alias=getattr(settings, "ATS_JD_CACHE_ALIAS", None),
+            )
+    return _cache
+
+
+def job_keywords(job_description):
+    return get_jd_cache().get(job_description)
@@ -0,0 +1,133 @@
+"""
+Database-backed queue for background resume extraction.
+
+Uploads enqueue a ResumeJob and return at once; ``run_resume_workers`` starts
+local worker processes that claim jobs, extract them and save the Resume.
+No broker is needed: claiming is a compare-and-set UPDATE, so any number of
+workers can poll the same table.
+"""
+import os
+import socket
+import logging
+from datetime import timedelta
+
+from django.db import OperationalError, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .blobs import blob_data
+from .models import Resume, ResumeJob
+from .skill_index import sync_resume_skills
+from .utils import resume_model_fields
+
+logger = logging.getLogger(__name__)
+
+VISIBILITY_TIMEOUT = 300
+RETRY_DELAY = 10
+
+
+def enqueue(blob, name, email, max_attempts=3):
+    return ResumeJob.objects.create(blob=blob, name=name, email=email, max_attempts=max_attempts)
+
+
+def worker_name():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def claim(worker, visibility_timeout=VISIBILITY_TIMEOUT):
+    """
+    Claim the oldest runnable job for ``worker``, or return None.
+
+    Runnable means pending and due, or running with an expired lease. The
+    UPDATE only succeeds if the row is unchanged since it was read, so two
+    workers can never claim the same job.
+    """
+    now = timezone.now()
+    runnable = ResumeJob.objects.filter(
+        Q(status=ResumeJob.PENDING) | Q(status=ResumeJob.RUNNING), run_after__lte=now
+    ).order_by('run_after', 'id')
+
+    for job in runnable.only('id', 'status', 'run_after', 'attempts', 'max_attempts')[:10]:
+        if job.attempts >= job.max_attempts:
+            # Its last worker died mid-run and there are no attempts left
+            ResumeJob.objects.filter(pk=job.pk, status=job.status, run_after=job.run_after).update(
+                status=ResumeJob.FAILED, error="Worker lost; no attempts left", locked_by="",
+            )
+            continue
+        claimed = ResumeJob.objects.filter(pk=job.pk, status=job.status, run_after=job.run_after).update(
+            status=ResumeJob.RUNNING,
+            run_after=now + timedelta(seconds=visibility_timeout),
+            locked_by=worker,
+            attempts=F('attempts') + 1,
+            updated_at=now,
+        )
+        if claimed:
+            return ResumeJob.objects.select_related('blob').get(pk=job.pk)
+    return None
+
+
+def process(job, worker):
+    """Extract ``job``'s resume and save it; retried later on failure."""
+    try:
+        data = blob_data(job.blob)
+        if not job.blob.text or "error" in data or not data.get("summary"):
+            raise ValueError(data.get("error") or "No text could be extracted from the resume")
+
+        with transaction.atomic():
+            resume = Resume.objects.create(
+                name=job.name,
+                email=job.email,
+                file=job.blob.file.name,
+                blob=job.blob,
+                **resume_model_fields(data),
+            )
+            sync_resume_skills([resume])
+            # Only finish the job if our lease is still valid
+            finished = ResumeJob.objects.filter(pk=job.pk, status=ResumeJob.RUNNING, locked_by=worker).update(
+                status=ResumeJob.DONE, resume=resume, error="", locked_by="", updated_at=timezone.now(),
+            )
+            if not finished:
+                transaction.set_rollback(True)
+    except Exception as exc:
+        logger.exception("Resume job %s failed", job.pk)
+        retry = job.attempts < job.max_attempts
+        ResumeJob.objects.filter(pk=job.pk, status=ResumeJob.RUNNING, locked_by=worker).update(
+            status=ResumeJob.PENDING if retry else ResumeJob.FAILED,
+            # Back off exponentially between attempts
+            run_after=timezone.now() + timedelta(seconds=RETRY_DELAY * 2 ** (job.attempts - 1)),
+            error=str(exc),
+            locked_by="",
+            updated_at=timezone.now(),
+        )
+
+
+def run_worker(stop, poll_interval=1.0, visibility_timeout=VISIBILITY_TIMEOUT):
+    """Claim and process jobs until ``stop`` (an Event) is set."""
+    worker = worker_name()
+    while not stop.is_set():
+        try:
+            job = claim(worker, visibility_timeout)
+        except OperationalError:
+            # SQLite is busy with another writer; try again shortly
+            job = None
+        if job is None:
+            stop.wait(poll_interval)
+            continue
+        process(job, worker)
+
+
+def job_status(job):
+    """JSON-ready description of ``job`` for polling clients."""
+    payload = {
+        "id": job.pk,
+        "status": job.status,
+        "attempts": job.attempts,
+        "created_at": job.created_at.isoformat(),
+        "updated_at": job.updated_at.isoformat(),
+    }
+    if job.status == ResumeJob.DONE:
+        payload["resume_id"] = job.resume_id
+        payload["result"] = job.blob.data
+    elif job.error:
+        payload["error"] = job.error
+    return payload
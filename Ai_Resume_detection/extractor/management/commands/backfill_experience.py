@@ -0,0 +1,54 @@
+import time
+from datetime import date
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from extractor.experience import experience_timelines
+from extractor.models import ResumeBlob
+
+# Version 2 only changed total_experience and added experience_timeline, so
+# data cached by version 1 is brought up to date without a full re-extraction.
+# Pinned on purpose: data from any other version needs the full extractor.
+UPGRADABLE_VERSIONS = [1, 2]
+TARGET_VERSION = 2
+
+
+class Command(BaseCommand):
+    help = 'Recompute the experience timeline of every cached resume extraction'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500, help='Blobs read and written per batch')
+
+    def handle(self, *args, **options):
+        chunk_size = max(1, options['chunk_size'])
+        today = date.today()
+        started = time.monotonic()
+        updated = 0
+
+        blobs = (
+            ResumeBlob.objects.filter(extractor_version__in=UPGRADABLE_VERSIONS)
+            .exclude(text__isnull=True).exclude(data__isnull=True)
+            .only("sha256", "text", "data", "extractor_version")
+            .order_by("pk")
+        )
+        last = None
+        while True:
+            page = blobs.filter(pk__gt=last) if last else blobs
+            chunk = list(page[:chunk_size])
+            if not chunk:
+                break
+            last = chunk[-1].pk
+
+            for blob, timeline in zip(chunk, experience_timelines([blob.text for blob in chunk], today)):
+                blob.data["total_experience"] = timeline.describe()
+                blob.data["experience_timeline"] = timeline.as_dict()
+                blob.extractor_version = TARGET_VERSION
+            with transaction.atomic():
+                ResumeBlob.objects.bulk_update(chunk, ["data", "extractor_version"])
+            updated += len(chunk)
+
+        elapsed = time.monotonic() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Updated {updated} resumes in {elapsed:.1f}s, {updated / max(elapsed, 1e-9):.1f} resumes/s"
+        ))
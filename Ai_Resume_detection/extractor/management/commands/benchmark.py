@@ -0,0 +1,210 @@
+import io
+import time
+import tempfile
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management.base import BaseCommand, CommandError
+from django.test import Client
+from django.test.utils import override_settings, setup_test_environment, teardown_test_environment
+from django.urls import reverse
+
+from extractor import utils
+from extractor.benchmark import compare, load_baseline, measure, save_baseline
+from extractor.model_registry import warm_up
+from extractor.skill_matcher import get_skill_matcher
+from extractor.synthetic import generate_job_descriptions, generate_resumes, parse_size
+
+# Field name in extract_resume_data's output -> the function that extracts it from the text
+FIELDS = {
+    "summary": utils.extract_summary,
+    "experience": utils.extract_experience,
+    "skills": utils.extract_skills,
+    "total_experience": utils.calculate_experience,
+    "achievements": utils.extract_achievements,
+    "education": utils.extract_education,
+    "projects": utils.extract_projects,
+    "github_links": utils.extract_github_links,
+}
+TARGETS = (
+    ["text_extraction.pdf", "text_extraction.docx"]
+    + [f"fields.{field}" for field in FIELDS]
+    + ["extract_resume_data", "ats_checker", "skill_matcher", "upload_view"]
+)
+
+
+@contextmanager
+def test_database():
+    """A throwaway test database and media directory, so the upload view writes nowhere real."""
+    from django.db import connection
+
+    setup_test_environment()
+    old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+    try:
+        with tempfile.TemporaryDirectory() as media, override_settings(MEDIA_ROOT=media):
+            yield
+    finally:
+        connection.creation.destroy_test_db(old_name, verbosity=0)
+        teardown_test_environment()
+
+
+class Command(BaseCommand):
+    help = 'Benchmark resume parsing, ATS scoring and the upload view on a synthetic corpus'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--targets', default='',
+                            help='Comma-separated targets or groups, e.g. "fields,ats_checker" (default: all)')
+        parser.add_argument('--count', type=int, default=20, help='Resumes in the corpus')
+        parser.add_argument('--jobs', type=int, default=5, help='Job descriptions the resumes are scored against')
+        parser.add_argument('--size', default='medium', help='small, medium, large or a number of roles per resume')
+        parser.add_argument('--formats', default='pdf,docx', help='Resume file types, used in turn')
+        parser.add_argument('--seed', type=int, default=0, help='Corpus seed')
+        parser.add_argument('--repeat', type=int, default=3, help='Timed passes over the corpus')
+        parser.add_argument('--warmup', type=int, default=1, help='Untimed calls before each target')
+        parser.add_argument('--baseline', default=None,
+                            help='Baseline JSON (default: BENCHMARK_BASELINE, benchmark_baseline.json next to manage.py)')
+        parser.add_argument('--save-baseline', action='store_true', help='Store these results as the baseline')
+        parser.add_argument('--tolerance', type=float, default=0.2,
+                            help='Relative change that counts as a regression (0.2 = 20%%)')
+        parser.add_argument('--min-delta-ms', type=float, default=0.1,
+                            help='Smallest per-call slowdown that counts as a regression')
+
+    def handle(self, *args, **options):
+        targets = self._select(options['targets'])
+        formats = [name.strip() for name in options['formats'].split(',') if name.strip()]
+        if not formats or set(formats) - {"pdf", "docx"}:
+            raise CommandError("--formats takes pdf and/or docx")
+        try:
+            parse_size(options['size'])
+        except ValueError as exc:
+            raise CommandError(str(exc))
+
+        count, size, seed = max(1, options['count']), options['size'], options['seed']
+        self.repeat, self.warmup = max(1, options['repeat']), max(0, options['warmup'])
+        corpus = {"count": count, "jobs": max(1, options['jobs']), "size": str(size), "seed": seed, "formats": formats}
+        self.stdout.write(f"Generating {count} {size} resumes ({', '.join(formats)}) and {corpus['jobs']} job descriptions")
+        self.resumes = generate_resumes(count, size, seed, formats)
+        self.jobs = generate_job_descriptions(corpus["jobs"], size, seed)
+        self.texts = [resume.text for resume in self.resumes]
+        self.corpus = corpus
+
+        # Model loading is not part of any target
+        started = time.monotonic()
+        warm_up(settings.NLP_WARMUP_MODELS)
+        self.stdout.write(f"Loaded {', '.join(settings.NLP_WARMUP_MODELS)} in {time.monotonic() - started:.1f}s")
+
+        results = {}
+        for name in targets:
+            self.stdout.write(f"  {name} ...", ending="")
+            self.stdout.flush()
+            results[name] = self._run(name)
+            self.stdout.write(f" {results[name]['p50_ms']:.2f} ms")
+
+        baseline_path = options['baseline'] or getattr(
+            settings, "BENCHMARK_BASELINE", settings.BASE_DIR / "benchmark_baseline.json")
+        baseline = None
+        if not options['save_baseline']:
+            try:
+                baseline = load_baseline(baseline_path)
+            except FileNotFoundError:
+                if options['baseline']:
+                    raise CommandError(f"No baseline at {baseline_path}")
+            if baseline is not None and baseline.get("corpus") != corpus:
+                self.stderr.write(f"Baseline {baseline_path} was measured on a different corpus "
+                                  f"({baseline.get('corpus')}); not comparing")
+                baseline = None
+
+        changes = compare(results, baseline, options['tolerance'], options['min_delta_ms']) if baseline else []
+        self._report(results, changes)
+
+        if options['save_baseline']:
+            save_baseline(baseline_path, corpus, results)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {baseline_path}"))
+        regressions = [change for change in changes if change[5]]
+        if regressions:
+            raise CommandError(f"{len(regressions)} metrics regressed by more than "
+                               f"{options['tolerance']:.0%} against {baseline_path}")
+        if baseline:
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {baseline_path}"))
+
+    def _select(self, spec):
+        wanted = [name.strip() for name in spec.split(',') if name.strip()]
+        if not wanted:
+            return TARGETS
+        selected = [target for target in TARGETS
+                    if any(target == name or target.startswith(name + ".") for name in wanted)]
+        unknown = [name for name in wanted
+                   if not any(target == name or target.startswith(name + ".") for target in TARGETS)]
+        if unknown:
+            raise CommandError(f"Unknown targets: {', '.join(unknown)}. Choose from: {', '.join(TARGETS)}")
+        return selected
+
+    # ------------------- Targets -------------------
+    def _run(self, name):
+        options = {"repeat": self.repeat, "warmup": self.warmup}
+        if name.startswith("text_extraction."):
+            file_type = name.split(".", 1)[1]
+            files = [resume for resume in self.resumes if resume.file_type == file_type]
+            if not files:
+                raise CommandError(f"{name} needs {file_type} in --formats")
+            return measure(lambda resume: utils.extract_text(io.BytesIO(resume.content), resume.file_type),
+                           files, **options)
+        if name.startswith("fields."):
+            # Every call builds its own section index, as a lone field extraction would
+            return measure(FIELDS[name.split(".", 1)[1]], self.texts, **options)
+        if name == "extract_resume_data":
+            return measure(lambda resume: utils.extract_resume_data(io.BytesIO(resume.content), resume.file_type),
+                           self.resumes, **options)
+        if name == "ats_checker":
+            pairs = [(text, job) for text in self.texts for job in self.jobs]
+            return measure(lambda pair: utils.ats_checker(*pair), pairs, **options)
+        if name == "skill_matcher":
+            matcher = get_skill_matcher()
+            return measure(matcher.match, self.texts, **options)
+        if name == "upload_view":
+            return self._run_upload(options)
+        raise CommandError(f"Unknown target {name}")
+
+    def _run_upload(self, options):
+        # Every upload gets content the blob cache has not seen, or later passes would only hit the cache
+        calls = self.warmup + len(self.resumes) * (self.repeat + 1)
+        fresh = iter(generate_resumes(calls, self.corpus["size"], self.corpus["seed"], self.corpus["formats"],
+                                      start=len(self.resumes)))
+
+        with test_database():
+            client = Client()
+            url = reverse("upload_resume")
+
+            def upload(_):
+                resume = next(fresh)
+                response = client.post(url, {
+                    "name": resume.name,
+                    "email": "candidate@example.com",
+                    "file": SimpleUploadedFile(resume.name, resume.content),
+                })
+                if response.status_code != 200 or response.context.get("message") is None:
+                    raise CommandError(f"Upload of {resume.name} was rejected")
+
+            return measure(upload, range(len(self.resumes)), **options)
+
+    # ------------------- Report -------------------
+    def _report(self, results, changes):
+        p50_changes = {target: change for target, metric, _, _, change, _ in changes if metric == "p50_ms"}
+        regressed = {(target, metric) for target, metric, *_, bad in changes if bad}
+
+        header = f"{'target':<28}{'calls':>7}{'p50 ms':>10}{'p90 ms':>10}{'p99 ms':>10}{'ops/s':>10}{'peak KiB':>11}"
+        if changes:
+            header += f"{'p50 vs base':>13}"
+        self.stdout.write("")
+        self.stdout.write(header)
+        for target, result in results.items():
+            line = (f"{target:<28}{result['calls']:>7}{result['p50_ms']:>10.2f}{result['p90_ms']:>10.2f}"
+                    f"{result['p99_ms']:>10.2f}{result['throughput']:>10.1f}{result['peak_kib']:>11.1f}")
+            if target in p50_changes:
+                line += f"{p50_changes[target]:>+13.1%}"
+            self.stdout.write(self.style.ERROR(line) if any(t == target for t, _ in regressed) else line)
+
+        for target, metric, before, after, change, bad in changes:
+            if bad:
+                self.stderr.write(f"Regression: {target} {metric} {before} -> {after} ({change:+.1%})")
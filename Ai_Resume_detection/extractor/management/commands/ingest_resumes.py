@@ -0,0 +1,231 @@
+import io
+import os
+import time
+import hashlib
+import multiprocessing
+from pathlib import Path
+
+import django
+from django.core.files import File
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+
+from extractor.analysis import ResumeAnalysis, parse_many
+from extractor.utils import EXTRACTOR_VERSION, TEXT_VERSION, extract_text, extract_fields, resume_model_fields
+
+
+FILE_TYPES = {".pdf": "pdf", ".docx": "docx"}
+
+
+def _init_worker():
+    # Forked workers inherit the parent's setup, spawned ones need their own
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    # Never share the parent's database connection across the fork
+    connections.close_all()
+    from extractor.pdf_text import mark_worker_process
+    mark_worker_process()
+
+
+def _process_batch(paths):
+    """
+    Extract every resume in ``paths``; spaCy runs once over the whole batch with nlp.pipe.
+
+    Files whose content was extracted before (same SHA-256) by the current
+    extractor and text versions reuse the cached result.
+    Returns (path, sha256, text, data) tuples, where text is None for cached files.
+    """
+    from extractor.models import ResumeBlob
+
+    contents = {}
+    for path in paths:
+        try:
+            with open(path, "rb") as f:
+                contents[path] = f.read()
+        except OSError:
+            contents[path] = b""
+    hashes = {path: hashlib.sha256(content).hexdigest() for path, content in contents.items()}
+
+    cached = dict(
+        ResumeBlob.objects.filter(pk__in=set(hashes.values()), extractor_version=EXTRACTOR_VERSION,
+                                  text_version=TEXT_VERSION)
+        .exclude(data__isnull=True)
+        .values_list("sha256", "data")
+    )
+
+    texts = {}
+    for path, content in contents.items():
+        if hashes[path] not in cached and content:
+            texts[path] = extract_text(io.BytesIO(content), FILE_TYPES[Path(path).suffix.lower()])
+
+    analyses = {path: ResumeAnalysis(text) for path, text in texts.items() if text}
+    parse_many(analyses.values())
+
+    results = []
+    for path in paths:
+        sha = hashes[path]
+        if sha in cached:
+            results.append((path, sha, None, cached[sha]))
+        elif path in analyses:
+            results.append((path, sha, texts[path], extract_fields(texts[path], analyses[path])))
+        else:
+            results.append((path, sha, None, {"error": "No text could be extracted"}))
+    return results
+
+
+class Checkpoint:
+    """Append-only list of the files already ingested, one relative path per line."""
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.done = set()
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self.done = {line.rstrip("\n") for line in f if line.strip()}
+
+    def record(self, names):
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.writelines(f"{name}\n" for name in names)
+            f.flush()
+            os.fsync(f.fileno())
+        self.done.update(names)
+
+    def reset(self):
+        self.path.unlink(missing_ok=True)
+        self.done = set()
+
+
+class Command(BaseCommand):
+    help = 'Bulk-import a directory of PDF/DOCX resumes using a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument('directory', type=str, help='Directory to walk for .pdf and .docx files')
+        parser.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='Number of worker processes')
+        parser.add_argument('--batch-size', type=int, default=16, help='Files handed to a worker at a time')
+        parser.add_argument('--chunk-size', type=int, default=500, help='Rows written per bulk_create')
+        parser.add_argument('--checkpoint', type=str, default=None,
+                            help='Checkpoint file (default: <directory>/.ingest_resumes.checkpoint)')
+        parser.add_argument('--restart', action='store_true', help='Ignore the checkpoint and start over')
+
+    def handle(self, *args, **options):
+        root = Path(options['directory']).resolve()
+        if not root.is_dir():
+            raise CommandError(f"{root} is not a directory")
+
+        checkpoint = Checkpoint(options['checkpoint'] or root / '.ingest_resumes.checkpoint')
+        if options['restart']:
+            checkpoint.reset()
+
+        paths = [path for path in self._walk(root) if self._relative(path, root) not in checkpoint.done]
+        skipped = len(checkpoint.done)
+        if skipped:
+            self.stdout.write(f"Resuming: {skipped} files already done, {len(paths)} to go")
+        if not paths:
+            self.stdout.write(self.style.SUCCESS("Nothing to ingest."))
+            return
+
+        batch_size = max(1, options['batch_size'])
+        batches = [paths[i:i + batch_size] for i in range(0, len(paths), batch_size)]
+
+        self.started = time.monotonic()
+        self.processed = 0
+        self.failed = 0
+        pending = []
+
+        with multiprocessing.Pool(max(1, options['workers']), initializer=_init_worker) as pool:
+            for results in pool.imap_unordered(_process_batch, batches):
+                pending.extend(results)
+                if len(pending) >= options['chunk_size']:
+                    self._flush(pending, root, checkpoint)
+                    pending = []
+            self._flush(pending, root, checkpoint)
+
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(self.style.SUCCESS(
+            f"Ingested {self.processed - self.failed} resumes ({self.failed} failed) "
+            f"in {elapsed:.1f}s, {self.processed / max(elapsed, 1e-9):.1f} files/s"
+        ))
+
+    def _walk(self, root):
+        for dirpath, dirnames, filenames in os.walk(root):
+            dirnames.sort()
+            for filename in sorted(filenames):
+                if Path(filename).suffix.lower() in FILE_TYPES:
+                    yield Path(dirpath) / filename
+
+    def _relative(self, path, root):
+        return Path(path).relative_to(root).as_posix()
+
+    def _flush(self, results, root, checkpoint):
+        if not results:
+            return
+        # Imported here so spawned workers can load this module before django.setup()
+        from extractor.models import Resume, ResumeBlob
+        from extractor.skill_index import sync_resume_skills
+
+        new = {}
+        extracted = []
+        for path, sha, text, data in results:
+            if "error" in data:
+                self.failed += 1
+                self.stderr.write(f"{self._relative(path, root)}: {data['error']}")
+                continue
+            if text is not None:
+                new.setdefault(sha, (path, text, data))
+            extracted.append((path, sha, data))
+
+        # Copy each new content into the content-addressed storage once
+        existing = set(ResumeBlob.objects.filter(pk__in=new).values_list("pk", flat=True))
+        blobs = []
+        for sha, (path, text, data) in new.items():
+            if sha in existing:
+                continue
+            blob = ResumeBlob(
+                sha256=sha,
+                file_type=FILE_TYPES[Path(path).suffix.lower()],
+                text=text,
+                text_version=TEXT_VERSION,
+                data=data,
+                extractor_version=EXTRACTOR_VERSION,
+            )
+            with open(path, "rb") as f:
+                blob.file.save(Path(path).name, File(f), save=False)
+            blobs.append(blob)
+
+        try:
+            with transaction.atomic():
+                ResumeBlob.objects.bulk_create(blobs, ignore_conflicts=True)
+                # Known content whose cached result came from an older extractor
+                for sha in existing:
+                    _, text, data = new[sha]
+                    ResumeBlob.objects.filter(pk=sha).update(text=text, text_version=TEXT_VERSION, data=data,
+                                                             extractor_version=EXTRACTOR_VERSION)
+                stored = dict(
+                    ResumeBlob.objects.filter(pk__in={sha for _, sha, _ in extracted}).values_list("sha256", "file")
+                )
+                resumes = Resume.objects.bulk_create([
+                    Resume(
+                        name=Path(path).stem[:100],
+                        email="",
+                        file=stored[sha],
+                        blob_id=sha,
+                        **resume_model_fields(data),
+                    )
+                    for path, sha, data in extracted
+                ])
+                sync_resume_skills(resumes)
+        except BaseException:
+            for blob in blobs:
+                blob.file.delete(save=False)
+            raise
+        # bulk_create skips content another process stored meanwhile; their row points at their own copy
+        for blob in blobs:
+            if stored.get(blob.sha256) != blob.file.name:
+                blob.file.delete(save=False)
+        # Failed files stay out of the checkpoint, so the next run tries them again
+        checkpoint.record([self._relative(path, root) for path, *_ in extracted])
+
+        self.processed += len(results)
+        elapsed = time.monotonic() - self.started
+        self.stdout.write(f"{self.processed} files, {self.processed / max(elapsed, 1e-9):.1f} files/s")
@@ -0,0 +1,36 @@
+import signal
+import asyncio
+
+from django.core.management.base import BaseCommand
+
+from extractor.nlp_service import SOCKET_PATH, NLPService
+
+
+class Command(BaseCommand):
+    help = 'Serve the NLP models from a few warm worker processes over a Unix-domain socket'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--socket', default=SOCKET_PATH, help='Socket path (default: $NLP_SERVICE_SOCKET)')
+        parser.add_argument('--workers', type=int, default=2, help='Number of worker processes')
+        parser.add_argument('--max-batch', type=int, default=16, help='Most texts a worker runs through spaCy at once')
+        parser.add_argument('--max-wait-ms', type=float, default=5.0,
+                            help='How long a request waits for others to join its batch')
+
+    def handle(self, *args, **options):
+        service = NLPService(
+            socket_path=options['socket'],
+            workers=max(1, options['workers']),
+            max_batch=max(1, options['max_batch']),
+            max_wait=max(0.0, options['max_wait_ms']) / 1000,
+            models=["extractor", "cleaner"],
+        )
+        self.stdout.write(f"Starting {service.workers} NLP workers on {service.socket_path}")
+        asyncio.run(self._serve(service))
+        self.stdout.write(self.style.SUCCESS(f"Stopped after {service.batches} batches, {service.texts} texts"))
+
+    async def _serve(self, service):
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        await service.serve(stop)
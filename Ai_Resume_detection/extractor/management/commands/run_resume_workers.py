@@ -0,0 +1,60 @@
+import signal
+import multiprocessing
+
+import django
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+
+def _worker_main(stop, poll_interval, visibility_timeout):
+    from django.apps import apps
+    if not apps.ready:
+        django.setup()
+    # Never share the parent's database connection across the fork
+    connections.close_all()
+    # The parent decides when to stop; a Ctrl+C reaches the whole process group
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+    from extractor.jobs import run_worker
+    from extractor.pdf_text import mark_worker_process
+    mark_worker_process()
+    run_worker(stop, poll_interval, visibility_timeout)
+
+
+class Command(BaseCommand):
+    help = 'Run local worker processes for queued resume extraction jobs'
+
+    def add_arguments(self, parser):
+        # Imported here so spawned workers can load this module before django.setup()
+        from extractor.jobs import VISIBILITY_TIMEOUT
+
+        parser.add_argument('--workers', type=int, default=2, help='Number of worker processes')
+        parser.add_argument('--poll-interval', type=float, default=1.0, help='Seconds between polls of an empty queue')
+        parser.add_argument('--visibility-timeout', type=int, default=VISIBILITY_TIMEOUT,
+                            help='Seconds a claimed job stays invisible before another worker may retry it')
+
+    def handle(self, *args, **options):
+        stop = multiprocessing.Event()
+        workers = [
+            multiprocessing.Process(
+                target=_worker_main,
+                args=(stop, options['poll_interval'], options['visibility_timeout']),
+                name=f"resume-worker-{i}",
+            )
+            for i in range(max(1, options['workers']))
+        ]
+
+        def shutdown(signum, frame):
+            stop.set()
+
+        signal.signal(signal.SIGINT, shutdown)
+        signal.signal(signal.SIGTERM, shutdown)
+
+        connections.close_all()
+        for worker in workers:
+            worker.start()
+        self.stdout.write(f"Started {len(workers)} resume workers; Ctrl+C to stop")
+
+        for worker in workers:
+            worker.join()
+        self.stdout.write(self.style.SUCCESS("Workers stopped."))
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.4 on 2026-10-18 06:51
+
+import django.db.models.deletion
+import extractor.models
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extractor', '0004_auto_20250916_1332'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ResumeBlob',
+            fields=[
+                ('sha256', models.CharField(max_length=64, primary_key=True, serialize=False)),
+                ('file', models.FileField(upload_to=extractor.models.blob_upload_to)),
+                ('file_type', models.CharField(max_length=10)),
+                ('text', models.TextField(blank=True, null=True)),
+                ('data', models.JSONField(blank=True, null=True)),
+                ('extractor_version', models.PositiveIntegerField(default=0)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='blob',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='resumes', to='extractor.resumeblob'),
+        ),
+    ]
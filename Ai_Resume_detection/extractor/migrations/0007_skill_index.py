@@ -0,0 +1,39 @@
+# Generated by Django 5.2.4 on 2026-10-18 07:06
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extractor', '0006_resumejob'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Skill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True)),
+                ('resume_count', models.PositiveIntegerField(default=0)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ResumeSkill',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resume', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='extractor.resume')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='extractor.skill')),
+            ],
+        ),
+        migrations.AddField(
+            model_name='resume',
+            name='skill_set',
+            field=models.ManyToManyField(blank=True, related_name='resumes', through='extractor.ResumeSkill', to='extractor.skill'),
+        ),
+        migrations.AddConstraint(
+            model_name='resumeskill',
+            constraint=models.UniqueConstraint(fields=('skill', 'resume'), name='unique_resume_skill'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+import re
+from collections import Counter
+
+from django.db import migrations
+
+BATCH_SIZE = 1000
+
+
+# Frozen copy of extractor.skill_index.split_skills as of this migration
+def split_skills(text):
+    names = dict.fromkeys(re.sub(r"\s+", " ", part).strip().lower()[:100] for part in (text or "").split(","))
+    names.pop("", None)
+    return list(names)
+
+
+def backfill_resume_skills(apps, schema_editor):
+    Resume = apps.get_model('extractor', 'Resume')
+    Skill = apps.get_model('extractor', 'Skill')
+    ResumeSkill = apps.get_model('extractor', 'ResumeSkill')
+
+    counts = Counter()
+    rows = Resume.objects.order_by('pk').values_list('pk', 'skills')
+    batch = []
+    for row in rows.iterator(chunk_size=BATCH_SIZE):
+        batch.append(row)
+        if len(batch) == BATCH_SIZE:
+            _index_batch(batch, Skill, ResumeSkill, counts)
+            batch = []
+    _index_batch(batch, Skill, ResumeSkill, counts)
+
+    skills = list(Skill.objects.filter(pk__in=counts))
+    for skill in skills:
+        skill.resume_count = counts[skill.pk]
+    Skill.objects.bulk_update(skills, ['resume_count'], batch_size=BATCH_SIZE)
+
+
+def _index_batch(batch, Skill, ResumeSkill, counts):
+    wanted = {pk: split_skills(skills) for pk, skills in batch}
+    names = {name for skills in wanted.values() for name in skills}
+    if not names:
+        return
+    Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+    ids = dict(Skill.objects.filter(name__in=names).values_list('name', 'id'))
+    postings = [ResumeSkill(resume_id=pk, skill_id=ids[name]) for pk, skills in wanted.items() for name in skills]
+    ResumeSkill.objects.bulk_create(postings, ignore_conflicts=True, batch_size=BATCH_SIZE)
+    counts.update(posting.skill_id for posting in postings)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extractor', '0007_skill_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(backfill_resume_skills, migrations.RunPython.noop),
+    ]
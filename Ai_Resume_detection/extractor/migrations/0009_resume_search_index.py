@@ -0,0 +1,69 @@
+from django.db import migrations
+
+# Frozen copy of the index DDL in extractor.search as of this migration
+SQLITE_FORWARDS = [
+    "CREATE VIRTUAL TABLE extractor_resume_fts USING fts5(summary, experience, projects, education, skills, "
+    "content='extractor_resume', content_rowid='id', tokenize='porter unicode61', prefix='2 3')",
+    """
+    CREATE TRIGGER IF NOT EXISTS extractor_resume_fts_ai AFTER INSERT ON extractor_resume BEGIN
+        INSERT INTO extractor_resume_fts(rowid, summary, experience, projects, education, skills)
+        VALUES (new.id, new.summary, new.experience, new.projects, new.education, new.skills);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS extractor_resume_fts_ad AFTER DELETE ON extractor_resume BEGIN
+        INSERT INTO extractor_resume_fts(extractor_resume_fts, rowid, summary, experience, projects, education, skills)
+        VALUES ('delete', old.id, old.summary, old.experience, old.projects, old.education, old.skills);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS extractor_resume_fts_au
+    AFTER UPDATE OF summary, experience, projects, education, skills ON extractor_resume BEGIN
+        INSERT INTO extractor_resume_fts(extractor_resume_fts, rowid, summary, experience, projects, education, skills)
+        VALUES ('delete', old.id, old.summary, old.experience, old.projects, old.education, old.skills);
+        INSERT INTO extractor_resume_fts(rowid, summary, experience, projects, education, skills)
+        VALUES (new.id, new.summary, new.experience, new.projects, new.education, new.skills);
+    END
+    """,
+    # Index the rows that already exist
+    "INSERT INTO extractor_resume_fts(extractor_resume_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARDS = [
+    "DROP TRIGGER IF EXISTS extractor_resume_fts_au",
+    "DROP TRIGGER IF EXISTS extractor_resume_fts_ad",
+    "DROP TRIGGER IF EXISTS extractor_resume_fts_ai",
+    "DROP TABLE IF EXISTS extractor_resume_fts",
+]
+POSTGRES_FORWARDS = [
+    "CREATE INDEX extractor_resume_search ON extractor_resume USING GIN (to_tsvector('english', "
+    "coalesce(summary, '') || ' ' || coalesce(experience, '') || ' ' || coalesce(projects, '') || ' ' || "
+    "coalesce(education, '') || ' ' || coalesce(skills, '')))",
+]
+POSTGRES_BACKWARDS = [
+    "DROP INDEX IF EXISTS extractor_resume_search",
+]
+
+
+def _run(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def forwards(apps, schema_editor):
+    _run(schema_editor, {"sqlite": SQLITE_FORWARDS, "postgresql": POSTGRES_FORWARDS})
+
+
+def backwards(apps, schema_editor):
+    _run(schema_editor, {"sqlite": SQLITE_BACKWARDS, "postgresql": POSTGRES_BACKWARDS})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extractor', '0008_backfill_resume_skills'),
+    ]
+
+    operations = [
+        # FTS5 table + sync triggers on SQLite, a GIN tsvector index on PostgreSQL
+        migrations.RunPython(forwards, backwards),
+    ]
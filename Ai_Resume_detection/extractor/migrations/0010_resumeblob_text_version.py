@@ -0,0 +1,18 @@
+# Generated by Django 5.2.4 on 2026-10-18 08:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('extractor', '0009_resume_search_index'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='resumeblob',
+            name='text_version',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
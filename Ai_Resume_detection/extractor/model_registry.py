@@ -0,0 +1,77 @@
+"""
+Process-wide registry of NLP models.
+
+Models are loaded on first use and shared by everything in the process, so
+management commands that never touch NLP (migrate, shell, ...) never pay the
+load cost. Serving processes can load them ahead of time with ``warm_up()``.
+
+This module does not import Django, so the FastAPI side can use it as well.
+"""
+import threading
+
+
+_loaders = {}
+_models = {}
+_locks = {}
+_registry_lock = threading.Lock()
+
+
+def register(name, loader):
+    """Register ``loader`` (a no-argument callable) as the way to build model ``name``."""
+    with _registry_lock:
+        _loaders[name] = loader
+        _locks.setdefault(name, threading.Lock())
+
+
+def get_model(name):
+    """Return model ``name``, loading it the first time it is asked for."""
+    model = _models.get(name)
+    if model is not None:
+        return model
+    try:
+        lock = _locks[name]
+    except KeyError:
+        raise KeyError(f"No NLP model registered as {name!r}") from None
+    with lock:
+        model = _models.get(name)
+        if model is None:
+            model = _models[name] = _loaders[name]()
+    return model
+
+
+def is_loaded(name):
+    return name in _models
+
+
+def status():
+    """Map every registered model name to whether it is loaded yet."""
+    return {name: name in _models for name in _loaders}
+
+
+def warm_up(names=None):
+    """Load ``names`` (default: every registered model) now instead of on first use."""
+    for name in names or list(_loaders):
+        get_model(name)
+
+
+def warm_up_in_background(names=None):
+    """Run ``warm_up`` in a daemon thread, so the server can start answering meanwhile."""
+    thread = threading.Thread(target=warm_up, args=(names,), name="nlp-warm-up", daemon=True)
+    thread.start()
+    return thread
+
+
+# ------------------- Built-in models -------------------
+def _load_extractor_pipeline():
+    from .analysis import load_pipeline
+    return load_pipeline("en_core_web_sm")
+
+
+def _load_cleaner_pipeline():
+    import spacy
+    # clean_resume_text only reads lemmas and punctuation flags
+    return spacy.load("en_core_web_sm", exclude=["parser", "ner"])
+
+
+register("extractor", _load_extractor_pipeline)
+register("cleaner", _load_cleaner_pipeline)
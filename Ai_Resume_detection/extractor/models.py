@@ -1,4 +1,36 @@
+import os
+
 from django.db import models
+from django.utils import timezone
+
+
+def blob_upload_to(instance, filename):
+    # Content-addressed: identical files always map to the same name
+    return f"resumes/{instance.sha256}{os.path.splitext(filename)[1].lower()}"
+
+
+class ResumeBlob(models.Model):
+    """One stored file per distinct resume content, with its cached extraction."""
+    sha256 = models.CharField(max_length=64, primary_key=True)
+    file = models.FileField(upload_to=blob_upload_to)
+    file_type = models.CharField(max_length=10)
+    text = models.TextField(null=True, blank=True)
+    # TEXT_VERSION the text was extracted with; EXTRACTOR_VERSION of data
+    text_version = models.PositiveIntegerField(default=0)
+    data = models.JSONField(null=True, blank=True)
+    extractor_version = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+
+class Skill(models.Model):
+    """A normalized skill name (see ``skill_index.normalize_skill``)."""
+    name = models.CharField(max_length=100, unique=True)
+    # Posting list length; only used to order intersections, so it may lag behind deletes
+    resume_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return self.name
+
 
 class Resume(models.Model):
     name = models.CharField(max_length=100)
@@ -11,4 +43,51 @@ class Resume(models.Model):
     projects = models.TextField(blank=True)
     achievements = models.TextField(blank=True)
     github_links = models.TextField(blank=True)
+    blob = models.ForeignKey(ResumeBlob, null=True, blank=True, on_delete=models.SET_NULL, related_name='resumes')
+    skill_set = models.ManyToManyField(Skill, through='ResumeSkill', blank=True, related_name='resumes')
     uploaded_at = models.DateTimeField(auto_now_add=True)
+
+
+class ResumeSkill(models.Model):
+    """One posting: ``resume`` lists ``skill``. The (skill, resume) index serves the posting lists."""
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE)
+    resume = models.ForeignKey(Resume, on_delete=models.CASCADE)
+
+    class Meta:
+        constraints = [models.UniqueConstraint(fields=['skill', 'resume'], name='unique_resume_skill')]
+
+
+class ResumeJob(models.Model):
+    """
+    A resume waiting for (or done with) background extraction.
+
+    ``run_after`` doubles as the visibility timeout: a running job whose
+    ``run_after`` has passed is assumed to have lost its worker and can be
+    claimed again.
+    """
+    PENDING = 'pending'
+    RUNNING = 'running'
+    DONE = 'done'
+    FAILED = 'failed'
+    STATUS_CHOICES = [
+        (PENDING, 'Pending'),
+        (RUNNING, 'Running'),
+        (DONE, 'Done'),
+        (FAILED, 'Failed'),
+    ]
+
+    blob = models.ForeignKey(ResumeBlob, on_delete=models.CASCADE, related_name='jobs')
+    name = models.CharField(max_length=100)
+    email = models.EmailField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default=PENDING)
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=3)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    resume = models.ForeignKey(Resume, null=True, blank=True, on_delete=models.SET_NULL, related_name='jobs')
+    error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [models.Index(fields=['status', 'run_after'])]
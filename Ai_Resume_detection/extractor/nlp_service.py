@@ -0,0 +1,326 @@
+"""
+Local NLP service shared by the Django, FastAPI and Streamlit processes.
+
+Without it every process loads its own spaCy models. ``run_nlp_service``
+starts a few warm worker processes behind a Unix-domain socket instead;
+requests from all clients are grouped into batches, which the workers run
+through ``nlp.pipe``.
+
+Clients call ``call(op, texts)``. When the service is not running (or stops
+answering) the same operation runs in-process, so callers never depend on
+it. Set ``NLP_SERVICE=off`` to skip the service entirely.
+
+Wire format, both ways: a 4-byte big-endian length, then a JSON object.
+Requests are ``{"op": ..., "texts": [...]}``, answers ``{"results": [...]}``
+or ``{"error": "..."}``.
+
+This module does not import Django, so the FastAPI side can use the client.
+"""
+import os
+import json
+import time
+import socket
+import struct
+import asyncio
+import logging
+import tempfile
+import threading
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+SOCKET_PATH = os.environ.get("NLP_SERVICE_SOCKET") or os.path.join(tempfile.gettempdir(), "resume-nlp.sock")
+ENABLED = os.environ.get("NLP_SERVICE", "on").lower() not in ("0", "off", "false", "no")
+
+_HEADER = struct.Struct(">I")
+MAX_MESSAGE = 64 * 1024 * 1024
+
+
+# ------------------- Operations -------------------
+def _extract(texts):
+    from .analysis import ResumeAnalysis, parse_many
+    from .utils import extract_fields_local
+
+    analyses = [ResumeAnalysis(text) for text in texts]
+    parse_many(analyses)
+    return [extract_fields_local(text, analysis) for text, analysis in zip(texts, analyses)]
+
+
+def _lemmatize(texts):
+    from .model_registry import get_model
+
+    return [" ".join(token.lemma_ for token in doc if not token.is_punct)
+            for doc in get_model("cleaner").pipe(texts)]
+
+
+# Operation -> batch function (a list of texts in, a list of JSON-able results out)
+OPERATIONS = {
+    "extract": _extract,
+    "lemmatize": _lemmatize,
+}
+
+
+def run_local(op, texts):
+    return OPERATIONS[op](list(texts))
+
+
+# ------------------- Framing -------------------
+def _encode(message):
+    body = json.dumps(message).encode("utf-8")
+    return _HEADER.pack(len(body)) + body
+
+
+def _recv_exactly(sock, size):
+    data = bytearray()
+    while len(data) < size:
+        chunk = sock.recv(size - len(data))
+        if not chunk:
+            raise ConnectionError("NLP service closed the connection")
+        data += chunk
+    return bytes(data)
+
+
+async def _read_message(reader):
+    try:
+        header = await reader.readexactly(_HEADER.size)
+    except asyncio.IncompleteReadError:
+        return None
+    (size,) = _HEADER.unpack(header)
+    if size > MAX_MESSAGE:
+        raise ValueError(f"Message of {size} bytes is too large")
+    return json.loads(await reader.readexactly(size))
+
+
+# ------------------- Client -------------------
+class ServiceUnavailable(Exception):
+    pass
+
+
+class NLPClient:
+    """
+    Blocking client with one connection per thread. After a failed connect
+    the service is not tried again for ``retry_after`` seconds, so callers
+    fall back to in-process work without paying for a connect every time.
+    """
+
+    def __init__(self, socket_path=SOCKET_PATH, timeout=120.0, retry_after=5.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.retry_after = retry_after
+        self._local = threading.local()
+        self._down_until = 0.0
+
+    def _connection(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def request(self, message):
+        if time.monotonic() < self._down_until:
+            raise ServiceUnavailable(self.socket_path)
+        try:
+            sock = self._connection()
+            sock.sendall(_encode(message))
+            (size,) = _HEADER.unpack(_recv_exactly(sock, _HEADER.size))
+            response = json.loads(_recv_exactly(sock, size))
+        except (OSError, ValueError) as exc:
+            self._close()
+            self._down_until = time.monotonic() + self.retry_after
+            raise ServiceUnavailable(f"{self.socket_path}: {exc}") from exc
+        if "error" in response:
+            raise RuntimeError(f"NLP service: {response['error']}")
+        return response
+
+    def call(self, op, texts):
+        return self.request({"op": op, "texts": list(texts)})["results"]
+
+    def available(self):
+        try:
+            self.request({"op": "ping"})
+        except (ServiceUnavailable, RuntimeError):
+            return False
+        return True
+
+
+_client = None
+
+
+def get_client():
+    global _client
+    if _client is None:
+        _client = NLPClient()
+    return _client
+
+
+def call(op, texts):
+    """Run ``op`` over ``texts`` in the service, or in this process when it is not running."""
+    if ENABLED:
+        try:
+            return get_client().call(op, texts)
+        except ServiceUnavailable as exc:
+            logger.debug("Running %s in-process: %s", op, exc)
+    return run_local(op, texts)
+
+
+def service_available():
+    return ENABLED and get_client().available()
+
+
+def _after_fork():
+    # A forked child must not talk over its parent's connection
+    global _client
+    if _client is not None:
+        _client._close()
+    _client = None
+
+
+os.register_at_fork(after_in_child=_after_fork)
+
+
+# ------------------- Server -------------------
+def _init_worker(models):
+    from django.apps import apps
+    if not apps.ready:
+        import django
+        django.setup()
+    from .model_registry import warm_up
+    from .pdf_text import mark_worker_process
+    mark_worker_process()
+    warm_up(models)
+
+
+def _noop():
+    return None
+
+
+class NLPService:
+    """
+    Serves the operations over ``socket_path`` with ``workers`` warm processes.
+
+    Requests for the same operation that arrive within ``max_wait`` seconds
+    of each other, or while every worker is busy, are merged into one batch of
+    up to ``max_batch`` texts, and each worker runs one batch at a time.
+    """
+
+    def __init__(self, socket_path=SOCKET_PATH, workers=2, max_batch=16, max_wait=0.005,
+                 models=("extractor", "cleaner")):
+        self.socket_path = socket_path
+        self.workers = workers
+        self.max_batch = max_batch
+        self.max_wait = max_wait
+        self.models = list(models)
+        self.batches = 0
+        self.texts = 0
+
+    async def serve(self, stop):
+        """Serve until the ``stop`` event is set."""
+        loop = asyncio.get_running_loop()
+        # Spawned, not forked: the event loop and the executor's threads are already running
+        self.pool = ProcessPoolExecutor(self.workers, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=_init_worker, initargs=(self.models,))
+        self.slots = asyncio.Semaphore(self.workers)
+        self.queues = {op: asyncio.Queue() for op in OPERATIONS}
+        self.running = set()
+        try:
+            # Start every worker and load its models before accepting requests
+            await asyncio.gather(*[loop.run_in_executor(self.pool, _noop) for _ in range(self.workers)])
+            batchers = [asyncio.create_task(self._batcher(op)) for op in OPERATIONS]
+
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            server = await asyncio.start_unix_server(self._handle, path=self.socket_path, limit=MAX_MESSAGE)
+            os.chmod(self.socket_path, 0o600)
+            logger.info("NLP service listening on %s with %d workers", self.socket_path, self.workers)
+            async with server:
+                await stop.wait()
+            for task in batchers:
+                task.cancel()
+        finally:
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+            self.pool.shutdown(cancel_futures=True)
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                try:
+                    request = await _read_message(reader)
+                except (ValueError, asyncio.IncompleteReadError) as exc:
+                    writer.write(_encode({"error": f"Bad request: {exc}"}))
+                    break
+                if request is None:
+                    break
+                writer.write(_encode(await self._answer(request)))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _answer(self, request):
+        op = request.get("op")
+        if op == "ping":
+            return {"results": {"workers": self.workers, "batches": self.batches, "texts": self.texts}}
+        if op not in OPERATIONS:
+            return {"error": f"Unknown operation {op!r}"}
+        texts = request.get("texts") or []
+        if not texts:
+            return {"results": []}
+        future = asyncio.get_running_loop().create_future()
+        await self.queues[op].put((texts, future))
+        try:
+            return {"results": await future}
+        except Exception as exc:
+            return {"error": f"{type(exc).__name__}: {exc}"}
+
+    async def _batcher(self, op):
+        queue = self.queues[op]
+        while True:
+            batch = [await queue.get()]
+            # Requests keep queueing up while every worker is busy
+            await self.slots.acquire()
+            size = len(batch[0][0])
+            # Give concurrent requests a moment to join the batch
+            if size < self.max_batch and queue.empty():
+                await asyncio.sleep(self.max_wait)
+            while size < self.max_batch and not queue.empty():
+                item = queue.get_nowait()
+                batch.append(item)
+                size += len(item[0])
+            task = asyncio.create_task(self._run(op, batch))
+            self.running.add(task)
+            task.add_done_callback(self.running.discard)
+
+    async def _run(self, op, batch):
+        texts = [text for item_texts, _ in batch for text in item_texts]
+        try:
+            results = await asyncio.get_running_loop().run_in_executor(self.pool, run_local, op, texts)
+        except Exception as exc:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(exc)
+        else:
+            self.batches += 1
+            self.texts += len(texts)
+            start = 0
+            for item_texts, future in batch:
+                if not future.done():
+                    future.set_result(results[start:start + len(item_texts)])
+                start += len(item_texts)
+        finally:
+            self.slots.release()
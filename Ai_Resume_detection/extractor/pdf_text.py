@@ -0,0 +1,237 @@
+"""
+PDF text extraction engine.
+
+Pages are produced one at a time, long documents are split across worker
+processes, and page/character caps bound the work done for any one file.
+Two backends are available: PyPDF2 (fast) and pdfplumber (slower, better on
+some layouts). "auto" uses PyPDF2 and only falls back to pdfplumber when
+PyPDF2 gives no usable text.
+
+This module does not import Django, so the FastAPI side can use it as well.
+"""
+import io
+import os
+import atexit
+import mmap
+import tempfile
+import threading
+import multiprocessing
+from collections import deque
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+
+from PyPDF2 import PdfReader
+
+try:
+    import pdfplumber
+except ImportError:  # optional backend
+    pdfplumber = None
+
+
+MAX_PAGES = 50
+MAX_CHARS = 200_000
+# Documents with more pages than this are split across worker processes
+PARALLEL_MIN_PAGES = 8
+# Pages per task handed to a worker; smaller ranges stop sooner once MAX_CHARS is reached
+RANGE_PAGES = 4
+# A first page with less text than this is treated as "PyPDF2 could not read it"
+MIN_USABLE_CHARS = 20
+
+BACKENDS = ("auto", "pypdf2", "pdfplumber")
+
+
+# ------------------- Sources -------------------
+@contextmanager
+def open_pdf(source):
+    """
+    Yield a seekable binary stream for ``source``.
+
+    Paths are memory-mapped instead of read into memory; file objects and
+    bytes are used as they are.
+    """
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        yield io.BytesIO(source)
+    elif isinstance(source, (str, os.PathLike)):
+        with open(source, "rb") as f:
+            try:
+                buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                yield io.BytesIO(b"")
+                return
+            with buffer:
+                yield buffer
+    else:
+        source.seek(0)
+        yield source
+
+
+# ------------------- Backends -------------------
+def _pypdf2_pages(stream, start, stop):
+    reader = PdfReader(stream)
+    for page in reader.pages[start:stop]:
+        yield page.extract_text() or ""
+
+
+def _pdfplumber_pages(stream, start, stop):
+    if pdfplumber is None:
+        raise RuntimeError("pdfplumber is not installed")
+    with pdfplumber.open(stream) as pdf:
+        for page in pdf.pages[start:stop]:
+            yield page.extract_text() or ""
+            # Drop the page's parsed layout objects as soon as we are done with it
+            page.close()
+
+
+_PAGE_READERS = {"pypdf2": _pypdf2_pages, "pdfplumber": _pdfplumber_pages}
+
+
+def page_count(stream):
+    return len(PdfReader(stream).pages)
+
+
+def choose_backend(stream):
+    """Pick PyPDF2 when its first page has usable text, pdfplumber otherwise."""
+    if pdfplumber is None:
+        return "pypdf2"
+    first = next(_pypdf2_pages(stream, 0, 1), "")
+    return "pypdf2" if len(first.strip()) >= MIN_USABLE_CHARS else "pdfplumber"
+
+
+# ------------------- Streaming API -------------------
+def iter_pdf_pages(source, backend="auto", max_pages=MAX_PAGES, max_chars=MAX_CHARS):
+    """
+    Yield the text of each page of ``source`` (path, bytes or file object).
+
+    Stops after ``max_pages`` pages or once ``max_chars`` characters have been
+    produced; the last page is cut to fit. ``None`` disables a cap.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}, expected one of {BACKENDS}")
+
+    with open_pdf(source) as stream:
+        if backend == "auto":
+            backend = choose_backend(stream)
+            stream.seek(0)
+
+        remaining = max_chars
+        for text in _PAGE_READERS[backend](stream, 0, max_pages):
+            if remaining is not None:
+                text = text[:remaining]
+                remaining -= len(text)
+            yield text
+            if remaining is not None and remaining <= 0:
+                break
+
+
+# ------------------- Parallel API -------------------
+_executor = None
+_executor_lock = threading.Lock()
+_in_worker = False
+
+
+def mark_worker_process():
+    """
+    Extract every PDF in this process from now on. Called at the start of every
+    worker process (ingest, job queue, parse and NLP service pools): their
+    parents already run one per CPU, and a page pool in each would multiply that.
+    """
+    global _in_worker
+    _in_worker = True
+
+
+def _get_executor():
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            # Spawned, not forked: web servers call this from one of several threads,
+            # and forking a multithreaded process can deadlock the child
+            _executor = ProcessPoolExecutor(max_workers=os.cpu_count() or 1,
+                                            mp_context=multiprocessing.get_context("spawn"))
+            atexit.register(_executor.shutdown, cancel_futures=True)
+    return _executor
+
+
+def _extract_page_range(source, backend, start, stop):
+    with open_pdf(source) as stream:
+        return list(_PAGE_READERS[backend](stream, start, stop))
+
+
+def _join(pages, max_chars):
+    text = "".join(page + "\n" for page in pages if page)
+    return text if max_chars is None else text[:max_chars]
+
+
+def extract_pdf_text(source, backend="auto", max_pages=MAX_PAGES, max_chars=MAX_CHARS, workers=None):
+    """
+    Return the text of ``source`` with one line break after every non-empty page.
+
+    Documents longer than ``PARALLEL_MIN_PAGES`` pages are split into ranges
+    of ``RANGE_PAGES`` pages extracted in parallel by up to ``workers``
+    processes (default: one per CPU); ``workers=1`` always extracts in this
+    process.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown PDF backend {backend!r}, expected one of {BACKENDS}")
+
+    with open_pdf(source) as stream:
+        pages = page_count(stream)
+        if max_pages is not None:
+            pages = min(pages, max_pages)
+        workers = min(workers or os.cpu_count() or 1, pages)
+        if _in_worker or multiprocessing.current_process().daemon:
+            # Worker processes are already one per CPU, and daemonic ones may not start processes
+            workers = 1
+
+        if pages <= PARALLEL_MIN_PAGES or workers <= 1:
+            stream.seek(0)
+            return _join(iter_pdf_pages(stream, backend, max_pages, max_chars), max_chars)
+
+        if backend == "auto":
+            stream.seek(0)
+            backend = choose_backend(stream)
+        spooled = None
+        if not isinstance(source, (str, os.PathLike)):
+            # Workers cannot share a file object; they map one temporary copy instead of each getting the bytes
+            stream.seek(0)
+            with tempfile.NamedTemporaryFile(suffix=".pdf", delete=False) as spool:
+                spool.write(stream.read())
+            source = spooled = spool.name
+
+    try:
+        return _join(_extract_in_ranges(source, backend, pages, workers, max_chars), max_chars)
+    finally:
+        if spooled is not None:
+            os.remove(spooled)
+
+
+def _extract_in_ranges(source, backend, pages, workers, max_chars):
+    """
+    Page texts in order, extracted ``RANGE_PAGES`` at a time with ``workers``
+    ranges in flight; no further ranges are submitted once ``max_chars``
+    characters have come back.
+    """
+    executor = _get_executor()
+    ranges = iter(range(0, pages, RANGE_PAGES))
+    pending = deque()
+
+    def submit():
+        start = next(ranges, None)
+        if start is not None:
+            stop = min(start + RANGE_PAGES, pages)
+            pending.append(executor.submit(_extract_page_range, source, backend, start, stop))
+
+    for _ in range(workers):
+        submit()
+    collected = 0
+    try:
+        while pending:
+            for page in pending.popleft().result():
+                yield page
+                if page:
+                    collected += len(page) + 1
+            if max_chars is not None and collected >= max_chars:
+                return
+            submit()
+    finally:
+        for future in pending:
+            future.cancel()
@@ -0,0 +1,54 @@
+"""
+Preforked serving: load once in the master, share with every worker.
+
+Gunicorn (``preload_app``) imports the application in the master process and
+then forks the workers. Whatever the master has loaded by then - spaCy
+pipelines, the compiled skill trie - is shared copy-on-write, as long as the
+workers do not write to those pages. Reference counts make that impossible
+to avoid entirely, but the garbage collector would touch every object on its
+first full collection; ``gc.freeze()`` moves the master's objects to a
+permanent generation the collector never visits.
+
+The configurations follow the recipe from the ``gc.freeze`` documentation:
+collection is disabled before the master loads anything (so freed objects
+do not leave holes in pages that get shared), objects are frozen right
+before every fork, and the collector is switched back on in each worker.
+
+Used by the gunicorn configurations of the Django project (gunicorn.conf.py
+next to manage.py) and of the FastAPI app (gunicorn.conf.py at the
+repository root).
+"""
+import gc
+import time
+
+
+def preload(models=None):
+    """
+    Load the NLP models (default: every registered one) and the skill
+    dictionary in this process and return the seconds it took. Django must be
+    set up. Models are skipped when the shared NLP service is running, since
+    the workers then never use their own.
+    """
+    from django.db import connections
+    from .model_registry import warm_up
+    from .nlp_service import service_available
+    from .skill_matcher import get_skill_matcher
+
+    started = time.monotonic()
+    if not service_available():
+        warm_up(models)
+    get_skill_matcher().refresh()
+    # Sockets must not be shared between forked workers
+    connections.close_all()
+    return time.monotonic() - started
+
+
+def freeze():
+    """Called in the master right before a worker is forked; returns the number of frozen objects."""
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+def worker_started():
+    """Called in every worker right after the fork."""
+    gc.enable()
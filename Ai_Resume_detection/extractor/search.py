@@ -0,0 +1,180 @@
+"""
+Full-text search over stored resumes.
+
+On SQLite an FTS5 external-content table, ``extractor_resume_fts``, indexes
+the resume text columns; triggers on ``extractor_resume`` keep it in sync, so
+bulk_create and queryset updates are indexed too. Results are ranked with
+BM25 and come with a highlighted snippet. On PostgreSQL the same queries run
+against a GIN index on a ``tsvector`` expression instead. Other backends fall
+back to ``icontains`` filters, without ranking.
+
+Queries are plain words (all must match), ``"quoted phrases"`` and prefixes
+such as ``devel*``.
+"""
+import re
+import html
+
+from django.db import connection
+from django.db.models import Q
+
+from .models import Resume
+
+# Indexed columns, in FTS5 column order, with their BM25 weights
+FTS_COLUMNS = ["summary", "experience", "projects", "education", "skills"]
+FTS_WEIGHTS = [1.0, 1.5, 1.0, 0.5, 2.0]
+FTS_TABLE = "extractor_resume_fts"
+
+# Must stay identical to the expression of the extractor_resume_search index
+POSTGRES_DOCUMENT = "to_tsvector('english', " + " || ' ' || ".join(f"coalesce({c}, '')" for c in FTS_COLUMNS) + ")"
+
+SNIPPET_TOKENS = 16
+# Control characters mark the hits, so the snippet can be escaped before adding <mark>
+_START, _STOP = "\x02", "\x03"
+
+
+# ------------------- Sync Triggers -------------------
+def _columns(prefix=""):
+    return ", ".join(prefix + column for column in FTS_COLUMNS)
+
+
+def sqlite_triggers():
+    """The triggers migration 0009 created, for re-creating them after a table rebuild."""
+    return [
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON extractor_resume BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, {_columns()}) VALUES (new.id, {_columns('new.')});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON extractor_resume BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns()}) VALUES ('delete', old.id, {_columns('old.')});
+        END
+        """,
+        f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF {_columns()} ON extractor_resume BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, {_columns()}) VALUES ('delete', old.id, {_columns('old.')});
+            INSERT INTO {FTS_TABLE}(rowid, {_columns()}) VALUES (new.id, {_columns('new.')});
+        END
+        """,
+    ]
+
+
+def ensure_sqlite_triggers(using="default", **kwargs):
+    """
+    Re-create the sync triggers if they are gone.
+
+    SQLite migrations that alter ``Resume`` rebuild its table, which drops the
+    triggers with it; this runs after every ``migrate`` (see apps.py).
+    """
+    from django.db import connections
+
+    conn = connections[using]
+    if conn.vendor != "sqlite" or FTS_TABLE not in conn.introspection.table_names():
+        return
+    with conn.cursor() as cursor:
+        for statement in sqlite_triggers():
+            cursor.execute(statement)
+
+
+# ------------------- Query Parsing -------------------
+_TERM_RE = re.compile(r'"([^"]*)"|(\S+)')
+_WORD_RE = re.compile(r"\w+")
+
+
+def parse_query(query):
+    """
+    ``query`` as a list of (words, is_prefix) terms. Punctuation is dropped, so
+    no user input can reach the FTS5 / tsquery syntax.
+    """
+    terms = []
+    for phrase, word in _TERM_RE.findall(query or ""):
+        words = _WORD_RE.findall(phrase or word)
+        if words:
+            terms.append((words, bool(word) and word.endswith("*")))
+    return terms
+
+
+def _fts5_match(terms):
+    parts = []
+    for words, prefix in terms:
+        parts.append('"' + " ".join(words) + '"' + ("*" if prefix else ""))
+    return " ".join(parts)
+
+
+def _tsquery(terms):
+    parts = []
+    for words, prefix in terms:
+        lexemes = [f"'{word}'" for word in words]
+        if prefix:
+            lexemes[-1] += ":*"
+        parts.append("(" + " <-> ".join(lexemes) + ")")
+    return " & ".join(parts)
+
+
+def _highlight(snippet):
+    if not snippet:
+        return ""
+    return html.escape(snippet).replace(_START, "<mark>").replace(_STOP, "</mark>")
+
+
+# ------------------- Searching -------------------
+def search_resumes(query, limit=20, offset=0):
+    """
+    Resumes matching ``query``, best first, as dicts with ``id``, ``name``,
+    ``email``, ``rank`` (lower is better on SQLite, higher on PostgreSQL; None
+    on other backends) and an HTML ``snippet`` with the hits in ``<mark>``.
+    """
+    terms = parse_query(query)
+    if not terms:
+        return []
+
+    if connection.vendor == "sqlite":
+        weights = ", ".join(str(weight) for weight in FTS_WEIGHTS)
+        sql = f"""
+            SELECT r.id, r.name, r.email, bm25({FTS_TABLE}, {weights}) AS rank,
+                   snippet({FTS_TABLE}, -1, %s, %s, '…', {SNIPPET_TOKENS})
+            FROM {FTS_TABLE} JOIN extractor_resume r ON r.id = {FTS_TABLE}.rowid
+            WHERE {FTS_TABLE} MATCH %s
+            ORDER BY rank LIMIT %s OFFSET %s
+        """
+        params = [_START, _STOP, _fts5_match(terms), limit, offset]
+    elif connection.vendor == "postgresql":
+        sql = f"""
+            SELECT id, name, email, ts_rank_cd({POSTGRES_DOCUMENT}, q) AS rank,
+                   ts_headline('english', {" || ' ' || ".join(f"coalesce({c}, '')" for c in FTS_COLUMNS)}, q,
+                               %s)
+            FROM extractor_resume, to_tsquery('english', %s) q
+            WHERE {POSTGRES_DOCUMENT} @@ q
+            ORDER BY rank DESC LIMIT %s OFFSET %s
+        """
+        options = f"StartSel={_START}, StopSel={_STOP}, MaxWords={SNIPPET_TOKENS}, MinWords=5"
+        params = [options, _tsquery(terms), limit, offset]
+    else:
+        return [
+            {"id": resume.pk, "name": resume.name, "email": resume.email, "rank": None, "snippet": ""}
+            for resume in _fallback_queryset(terms).order_by("-pk")[offset:offset + limit]
+        ]
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+    return [
+        {"id": pk, "name": name, "email": email, "rank": rank, "snippet": _highlight(snippet)}
+        for pk, name, email, rank, snippet in rows
+    ]
+
+
+def search_ids(query, limit=200):
+    """Ids of the best ``limit`` matches for ``query``, best first."""
+    return [row["id"] for row in search_resumes(query, limit=limit)]
+
+
+def _fallback_queryset(terms):
+    queryset = Resume.objects.all()
+    for words, _ in terms:
+        phrase = " ".join(words)
+        match = Q()
+        for column in FTS_COLUMNS:
+            match |= Q(**{f"{column}__icontains": phrase})
+        queryset = queryset.filter(match)
+    return queryset
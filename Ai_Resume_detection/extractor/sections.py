@@ -0,0 +1,104 @@
+import re
+
+
+# Heading keywords for every section the extractors read, in priority order
+SECTION_KEYWORDS = {
+    "summary": ["summary", "objective", "profile"],
+    "experience": ["experience", "work experience", "employment history", "professional experience"],
+    "education": ["education", "academic background", "qualifications", "educational qualifications"],
+    "projects": ["projects", "project experience", "notable projects"],
+    "achievements": ["achievements", "certifications", "awards", "recognitions", "honors"],
+}
+
+# Headings that are not extracted but still end the section before them
+BOUNDARY_KEYWORDS = [
+    "skills", "competencies", "contact", "languages", "interests", "hobbies",
+    "references", "declaration", "publications", "activities",
+]
+
+
+def _build_heading_re():
+    keywords = {}
+    for section, words in SECTION_KEYWORDS.items():
+        for word in words:
+            keywords.setdefault(word, section)
+    for word in BOUNDARY_KEYWORDS:
+        keywords.setdefault(word, None)
+
+    # Longest first, so "project experience" wins over "experience"
+    alternation = "|".join(
+        r"[ \t]+".join(map(re.escape, word.split())) for word in sorted(keywords, key=len, reverse=True)
+    )
+    # A heading is a line made of up to three leading words ("Career", "Professional")
+    # and a keyword, optionally followed by ":" or "-" and the first line of the section
+    pattern = re.compile(
+        rf"^[ \t]*(?P<lead>(?:[A-Za-z&/]+[ \t]+){{0,3}}?)(?P<keyword>{alternation})\b"
+        rf"[ \t]*(?:(?P<sep>[:\-–])[ \t]*(?P<inline>[^\n]*))?[ \t]*$",
+        re.IGNORECASE | re.MULTILINE,
+    )
+    return pattern, keywords
+
+
+HEADING_RE, _KEYWORD_SECTIONS = _build_heading_re()
+
+# Words a Title Case heading may leave in lower case ("Summary of Qualifications")
+_MINOR_WORDS = {"of", "and", "&", "/", "in", "for", "the"}
+
+
+def _is_heading(match):
+    """
+    A bare keyword is always a heading; with leading words the line must look
+    like one (UPPER CASE, Title Case or "...:"), so a sentence that happens to
+    end in a keyword ("Led several key projects") does not split its section.
+    """
+    lead = match.group("lead").split()
+    if not lead or match.group("sep") == ":":
+        return True
+    words = lead + match.group("keyword").split()
+    if " ".join(words).isupper():
+        return True
+    return all(word[0].isupper() or word.lower() in _MINOR_WORDS for word in words)
+
+
+class SectionIndex:
+    """
+    Heading offsets of one resume, found with a single pass over the text.
+
+    Every section runs from the end of its heading (or the inline text after
+    "Heading:") up to the next heading, so field extractors only slice strings.
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.spans = {}
+
+        headings = []
+        for match in HEADING_RE.finditer(text):
+            if not _is_heading(match):
+                continue
+            keyword = " ".join(match.group("keyword").lower().split())
+            start = match.start("inline") if match.group("inline") else match.end()
+            headings.append((_KEYWORD_SECTIONS[keyword], start, match.start()))
+
+        for i, (section, start, _) in enumerate(headings):
+            if section is None:
+                continue
+            end = headings[i + 1][2] if i + 1 < len(headings) else len(text)
+            self.spans.setdefault(section, []).append((start, end))
+
+    def __contains__(self, section):
+        return section in self.spans
+
+    def all(self, section):
+        """Return the non-empty bodies of every ``section`` heading, in document order."""
+        bodies = (self.text[start:end].strip() for start, end in self.spans.get(section, []))
+        return [body for body in bodies if body]
+
+    def get(self, section, default=None):
+        """Return the body of the first ``section`` heading that has any content."""
+        bodies = self.all(section)
+        return bodies[0] if bodies else default
+
+
+def index_sections(text):
+    return SectionIndex(text or "")
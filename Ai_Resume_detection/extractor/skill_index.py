@@ -0,0 +1,118 @@
+"""
+Inverted index from normalized skills to resumes.
+
+``Resume.skills`` stays the comma-joined text shown to users; ``Skill`` and
+``ResumeSkill`` hold the same skills normalized, one row per (skill, resume)
+posting. A search for several skills starts from the shortest posting list
+and only probes the longer ones for the candidates left, so its cost follows
+the rarest skill rather than the size of the table.
+"""
+import re
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Count, F
+
+from .models import Resume, ResumeSkill, Skill
+
+
+def normalize_skill(name):
+    return re.sub(r"\s+", " ", name).strip().lower()[:100]
+
+
+def split_skills(text):
+    """Distinct normalized skills of a comma-joined ``Resume.skills`` value, in order."""
+    names = dict.fromkeys(normalize_skill(part) for part in (text or "").split(","))
+    names.pop("", None)
+    return list(names)
+
+
+def skill_ids(names, create=False):
+    """``{normalized name: id}`` for ``names``; missing skills are created when ``create`` is set."""
+    names = {normalize_skill(name) for name in names} - {""}
+    if create and names:
+        Skill.objects.bulk_create([Skill(name=name) for name in names], ignore_conflicts=True)
+    return dict(Skill.objects.filter(name__in=names).values_list("name", "id"))
+
+
+# ------------------- Indexing -------------------
+def sync_resume_skills(resumes):
+    """Make the postings of each saved resume match the skills in its ``skills`` text."""
+    wanted = {resume.pk: split_skills(resume.skills) for resume in resumes}
+    if not wanted:
+        return
+    ids = skill_ids({name for names in wanted.values() for name in names}, create=True)
+
+    with transaction.atomic():
+        current = defaultdict(set)
+        postings = ResumeSkill.objects.filter(resume_id__in=wanted).values_list("resume_id", "skill_id")
+        for resume_id, skill_id in postings:
+            current[resume_id].add(skill_id)
+
+        added, deltas = [], Counter()
+        for resume_id, names in wanted.items():
+            target = {ids[name] for name in names}
+            for skill_id in target - current[resume_id]:
+                added.append(ResumeSkill(resume_id=resume_id, skill_id=skill_id))
+                deltas[skill_id] += 1
+            removed = current[resume_id] - target
+            if removed:
+                ResumeSkill.objects.filter(resume_id=resume_id, skill_id__in=removed).delete()
+                deltas.update({skill_id: -1 for skill_id in removed})
+        ResumeSkill.objects.bulk_create(added, ignore_conflicts=True)
+
+        # One UPDATE per distinct delta rather than one per skill
+        by_delta = defaultdict(list)
+        for skill_id, delta in deltas.items():
+            if delta:
+                by_delta[delta].append(skill_id)
+        for delta, pks in by_delta.items():
+            Skill.objects.filter(pk__in=pks).update(resume_count=F("resume_count") + delta)
+
+
+def refresh_skill_counts():
+    """Recount every posting list, e.g. after resumes were deleted."""
+    counts = dict(ResumeSkill.objects.values("skill_id").annotate(n=Count("id")).values_list("skill_id", "n"))
+    skills = list(Skill.objects.only("id", "resume_count"))
+    for skill in skills:
+        skill.resume_count = counts.get(skill.pk, 0)
+    Skill.objects.bulk_update(skills, ["resume_count"], batch_size=1000)
+
+
+# ------------------- Searching -------------------
+def postings_query(skills):
+    """
+    ``resume_id`` values of the resumes listing every one of ``skills``, or None
+    when some skill is listed by nobody.
+
+    The posting lists are intersected shortest first as nested ``IN``
+    subqueries: each longer list is only probed, through the (skill, resume)
+    index, for the ids that survived the shorter ones.
+    """
+    names = {normalize_skill(skill) for skill in skills} - {""}
+    if not names:
+        return None
+    lists = list(Skill.objects.filter(name__in=names).values_list("id", "resume_count"))
+    if len(lists) < len(names):
+        return None
+
+    lists.sort(key=lambda posting: posting[1])
+    query = ResumeSkill.objects.filter(skill_id=lists[0][0]).values("resume_id")
+    for skill_id, _ in lists[1:]:
+        query = ResumeSkill.objects.filter(skill_id=skill_id, resume_id__in=query).values("resume_id")
+    return query
+
+
+def find_candidates(skills, limit=None):
+    """Ids of the resumes that list every one of ``skills``, newest first."""
+    query = postings_query(skills)
+    if query is None:
+        return []
+    return list(query.order_by("-resume_id").values_list("resume_id", flat=True)[:limit])
+
+
+def find_resumes(skills, limit=None):
+    """Resumes listing every one of ``skills``, newest first."""
+    ids = find_candidates(skills, limit)
+    resumes = Resume.objects.in_bulk(ids)
+    return [resumes[pk] for pk in ids if pk in resumes]
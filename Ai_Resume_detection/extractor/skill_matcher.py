@@ -0,0 +1,137 @@
+import os
+import re
+import json
+import threading
+
+from django.conf import settings
+
+
+# Words and single punctuation marks, so "node.js" -> node . js and "c++" -> c + +
+_TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+# Key under which a trie node stores the skills that end at it
+_END = None
+
+# File signature of a matcher that has not been compiled yet
+_UNBUILT = object()
+
+
+def _tokenize(text):
+    """
+    Split lowercased text into (token, spaced) pairs, where ``spaced`` tells
+    whether whitespace separated the token from the one before it.
+    """
+    tokens = []
+    prev_end = 0
+    for match in _TOKEN_RE.finditer(text):
+        tokens.append((match.group(), match.start() != prev_end))
+        prev_end = match.end()
+    return tokens
+
+
+def default_skills_file():
+    return settings.BASE_DIR / "skills" / "skills.json"
+
+
+class SkillMatcher:
+    """
+    Finds every dictionary skill in a text with one pass over its tokens.
+
+    The skills file is compiled into a token trie. A match has to start and end
+    on token boundaries, which gives the same word-boundary behaviour as
+    ``\\bskill\\b`` (and also works for skills ending in punctuation, like C++).
+    The file is recompiled automatically when its mtime or size changes.
+    """
+
+    def __init__(self, skills_file=None):
+        self.skills_file = skills_file or default_skills_file()
+        self._lock = threading.Lock()
+        self._signature = _UNBUILT
+        self._compiled = ({}, {})
+
+    # ------------------- Building -------------------
+    def _stat(self):
+        try:
+            st = os.stat(self.skills_file)
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load_skills(self):
+        try:
+            with open(self.skills_file, "r") as f:
+                return json.load(f).get("skills", [])
+        except FileNotFoundError:
+            return []
+
+    def _compile(self, skills):
+        root = {}
+        order = {}
+        for skill in skills:
+            tokens = _tokenize(skill.lower())
+            if not tokens or skill in order:
+                continue
+            order[skill] = len(order)
+            # The gap before the first token does not matter, only the ones inside the skill
+            node = root.setdefault((tokens[0][0], False), {})
+            for token in tokens[1:]:
+                node = node.setdefault(token, {})
+            node.setdefault(_END, []).append(skill)
+        return root, order
+
+    def refresh(self):
+        """Recompile the trie if the skills file changed since the last build."""
+        signature = self._stat()
+        if signature == self._signature:
+            return
+        with self._lock:
+            if signature == self._signature:
+                return
+            self._compiled = self._compile(self._load_skills() if signature else [])
+            self._signature = signature
+
+    @property
+    def skills(self):
+        self.refresh()
+        return list(self._compiled[1])
+
+    # ------------------- Matching -------------------
+    def _scan(self, text):
+        root, order = self._compiled
+        tokens = _tokenize(text.lower())
+        found = set()
+        for i, (token, _) in enumerate(tokens):
+            node = root.get((token, False))
+            j = i + 1
+            while node is not None:
+                if _END in node:
+                    found.update(node[_END])
+                if j == len(tokens):
+                    break
+                node = node.get(tokens[j])
+                j += 1
+        return sorted(found, key=order.__getitem__)
+
+    def match(self, text):
+        """Return the skills found in ``text``, in dictionary order."""
+        self.refresh()
+        return self._scan(text or "")
+
+    def match_many(self, texts):
+        """Batch version of ``match``; the skills file is checked only once."""
+        self.refresh()
+        return [self._scan(text or "") for text in texts]
+
+
+_matchers = {}
+_matchers_lock = threading.Lock()
+
+
+def get_skill_matcher(skills_file=None):
+    """Return the shared matcher for ``skills_file`` (default: skills/skills.json)."""
+    key = str(skills_file or default_skills_file())
+    matcher = _matchers.get(key)
+    if matcher is None:
+        with _matchers_lock:
+            matcher = _matchers.setdefault(key, SkillMatcher(key))
+    return matcher
@@ -1,34 +1,52 @@
 import os
 import sys
-import django
+import io
+import hashlib
 from pathlib import Path
-import tempfile
+
+import streamlit as st
+import plotly.express as px
+import plotly.graph_objects as go
+import pandas as pd
 import json
-import io
 
-# Setup Django
 BASE_DIR = Path(__file__).resolve().parent.parent.parent
-sys.path.append(str(BASE_DIR))
-os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Ai_Resume_detection.settings')
-django.setup()
+
+
+# Streamlit reruns this script on every interaction; process-wide setup is done once
+@st.cache_resource(show_spinner=False)
+def setup_django():
+    import django
+
+    sys.path.append(str(BASE_DIR))
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'Ai_Resume_detection.settings')
+    django.setup()
+    return True
+
+
+setup_django()
 
 # Import your existing Django utilities and models
+from django.conf import settings
+from extractor.jd_cache import cache_key
 from extractor.utils import (
     extract_resume_data, 
     ats_checker,
     extract_text_from_pdf,
     extract_text_from_docx,
-    ask_google_generativeai
 )
 from extractor.models import Resume
-from django.core.files.base import ContentFile
-from django.core.files.storage import default_storage
 
-import streamlit as st
-import plotly.express as px
-import plotly.graph_objects as go
-import pandas as pd
-import json
+
+@st.cache_resource(show_spinner="Loading NLP models...")
+def load_models():
+    """Load the NLP models once per server, unless the shared NLP service runs them."""
+    from extractor.model_registry import status, warm_up
+    from extractor.nlp_service import service_available
+
+    if not service_available():
+        warm_up(settings.NLP_WARMUP_MODELS)
+    return status()
 
 # Page configuration
 st.set_page_config(
@@ -111,6 +129,38 @@ def extract_text_from_uploaded_file(uploaded_file):
     
 # <--------extraction end------------------->
 
+# <-----------cached results start------------------->
+# Keyed by the SHA-256 of the file (and a hash of the job description), so a
+# rerun with the same upload never extracts it again. Arguments starting with
+# an underscore are not hashed by Streamlit.
+
+def file_sha256(uploaded_file):
+    return hashlib.sha256(uploaded_file.getvalue()).hexdigest()
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def analyze_resume(sha256, file_type, _content):
+    return extract_resume_data(io.BytesIO(_content), file_type)
+
+
+@st.cache_data(max_entries=64, show_spinner=False)
+def resume_text(sha256, file_name, _content):
+    uploaded_file = io.BytesIO(_content)
+    uploaded_file.name = file_name
+    return extract_text_from_uploaded_file(uploaded_file)
+
+
+@st.cache_data(max_entries=256, show_spinner=False)
+def check_ats(sha256, jd_hash, _resume_text, _job_description):
+    return ats_checker(_resume_text, _job_description)
+
+
+@st.cache_data(ttl=60, show_spinner=False)
+def database_stats():
+    return {"total_resumes": Resume.objects.count()}
+
+# <-----------cached results end------------------->
+
 # <-----------Display Functions start: without ats-------------------> 
 
 def display_resume_analysis(extracted_data):
@@ -307,6 +357,7 @@ def display_ats_results(ats_result, resume_text):
 
 def main():
     st.markdown('<h1 class="main-header">📄 AI Resume Detection & ATS Checker</h1>', unsafe_allow_html=True)
+    load_models()
     
     # Create tabs
     tab1, tab2, tab3 = st.tabs(["📁 Upload & Analyze", "🎯 ATS Checker", "ℹ️ About"])
@@ -338,7 +389,7 @@ def main():
                     file_type = 'docx' if file_extension in ['docx', 'doc'] else 'pdf'
                     
                     # Extract resume data using your existing function
-                    extracted_data = extract_resume_data(uploaded_file, file_type)
+                    extracted_data = analyze_resume(file_sha256(uploaded_file), file_type, uploaded_file.getvalue())
                     
                     if 'error' in extracted_data:
                         st.error(f"Error processing resume: {extracted_data['error']}")
@@ -386,14 +437,15 @@ def main():
             else:
                 with st.spinner("🔄 Analyzing ATS compatibility... This may take a moment."):
                     # Extract text from resume
-                    resume_text = extract_text_from_uploaded_file(ats_resume_file)
+                    sha256 = file_sha256(ats_resume_file)
+                    text = resume_text(sha256, ats_resume_file.name, ats_resume_file.getvalue())
                     
-                    if resume_text:
+                    if text:
                         # Perform ATS analysis using your existing function
-                        ats_result = ats_checker(resume_text, job_description)
+                        ats_result = check_ats(sha256, cache_key(job_description), text, job_description)
                         
                         # Display results
-                        display_ats_results(ats_result, resume_text)
+                        display_ats_results(ats_result, text)
                     else:
                         st.error("❌ Could not extract text from the uploaded resume file.")
     
@@ -486,7 +538,7 @@ def main():
         col1, col2 = st.columns(2)
         
         with col1:
-            total_resumes = Resume.objects.count()
+            total_resumes = database_stats()["total_resumes"]
             st.metric("Total Resumes Processed", total_resumes)
         
         with col2:
@@ -0,0 +1,234 @@
+"""
+Deterministic synthetic resumes and job descriptions, for benchmarks.
+
+Every document comes from its own ``random.Random`` seeded with
+``"<seed>:<kind>:<index>"``, so the same arguments always produce the same
+text, and growing ``count`` only appends documents. Resumes have the layout
+the extractors expect (contact line, headed sections, date ranges); some
+leave out the summary heading, so the spaCy fallback is exercised as well.
+
+Text renders to ``txt``, ``pdf`` and ``docx``. PDFs are written directly (one
+Helvetica text object per page), so no PDF library is needed. DOCX text is
+deterministic, but the bytes are not: zip entries carry the time of writing.
+
+This module does not import Django.
+"""
+import io
+import random
+import textwrap
+
+
+# Named sizes: (roles, bullets per role, projects); an integer N means N roles
+SIZES = {
+    "small": (2, 3, 2),
+    "medium": (5, 5, 4),
+    "large": (12, 8, 8),
+}
+FILE_TYPES = ("txt", "pdf", "docx")
+
+FIRST_NAMES = ["Aarav", "Priya", "Rohan", "Ananya", "Vikram", "Sara", "Daniel", "Mei", "Lucas", "Fatima",
+               "Kabir", "Olivia", "Arjun", "Zara", "Noah", "Isha"]
+LAST_NAMES = ["Sharma", "Patel", "Iyer", "Khan", "Fernandes", "Chen", "Garcia", "Okafor", "Nair", "Smith",
+              "Verma", "Kowalski", "Mehta", "Brown"]
+COMPANIES = ["Infosys", "Tata Consultancy Services", "Wipro", "Zoho", "Freshworks", "Flipkart", "Swiggy",
+             "Razorpay", "Accenture", "Capgemini", "Atlassian", "Thoughtworks", "Cognizant", "Paytm"]
+TITLES = ["Backend Developer", "Software Engineer", "Python Developer", "Full Stack Developer",
+          "Data Engineer", "DevOps Engineer", "Machine Learning Engineer", "Frontend Developer"]
+# Half of these are in the skills dictionary, the rest only add noise for the matcher
+SKILLS = ["Python", "Django", "Flask", "Java", "C++", "JavaScript", "HTML", "CSS", "React", "Node.js",
+          "MongoDB", "MySQL", "SQL", "AWS", "Docker", "Kubernetes", "FastAPI", "Redis", "Kafka", "Celery",
+          "PostgreSQL", "Terraform", "GraphQL", "TypeScript", "Pandas", "NumPy", "Spark", "Airflow",
+          "Jenkins", "Linux", "Git", "Machine Learning"]
+VERBS = ["Designed", "Built", "Led", "Migrated", "Optimized", "Automated", "Maintained", "Implemented",
+         "Scaled", "Refactored", "Introduced", "Delivered"]
+OBJECTS = ["REST APIs", "a payments service", "the reporting pipeline", "CI/CD workflows",
+           "a recommendation engine", "internal dashboards", "the search backend", "microservices",
+           "data ingestion jobs", "the authentication layer", "a caching tier", "monitoring and alerting"]
+OUTCOMES = ["cutting latency by {n}%", "serving {n}k requests per day", "reducing cloud spend by {n}%",
+            "for {n} enterprise clients", "improving test coverage to {n}%", "with {n} engineers"]
+DEGREES = ["B.Tech in Computer Science", "B.E. in Information Technology", "M.Tech in Software Engineering",
+           "B.Sc in Mathematics", "MCA", "M.Sc in Data Science"]
+COLLEGES = ["Anna University", "VIT Vellore", "IIT Madras", "Delhi University", "Pune University",
+            "NIT Trichy", "BITS Pilani", "Manipal Institute of Technology"]
+AWARDS = ["AWS Certified Solutions Architect", "Winner, Smart India Hackathon", "Employee of the Quarter",
+          "Certified Kubernetes Administrator", "Google Cloud Professional Data Engineer",
+          "Best Paper Award, student research symposium"]
+MONTHS = ["Jan", "Feb", "Mar", "Apr", "May", "Jun", "Jul", "Aug", "Sep", "Oct", "Nov", "Dec"]
+
+LINE_WIDTH = 95
+
+
+def parse_size(size):
+    """(roles, bullets per role, projects) for a size name or a number of roles."""
+    if isinstance(size, str) and size in SIZES:
+        return SIZES[size]
+    try:
+        roles = int(size)
+    except (TypeError, ValueError):
+        raise ValueError(f"Unknown size {size!r}, expected one of {list(SIZES)} or a number of roles") from None
+    if roles < 1:
+        raise ValueError("A resume needs at least one role")
+    return roles, 5, max(1, roles // 2)
+
+
+def _rng(seed, kind, index):
+    return random.Random(f"{seed}:{kind}:{index}")
+
+
+def _sentence(rng):
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(5, 95))
+    return f"{rng.choice(VERBS)} {rng.choice(OBJECTS)} using {rng.choice(SKILLS)}, {outcome}."
+
+
+# ------------------- Documents -------------------
+def resume_text(seed=0, index=0, size="medium"):
+    rng = _rng(seed, "resume", index)
+    roles, bullets, projects = parse_size(size)
+    name = f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}"
+    handle = name.lower().replace(" ", "")
+    skills = rng.sample(SKILLS, rng.randint(6, 14))
+
+    lines = [
+        name,
+        f"{handle}{index}@example.com | +91 9{rng.randint(100000000, 999999999)} | https://github.com/{handle}{index}",
+        "",
+    ]
+    summary = f"{rng.choice(TITLES)} with experience in {', '.join(skills[:4])}. " + " ".join(
+        _sentence(rng) for _ in range(3))
+    # Without a heading the summary comes from the spaCy sentence fallback
+    if rng.random() < 0.7:
+        lines += ["SUMMARY", summary, ""]
+    else:
+        lines += [summary, ""]
+
+    lines += ["SKILLS", ", ".join(skills), "", "WORK EXPERIENCE"]
+    year, month = 2025, rng.randrange(12)
+    for role in range(roles):
+        length = rng.randint(6, 30)
+        end = "Present" if role == 0 and rng.random() < 0.5 else f"{MONTHS[month]} {year}"
+        start_index = year * 12 + month - length
+        start = f"{MONTHS[start_index % 12]} {start_index // 12}"
+        lines.append(f"{rng.choice(TITLES)} | {rng.choice(COMPANIES)} | {start} - {end}")
+        lines += [f"- {_sentence(rng)}" for _ in range(bullets)]
+        lines.append("")
+        # The next role ended around when this one started; some overlap
+        gap = rng.randint(-3, 4)
+        year, month = divmod(start_index - gap, 12)
+
+    lines.append("PROJECTS")
+    for number in range(projects):
+        lines.append(f"Project {number + 1}: {rng.choice(OBJECTS).capitalize()} ({', '.join(rng.sample(SKILLS, 3))})")
+        lines.append(_sentence(rng))
+    lines += ["", "EDUCATION"]
+    graduated = year - rng.randint(0, 2)
+    lines.append(f"{rng.choice(DEGREES)}, {rng.choice(COLLEGES)}, {graduated - 4} - {graduated}")
+    lines += ["", "ACHIEVEMENTS"]
+    lines += [f"- {award}" for award in rng.sample(AWARDS, rng.randint(1, 4))]
+    return "\n".join(lines) + "\n"
+
+
+def job_description(seed=0, index=0, size="medium"):
+    rng = _rng(seed, "job", index)
+    roles = parse_size(size)[0]
+    skills = rng.sample(SKILLS, rng.randint(5, 10))
+    title = rng.choice(TITLES)
+    paragraphs = [
+        f"{rng.choice(COMPANIES)} is hiring a {title}.",
+        f"Required skills: {', '.join(skills)}.",
+        "Responsibilities: " + " ".join(_sentence(rng) for _ in range(max(3, roles))),
+        f"Experience: {rng.randint(1, 8)}+ years building production systems.",
+    ]
+    return "\n".join(paragraphs) + "\n"
+
+
+# ------------------- Rendering -------------------
+def _wrapped_lines(text):
+    for line in text.split("\n"):
+        wrapped = textwrap.wrap(line, LINE_WIDTH)
+        yield from wrapped or [""]
+
+
+def _pdf_escape(line):
+    return line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+
+
+def to_pdf(text, lines_per_page=60):
+    """A minimal PDF with ``text`` on A4 pages, ``lines_per_page`` lines each."""
+    lines = list(_wrapped_lines(text))
+    pages = [lines[i:i + lines_per_page] for i in range(0, len(lines), lines_per_page)] or [[]]
+
+    # 1: catalog, 2: page tree, 3: font, then a page and its content stream per page
+    objects = [None, None, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>"]
+    kids = []
+    for page_lines in pages:
+        body = "BT /F1 10 Tf 12 TL 50 790 Td\n" + "".join(
+            f"({_pdf_escape(line)}) Tj T*\n" for line in page_lines) + "ET"
+        stream = body.encode("latin-1", "replace")
+        page_number = len(objects) + 1
+        kids.append(f"{page_number} 0 R")
+        objects.append(
+            f"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 595 842] "
+            f"/Resources << /Font << /F1 3 0 R >> >> /Contents {page_number + 1} 0 R >>".encode("ascii"))
+        objects.append(b"<< /Length %d >>\nstream\n" % len(stream) + stream + b"\nendstream")
+    objects[0] = b"<< /Type /Catalog /Pages 2 0 R >>"
+    objects[1] = f"<< /Type /Pages /Kids [{' '.join(kids)}] /Count {len(kids)} >>".encode("ascii")
+
+    out = io.BytesIO()
+    out.write(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(out.tell())
+        out.write(b"%d 0 obj\n" % number + body + b"\nendobj\n")
+    xref = out.tell()
+    out.write(b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1))
+    out.writelines(b"%010d 00000 n \n" % offset for offset in offsets)
+    out.write(b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (len(objects) + 1, xref))
+    return out.getvalue()
+
+
+def to_docx(text):
+    from docx import Document
+
+    document = Document()
+    for line in text.split("\n"):
+        if line.strip():
+            document.add_paragraph(line)
+    out = io.BytesIO()
+    document.save(out)
+    return out.getvalue()
+
+
+def render(text, file_type):
+    if file_type == "txt":
+        return text.encode("utf-8")
+    if file_type == "pdf":
+        return to_pdf(text)
+    if file_type == "docx":
+        return to_docx(text)
+    raise ValueError(f"Unknown file type {file_type!r}, expected one of {FILE_TYPES}")
+
+
+# ------------------- Corpus -------------------
+class SyntheticResume:
+    __slots__ = ("name", "file_type", "text", "content")
+
+    def __init__(self, name, file_type, text, content):
+        self.name = name
+        self.file_type = file_type
+        self.text = text
+        self.content = content
+
+
+def generate_resumes(count, size="medium", seed=0, file_types=("pdf", "docx"), start=0):
+    """``count`` resumes, cycling through ``file_types``; ``start`` offsets the indexes for a disjoint set."""
+    resumes = []
+    for index in range(start, start + count):
+        file_type = file_types[index % len(file_types)]
+        text = resume_text(seed, index, size)
+        resumes.append(SyntheticResume(f"resume_{seed}_{index:05d}.{file_type}", file_type, text,
+                                       render(text, file_type)))
+    return resumes
+
+
+def generate_job_descriptions(count, size="medium", seed=0):
+    return [job_description(seed, index, size) for index in range(count)]
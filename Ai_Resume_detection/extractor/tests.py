@@ -1,3 +1,580 @@
-from django.test import TestCase
+import io
+import json
+import tempfile
+import threading
+from datetime import date, timedelta
+from unittest import mock
 
-# Create your tests here.
+from django.core.files.base import ContentFile
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import QuerySet
+from django.test import TestCase, TransactionTestCase
+from django.urls import reverse
+from django.utils import timezone
+
+from .apps import ensure_search_triggers
+from .blobs import blob_data, cached_text, get_or_create_blob, stored_resume_text
+from .ats import ats_score_matrix
+from .experience import PRESENT, experience_timeline, merge_intervals, month_index, parse_date_token
+from .jobs import RETRY_DELAY, claim, enqueue, process, run_worker
+from .models import Resume, ResumeBlob, ResumeJob, ResumeSkill, Skill
+from .sections import index_sections
+from .search import FTS_TABLE, parse_query, search_ids, search_resumes
+from .skill_index import find_candidates, postings_query, sync_resume_skills
+from .synthetic import to_pdf
+from .utils import EXTRACTOR_VERSION, TEXT_VERSION, ats_checker, extract_text
+
+
+class ReadinessTests(TestCase):
+    def test_shared_service_counts_as_ready(self):
+        with mock.patch("extractor.nlp_service.service_available", return_value=True), \
+                mock.patch("extractor.model_registry.status", return_value={"extractor": False}):
+            response = self.client.get(reverse("readiness"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()["serving"], "nlp_service")
+
+    def test_local_models_must_be_loaded(self):
+        with mock.patch("extractor.nlp_service.service_available", return_value=False):
+            with mock.patch("extractor.model_registry.status", return_value={"extractor": False}):
+                response = self.client.get(reverse("readiness"))
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(response.json()["serving"], "local")
+            with mock.patch("extractor.model_registry.status", return_value={"extractor": True}):
+                response = self.client.get(reverse("readiness"))
+            self.assertEqual(response.status_code, 200)
+
+
+class ResumeJobQueueTests(TestCase):
+    def setUp(self):
+        self.blob = ResumeBlob.objects.create(
+            sha256="a" * 64, file="resumes/a.pdf", file_type="pdf", text="Python developer",
+            data={"summary": "Python developer", "skills": ["Python"], "experience": "2 years"},
+            text_version=TEXT_VERSION, extractor_version=EXTRACTOR_VERSION,
+        )
+        # Text that cannot be parsed: every attempt fails
+        self.broken = ResumeBlob.objects.create(
+            sha256="b" * 64, file="resumes/b.pdf", file_type="pdf", text="",
+            data={"error": "No text could be extracted"},
+            text_version=TEXT_VERSION, extractor_version=EXTRACTOR_VERSION,
+        )
+
+    def expire_lease(self, job):
+        ResumeJob.objects.filter(pk=job.pk).update(run_after=timezone.now() - timedelta(seconds=1))
+
+    def test_double_claim(self):
+        job = enqueue(self.blob, "Ann", "ann@example.com")
+        update = QuerySet.update
+        raced = []
+
+        def racing_update(queryset, **kwargs):
+            # Worker A claims the job between worker B's read and its compare-and-set
+            if not raced:
+                raced.append(True)
+                self.assertEqual(claim("worker-a").pk, job.pk)
+            return update(queryset, **kwargs)
+
+        with mock.patch.object(QuerySet, "update", racing_update):
+            self.assertIsNone(claim("worker-b"))
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.locked_by, job.attempts), ("running", "worker-a", 1))
+        # A job under a valid lease is invisible
+        self.assertIsNone(claim("worker-b"))
+
+    def test_expired_lease_is_reclaimed_and_stale_finish_rejected(self):
+        enqueue(self.blob, "Ann", "ann@example.com")
+        stale = claim("worker-a")
+        self.expire_lease(stale)
+        reclaimed = claim("worker-b")
+        self.assertEqual(reclaimed.pk, stale.pk)
+        self.assertEqual((reclaimed.locked_by, reclaimed.attempts), ("worker-b", 2))
+
+        # Worker A comes back after losing its lease: nothing it did is kept
+        process(stale, "worker-a")
+        reclaimed.refresh_from_db()
+        self.assertEqual((reclaimed.status, reclaimed.locked_by), ("running", "worker-b"))
+        self.assertFalse(Resume.objects.exists())
+
+        process(reclaimed, "worker-b")
+        reclaimed.refresh_from_db()
+        self.assertEqual(reclaimed.status, "done")
+        self.assertEqual(reclaimed.resume.name, "Ann")
+        self.assertEqual(Resume.objects.count(), 1)
+
+    def test_backoff_then_failed_after_max_attempts(self):
+        job = enqueue(self.broken, "Bob", "bob@example.com", max_attempts=2)
+        with self.assertLogs("extractor.jobs", "ERROR"):
+            process(claim("worker-a"), "worker-a")
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts, job.locked_by), ("pending", 1, ""))
+        self.assertGreater(job.run_after, timezone.now() + timedelta(seconds=RETRY_DELAY - 5))
+        # Not due yet
+        self.assertIsNone(claim("worker-a"))
+
+        self.expire_lease(job)
+        with self.assertLogs("extractor.jobs", "ERROR"):
+            process(claim("worker-a"), "worker-a")
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("failed", 2))
+        self.assertIn("No text could be extracted", job.error)
+        self.assertIsNone(claim("worker-a"))
+
+    def test_lost_worker_without_attempts_left_fails(self):
+        job = enqueue(self.blob, "Ann", "ann@example.com", max_attempts=1)
+        claim("worker-a")
+        self.expire_lease(job)
+        self.assertIsNone(claim("worker-b"))
+        job.refresh_from_db()
+        self.assertEqual(job.status, "failed")
+        self.assertEqual(job.error, "Worker lost; no attempts left")
+
+    def test_run_worker_drains_the_queue(self):
+        enqueue(self.blob, "Ann", "ann@example.com")
+        enqueue(self.blob, "Cy", "cy@example.com")
+        stop = threading.Event()
+        with mock.patch("extractor.jobs.worker_name", return_value="worker-a"), \
+                mock.patch.object(stop, "wait", side_effect=lambda timeout: stop.set()):
+            # The first empty poll stops the worker
+            run_worker(stop, poll_interval=0)
+        self.assertEqual(set(ResumeJob.objects.values_list("status", flat=True)), {"done"})
+        self.assertEqual(sorted(Resume.objects.values_list("name", flat=True)), ["Ann", "Cy"])
+
+
+def make_resume(name, skills="", **fields):
+    return Resume.objects.create(name=name, email=f"{name.lower()}@example.com", file="resumes/x.pdf",
+                                 skills=skills, **fields)
+
+
+class SkillIndexTests(TestCase):
+    def setUp(self):
+        self.ann = make_resume("Ann", "Python, Django, AWS")
+        self.bob = make_resume("Bob", "python, Flask")
+        self.cy = make_resume("Cy", "Python,  django , Docker")
+        sync_resume_skills([self.ann, self.bob, self.cy])
+
+    def counts(self):
+        return dict(Skill.objects.values_list("name", "resume_count"))
+
+    def test_every_skill_must_match(self):
+        self.assertEqual(find_candidates(["python"]), [self.cy.pk, self.bob.pk, self.ann.pk])
+        self.assertEqual(find_candidates(["Python", "DJANGO"]), [self.cy.pk, self.ann.pk])
+        self.assertEqual(find_candidates(["python", "django", "aws"]), [self.ann.pk])
+        self.assertEqual(find_candidates(["flask", "django"]), [])
+        self.assertEqual(find_candidates(["python"], limit=2), [self.cy.pk, self.bob.pk])
+
+    def test_unknown_skill_short_circuits(self):
+        self.assertIsNone(postings_query(["python", "cobol"]))
+        self.assertIsNone(postings_query(["", " "]))
+        with self.assertNumQueries(1):
+            self.assertEqual(find_candidates(["python", "cobol"]), [])
+
+    def test_resync_after_reupload(self):
+        self.assertEqual(self.counts(), {"python": 3, "django": 2, "aws": 1, "flask": 1, "docker": 1})
+        self.ann.skills = "Python, Kubernetes"
+        self.ann.save()
+        sync_resume_skills([self.ann])
+
+        self.assertEqual(self.counts(), {"python": 3, "django": 1, "aws": 0, "flask": 1, "docker": 1, "kubernetes": 1})
+        self.assertEqual(find_candidates(["aws"]), [])
+        self.assertEqual(find_candidates(["django"]), [self.cy.pk])
+        self.assertEqual(find_candidates(["kubernetes"]), [self.ann.pk])
+        self.assertEqual(set(ResumeSkill.objects.filter(resume=self.ann).values_list("skill__name", flat=True)),
+                         {"python", "kubernetes"})
+
+    def test_candidates_api(self):
+        url = reverse("search_candidates")
+        response = self.client.get(url, {"skills": "python,django"})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([result["name"] for result in response.json()["results"]], ["Cy", "Ann"])
+        response = self.client.get(url + "?skill=python&skill=flask")
+        self.assertEqual([result["name"] for result in response.json()["results"]], ["Bob"])
+
+        # The limit is clamped to 1..500
+        self.assertEqual(self.client.get(url, {"skills": "python", "limit": -1}).json()["count"], 1)
+        self.assertEqual(self.client.get(url, {"skills": "python", "limit": 0}).json()["count"], 1)
+        self.assertEqual(self.client.get(url, {"skills": "python", "limit": 10_000}).json()["count"], 3)
+        self.assertEqual(self.client.get(url, {"skills": "python", "limit": "ten"}).status_code, 400)
+
+
+def fts_rowids(query):
+    with connection.cursor() as cursor:
+        cursor.execute(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s ORDER BY rowid", [query])
+        return [row[0] for row in cursor.fetchall()]
+
+
+def search_triggers():
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s", [FTS_TABLE + "%"])
+        return {row[0] for row in cursor.fetchall()}
+
+
+class SearchIndexTests(TestCase):
+    def test_triggers_keep_the_index_in_sync(self):
+        ann = make_resume("Ann", "Python, Django", summary="Backend developer")
+        self.assertEqual(fts_rowids("django"), [ann.pk])
+
+        ann.skills = "Python, Flask"
+        ann.save()
+        self.assertEqual(fts_rowids("django"), [])
+        self.assertEqual(fts_rowids("flask"), [ann.pk])
+        Resume.objects.filter(pk=ann.pk).update(summary="Data engineer")
+        self.assertEqual(fts_rowids("backend"), [])
+        self.assertEqual(fts_rowids("engineer"), [ann.pk])
+
+        others = Resume.objects.bulk_create([
+            Resume(name=name, email="", file="resumes/x.pdf", skills="Kafka") for name in ("Bob", "Cy")
+        ])
+        self.assertEqual(len(fts_rowids("kafka")), len(others))
+
+        ann.delete()
+        self.assertEqual(fts_rowids("flask"), [])
+        Resume.objects.all().delete()
+        self.assertEqual(fts_rowids("kafka"), [])
+
+    def test_parse_query(self):
+        self.assertEqual(parse_query('django "rest api" devel*'),
+                         [(["django"], False), (["rest", "api"], False), (["devel"], True)])
+        self.assertEqual(parse_query('-python NEAR(a b) "unclosed'),
+                         [(["python"], False), (["NEAR", "a"], False), (["b"], False), (["unclosed"], False)])
+        self.assertEqual(parse_query('* - "" ^'), [])
+
+    def test_fts_syntax_is_neutralised(self):
+        # Operator words are searched for as plain words
+        ann = make_resume("Ann", "Python", summary="near python team and col python or")
+        make_resume("Bob", "Java", summary="team")
+        for query in ['"python', "python*", "NEAR(python team)", "-python", "python OR", "AND python", "col:python"]:
+            with self.subTest(query=query):
+                self.assertEqual(search_ids(query), [ann.pk])
+        self.assertEqual(search_resumes('" * -'), [])
+
+    def test_bm25_ranking_and_snippet(self):
+        once = make_resume("Once", "Java", summary="Some Kafka")
+        often = make_resume("Often", "Kafka", summary="Kafka streams and Kafka connect")
+        make_resume("Never", "Go")
+        results = search_resumes("kafka")
+        self.assertEqual([result["id"] for result in results], [often.pk, once.pk])
+        self.assertLess(results[0]["rank"], results[1]["rank"])
+        self.assertIn("<mark>Kafka</mark>", results[0]["snippet"])
+        self.assertEqual([result["id"] for result in search_resumes("kafka", limit=1, offset=1)], [once.pk])
+
+    def test_snippet_is_escaped(self):
+        make_resume("Ann", "Python", summary="<script>alert(1)</script> python")
+        snippet = search_resumes("python")[0]["snippet"]
+        self.assertNotIn("<script>", snippet)
+        self.assertIn("&lt;script&gt;", snippet)
+
+    def test_search_api_validates_limit_and_offset(self):
+        for name in ("Ann", "Bob", "Cy"):
+            make_resume(name, "Python")
+        url = reverse("search_resumes")
+        self.assertEqual(self.client.get(url).status_code, 400)
+        self.assertEqual(self.client.get(url, {"q": "python"}).json()["count"], 3)
+        self.assertEqual(self.client.get(url, {"q": "python", "limit": -1}).json()["count"], 1)
+        self.assertEqual(self.client.get(url, {"q": "python", "limit": 2, "offset": 2}).json()["count"], 1)
+        self.assertEqual(self.client.get(url, {"q": "python", "offset": -1}).status_code, 400)
+        self.assertEqual(self.client.get(url, {"q": "python", "limit": "all"}).status_code, 400)
+
+
+class SearchTriggerRebuildTests(TransactionTestCase):
+    def test_triggers_restored_after_table_rebuild(self):
+        old_field = Resume._meta.get_field("name")
+        new_field = old_field.clone()
+        new_field.max_length = 120
+        new_field.set_attributes_from_name("name")
+        expected = search_triggers()
+        self.assertEqual(len(expected), 3)
+
+        # SQLite applies AlterField by rebuilding the table, which drops its triggers
+        with connection.schema_editor() as editor:
+            editor.alter_field(Resume, old_field, new_field)
+        try:
+            self.assertEqual(search_triggers(), set())
+            ensure_search_triggers()
+            self.assertEqual(search_triggers(), expected)
+            ann = make_resume("Ann", "Elixir")
+            self.assertEqual(fts_rowids("elixir"), [ann.pk])
+        finally:
+            with connection.schema_editor() as editor:
+                editor.alter_field(Resume, new_field, old_field)
+            ensure_search_triggers()
+
+
+class ExperienceTests(TestCase):
+    today = date(2025, 6, 15)
+
+    def test_merge_intervals(self):
+        # Overlap, containment, adjacency, and a gap
+        self.assertEqual(merge_intervals([(0, 10), (5, 15)]), [(0, 15)])
+        self.assertEqual(merge_intervals([(0, 20), (5, 10)]), [(0, 20)])
+        self.assertEqual(merge_intervals([(10, 20), (0, 10)]), [(0, 20)])
+        self.assertEqual(merge_intervals([(0, 5), (7, 9)]), [(0, 5), (7, 9)])
+        self.assertEqual(merge_intervals([]), [])
+
+    def test_parse_date_token(self):
+        march_2020 = month_index(2020, 3)
+        for token in ["Mar 2020", "march 2020", "Mar. 2020", "March, 2020", "03/2020", "3/2020", "2020-03", "2020/3"]:
+            with self.subTest(token=token):
+                self.assertEqual(parse_date_token(token), march_2020)
+        self.assertEqual(parse_date_token("2020"), month_index(2020, 1))
+        self.assertEqual(parse_date_token("Present"), PRESENT)
+        self.assertEqual(parse_date_token("till  date"), PRESENT)
+        for token in ["13/2020", "2020-00", "Foo 2020", "1234", "yesterday"]:
+            with self.subTest(token=token):
+                self.assertIsNone(parse_date_token(token))
+
+    def test_overlapping_roles_are_counted_once(self):
+        timeline = experience_timeline(
+            "Backend Developer | Acme | Jan 2020 - Jan 2022\n"
+            "Freelance | 2021-01 to 2021-07\n"
+            "Intern | 06/2019 – 12/2019\n",
+            self.today,
+        )
+        self.assertEqual([role.months for role in timeline.roles], [24, 6, 6])
+        self.assertEqual(timeline.total_months, 30)
+        self.assertEqual(timeline.overlap_months, 6)
+        self.assertEqual(timeline.as_dict()["periods"], [
+            {"start": "2019-06", "end": "2019-12", "months": 6},
+            {"start": "2020-01", "end": "2022-01", "months": 24},
+        ])
+        self.assertEqual(timeline.describe(), "2 years 6 months")
+
+    def test_adjacent_roles_and_present(self):
+        timeline = experience_timeline("Engineer, Jan 2023 - Jan 2024\nLead, Jan 2024 - Present\n", self.today)
+        self.assertEqual(timeline.periods, [(month_index(2023, 1), month_index(2025, 6))])
+        self.assertTrue(timeline.roles[1].current)
+        self.assertIsNone(timeline.roles[1].as_dict()["end"])
+        self.assertEqual(timeline.describe(), "2 years 5 months")
+
+    def test_phone_numbers_and_ids_are_not_dates(self):
+        timeline = experience_timeline("Phone: +91 1234-5678, Roll no 1010 - 1090, Employee id 2019-2", self.today)
+        self.assertEqual(timeline.roles, [])
+        self.assertEqual(timeline.describe(), "Fresher (No prior work experience found)")
+
+    def test_backfill_upgrades_version_1(self):
+        text = "Developer | Jan 2020 - Jan 2022\nConsultant | Jan 2021 - Jan 2022\n"
+        old = ResumeBlob.objects.create(sha256="c" * 64, file="resumes/c.pdf", file_type="pdf", text=text,
+                                        data={"skills": ["Python"], "total_experience": "3 years 0 months"},
+                                        extractor_version=1)
+        other = ResumeBlob.objects.create(sha256="d" * 64, file="resumes/d.pdf", file_type="pdf", text=text,
+                                          data={"total_experience": "3 years 0 months"}, extractor_version=0)
+        call_command("backfill_experience", chunk_size=1, stdout=io.StringIO())
+
+        old.refresh_from_db()
+        self.assertEqual(old.extractor_version, 2)
+        self.assertEqual(old.data["total_experience"], "2 years 0 months")
+        self.assertEqual(old.data["experience_timeline"]["overlap_months"], 12)
+        self.assertEqual(old.data["skills"], ["Python"])
+        # Other versions need the full extractor
+        other.refresh_from_db()
+        self.assertEqual((other.extractor_version, other.data), (0, {"total_experience": "3 years 0 months"}))
+
+
+class BulkATSTests(TestCase):
+    jobs = [
+        "Python developer with Django and PostgreSQL experience.",
+        "Frontend engineer: React, TypeScript, CSS.",
+        "!!! ---",
+    ]
+
+    def setUp(self):
+        self.ann = make_resume("Ann", "Python, Django", summary="Backend developer building Django apps on PostgreSQL")
+        self.bob = make_resume("Bob", "React, CSS", summary="Frontend engineer")
+
+    def post(self, **data):
+        return self.client.post(reverse("ats_checker_bulk_api"), data, content_type="application/json")
+
+    def test_matrix_matches_ats_checker(self):
+        texts = ["Python and Django developer", "React, CSS and TypeScript; some Python", ""]
+        matrix = ats_score_matrix(texts, self.jobs)
+        for text, row in zip(texts, matrix):
+            for job, result in zip(self.jobs, row):
+                with self.subTest(text=text, job=job):
+                    expected = ats_checker(text, job)
+                    if "matched_keywords" in expected:
+                        expected["matched_keywords"] = sorted(expected["matched_keywords"])
+                    self.assertEqual(result, expected)
+
+    def test_bulk_endpoint(self):
+        response = self.post(job_descriptions=self.jobs[:2], resume_ids=[self.ann.pk, str(self.bob.pk), 999])
+        self.assertEqual(response.status_code, 200)
+        body = response.json()
+        self.assertEqual([result["name"] for result in body["results"]], ["Ann", "Bob"])
+        for result in body["results"]:
+            resume = Resume.objects.get(pk=result["resume_id"])
+            self.assertEqual(result["scores"], ats_score_matrix([stored_resume_text(resume)], self.jobs[:2])[0])
+        ann_scores = body["results"][0]["scores"]
+        self.assertGreater(ann_scores[0]["match_count"], ann_scores[1]["match_count"])
+        self.assertEqual(body["errors"], [{"resume_id": 999, "error": "Resume not found."}])
+
+    def test_bulk_endpoint_rejects_bad_input(self):
+        # Unicode digits pass str.isdigit() but not int()
+        response = self.post(job_descriptions=self.jobs[:1], resume_ids=["²", "١", "x", self.ann.pk])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([error["resume_id"] for error in response.json()["errors"]], ["²", "١", "x"])
+        self.assertEqual(self.post(job_descriptions=[1], resume_ids=[self.ann.pk]).status_code, 400)
+        self.assertEqual(self.post(job_descriptions=[" "], resume_ids=[self.ann.pk]).status_code, 400)
+        self.assertEqual(self.post(job_descriptions=self.jobs[:1], resume_ids=["²"]).status_code, 400)
+
+
+def multipart(*parts, boundary="BoUnDaRy"):
+    """A multipart/form-data body with ``parts`` in order: (name, value) fields and (name, file name, bytes) files."""
+    body = b""
+    for part in parts:
+        if len(part) == 2:
+            name, value = part
+            body += (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"\r\n\r\n{value}\r\n').encode()
+        else:
+            name, file_name, content = part
+            body += (f'--{boundary}\r\nContent-Disposition: form-data; name="{name}"; filename="{file_name}"\r\n'
+                     f'Content-Type: application/octet-stream\r\n\r\n').encode() + content + b"\r\n"
+    return body + f"--{boundary}--\r\n".encode(), f"multipart/form-data; boundary={boundary}"
+
+
+class StreamingATSTests(TestCase):
+    job = "Python developer with Django and PostgreSQL experience."
+
+    def setUp(self):
+        self.ann = make_resume("Ann", "Python, Django", summary="Backend developer building Django apps")
+        self.pdf = to_pdf("Jane Doe\nPython developer\nDjango, PostgreSQL and Docker\n")
+
+    def stream(self, *parts):
+        body, content_type = multipart(*parts)
+        response = self.client.generic("POST", reverse("ats_checker_stream_api"), body, content_type=content_type)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        return [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+
+    def test_files_and_interleaved_ids(self):
+        lines = self.stream(
+            ("job_description", self.job),
+            ("resume_ids", f"{self.ann.pk}, 999"),
+            ("resume_files", "jane.pdf", self.pdf),
+            ("resume_ids", "²"),
+            ("resume_files", "notes.txt", b"plain text"),
+            ("resume_ids", str(self.ann.pk)),
+        )
+        self.assertEqual([line.get("resume_id", line.get("file")) for line in lines[:-1]],
+                         [self.ann.pk, 999, "jane.pdf", "²", "notes.txt", self.ann.pk])
+        self.assertEqual(lines[0]["ats_result"], ats_checker(stored_resume_text(self.ann), self.job))
+        expected = ats_checker(extract_text(io.BytesIO(self.pdf), "pdf"), self.job)
+        self.assertEqual(sorted(lines[2]["ats_result"]["matched_keywords"]), sorted(expected["matched_keywords"]))
+        self.assertEqual(lines[2]["ats_result"]["match_percentage"], expected["match_percentage"])
+        self.assertEqual(lines[3], {"resume_id": "²", "error": "Resume not found."})
+        self.assertEqual(lines[4]["error"], "Unsupported file type.")
+        self.assertEqual(lines[-1], {"done": True, "scored": 3, "errors": 3})
+
+    def test_job_description_must_come_first(self):
+        lines = self.stream(("resume_files", "jane.pdf", self.pdf), ("job_description", self.job))
+        self.assertEqual(lines, [
+            {"error": "Send job_description before the resume files."},
+            {"done": True, "scored": 0, "errors": 1},
+        ])
+
+    def test_oversize_file_is_skipped(self):
+        with self.settings(ATS_STREAM_MAX_FILE_SIZE=len(self.pdf) - 1):
+            lines = self.stream(
+                ("job_description", self.job),
+                ("resume_files", "big.pdf", self.pdf),
+                ("resume_ids", str(self.ann.pk)),
+            )
+        self.assertEqual(lines[0], {"file": "big.pdf", "error": f"File is larger than {len(self.pdf) - 1} bytes."})
+        self.assertEqual(lines[1]["resume_id"], self.ann.pk)
+        self.assertEqual(lines[-1], {"done": True, "scored": 1, "errors": 1})
+
+    def test_a_failing_resume_does_not_end_the_stream(self):
+        with mock.patch("extractor.ats_stream.cached_text", side_effect=RuntimeError("boom")), \
+                self.assertLogs("extractor.ats_stream", "ERROR"):
+            lines = self.stream(
+                ("job_description", self.job),
+                ("resume_files", "jane.pdf", self.pdf),
+                ("resume_ids", str(self.ann.pk)),
+            )
+        self.assertEqual(lines[0], {"file": "jane.pdf", "error": "Failed to score the resume."})
+        self.assertEqual(lines[-1], {"done": True, "scored": 1, "errors": 1})
+
+    def test_json_body(self):
+        url = reverse("ats_checker_stream_api")
+        response = self.client.post(url, {"job_description": self.job, "resume_ids": [self.ann.pk, "²"]},
+                                    content_type="application/json")
+        lines = [json.loads(line) for line in b"".join(response.streaming_content).decode().splitlines()]
+        self.assertEqual(lines[1], {"resume_id": "²", "error": "Resume not found."})
+        self.assertEqual(lines[-1], {"done": True, "scored": 1, "errors": 1})
+
+        for body in (b"[1, 2]", b'"text"', b"null", b"{"):
+            with self.subTest(body=body):
+                self.assertEqual(self.client.post(url, body, content_type="application/json").status_code, 400)
+        self.assertEqual(self.client.post(url, {"job_description": self.job, "resume_ids": []},
+                                          content_type="application/json").status_code, 400)
+
+
+class BlobTextVersionTests(TestCase):
+    def setUp(self):
+        media = tempfile.TemporaryDirectory()
+        self.addCleanup(media.cleanup)
+        override = self.settings(MEDIA_ROOT=media.name)
+        override.enable()
+        self.addCleanup(override.disable)
+
+        self.pdf = to_pdf("Jane Doe\nPython developer\n")
+        self.blob = get_or_create_blob(ContentFile(self.pdf, name="jane.pdf"), "pdf")
+        # As if extracted by an older PDF engine
+        ResumeBlob.objects.filter(pk=self.blob.pk).update(text="old text", text_version=0,
+                                                          data={"summary": "old"}, extractor_version=EXTRACTOR_VERSION)
+        self.blob.refresh_from_db()
+
+    def test_cached_text_ignores_stale_text(self):
+        self.assertIn("Python developer", cached_text(ContentFile(self.pdf, name="jane.pdf"), "pdf"))
+
+    def test_stored_resume_text_re_extracts(self):
+        resume = make_resume("Jane", blob=self.blob)
+        self.assertIn("Python developer", stored_resume_text(resume))
+        self.blob.refresh_from_db()
+        self.assertEqual(self.blob.text_version, TEXT_VERSION)
+        # Now current, so it is served from the row
+        self.assertIn("Python developer", cached_text(ContentFile(self.pdf, name="jane.pdf"), "pdf"))
+
+    def test_stored_resume_text_keeps_old_text_without_the_file(self):
+        self.blob.file.delete(save=False)
+        resume = make_resume("Jane", blob=ResumeBlob.objects.get(pk=self.blob.pk))
+        self.assertEqual(stored_resume_text(resume), "old text")
+
+    def test_blob_data_recomputed_from_new_text(self):
+        with mock.patch("extractor.blobs.extract_fields", return_value={"summary": "new"}) as extract_fields:
+            self.assertEqual(blob_data(self.blob), {"summary": "new"})
+        self.assertIn("Python developer", extract_fields.call_args[0][0])
+        self.blob.refresh_from_db()
+        self.assertEqual((self.blob.text_version, self.blob.data), (TEXT_VERSION, {"summary": "new"}))
+
+
+class SectionIndexTests(TestCase):
+    resume = (
+        "Jane Doe\n"
+        "Career objective: Backend developer who likes databases\n"
+        "WORK EXPERIENCE\n"
+        "Backend Developer, Acme, 2021 - Present\n"
+        "Led several key projects\n"
+        "Relevant work experience\n"
+        "Mentored two interns in education\n"
+        "Notable Projects\n"
+        "Search engine for resumes\n"
+        "Education & Certifications\n"
+        "B.Tech, Anna University\n"
+        "Technical Skills\n"
+        "Python, Django\n"
+    )
+
+    def test_headings(self):
+        sections = index_sections(self.resume)
+        self.assertEqual(sections.get("summary"), "Backend developer who likes databases")
+        self.assertEqual(sections.get("projects"), "Search engine for resumes")
+        # "Technical Skills" ends the section without being extracted
+        self.assertEqual(sections.get("achievements"), "B.Tech, Anna University")
+
+    def test_sentences_ending_in_a_keyword_are_not_headings(self):
+        experience = index_sections(self.resume).get("experience")
+        self.assertEqual(experience.splitlines(), [
+            "Backend Developer, Acme, 2021 - Present",
+            "Led several key projects",
+            "Relevant work experience",
+            "Mentored two interns in education",
+        ])
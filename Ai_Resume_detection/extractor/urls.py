@@ -4,4 +4,12 @@ from . import views
 urlpatterns = [
     path("", views.upload_resume, name="upload_resume"),
     path("ats-checker/", views.ats_checker_view, name="ats_checker"),
+    path("ready/", views.readiness, name="readiness"),
+    path("api/ats-checker/", views.ats_checker_api, name="ats_checker_api"),
+    path("api/ats-checker/bulk/", views.ats_checker_bulk_api, name="ats_checker_bulk_api"),
+    path("api/ats-checker/stream/", views.ats_checker_stream_api, name="ats_checker_stream_api"),
+    path("api/resumes/search/", views.search_resumes_api, name="search_resumes"),
+    path("api/resumes/", views.upload_resume_async, name="upload_resume_async"),
+    path("api/jobs/<int:job_id>/", views.resume_job_status, name="resume_job_status"),
+    path("api/candidates/", views.search_candidates, name="search_candidates"),
 ]
@@ -1,16 +1,16 @@
 import os
 import re
-import json
-import spacy
 import docx
 from pathlib import Path
 from docx import Document
-from PyPDF2 import PdfReader
-from datetime import datetime
 from django.conf import settings
 
-# Load SpaCy model
-nlp = spacy.load("en_core_web_sm")
+from . import nlp_service
+from .analysis import ResumeAnalysis
+from .experience import experience_timeline
+from .jd_cache import KEYWORD_RE, job_keywords
+from .pdf_text import MAX_CHARS, MAX_PAGES, extract_pdf_text
+from .skill_matcher import get_skill_matcher
 
 
 # ------------------- Extract Text -------------------
@@ -23,157 +23,77 @@ def extract_text_from_docx(file):
 
 
 def extract_text_from_pdf(file):
-    text = ""
+    """Text of a PDF (path or file object), within the PDF_* limits from settings."""
     try:
-        pdf = PdfReader(file)
-        for page in pdf.pages:
-            content = page.extract_text()
-            if content:
-                text += content + "\n"
+        return extract_pdf_text(
+            file,
+            backend=getattr(settings, "PDF_BACKEND", "auto"),
+            max_pages=getattr(settings, "PDF_MAX_PAGES", MAX_PAGES),
+            max_chars=getattr(settings, "PDF_MAX_CHARS", MAX_CHARS),
+        )
     except Exception:
         return ""
-    return text
-
-
-# ------------------- Date Parsing Helper -------------------
-def parse_date(date_str):
-    """Convert resume date string to datetime object"""
-    date_str = date_str.strip().lower().replace("present", datetime.now().strftime("%b %Y"))
-
-    # Common formats: Jan 2020, March 2019, 2021
-    formats = ["%b %Y", "%B %Y", "%Y"]
-
-    for fmt in formats:
-        try:
-            return datetime.strptime(date_str, fmt)
-        except ValueError:
-            continue
-    return None
 
 
+# ------------------- Experience -------------------
 def calculate_experience(text):
     """
-    Find date ranges in resume and calculate total years of experience.
-    Example: Jan 2020 - Mar 2022
+    Total years of experience from the date ranges in the resume
+    (e.g. Jan 2020 - Mar 2022); overlapping roles are counted once.
     """
-    date_pattern = r"([A-Za-z]{3,9}\s\d{4}|\d{4})\s*[-–]\s*(Present|[A-Za-z]{3,9}\s\d{4}|\d{4})"
-    matches = re.findall(date_pattern, text, flags=re.IGNORECASE)
-
-    total_months = 0
-    for start, end in matches:
-        start_date = parse_date(start)
-        end_date = parse_date(end)
-        if start_date and end_date:
-            months = (end_date.year - start_date.year) * 12 + (end_date.month - start_date.month)
-            if months > 0:
-                total_months += months
-
-    if total_months == 0:
-        return "Fresher (No prior work experience found)"
-
-    years, months = divmod(total_months, 12)
-    return f"{years} years {months} months" if years else f"{months} months"
+    return experience_timeline(text).describe()
 
 
 # ------------------- Summary Extraction -------------------
-def extract_summary(text):
-    summary_keywords = ["summary", "objective", "profile"]
-    for keyword in summary_keywords:
-        pattern = re.compile(
-            rf"{keyword}[:\-]?\s*(.+?)(?=\n[A-Z])",
-            re.IGNORECASE | re.DOTALL,
-        )
-        match = pattern.search(text)
-        if match:
-            return match.group(1).strip()
-
-    doc = nlp(text)
-    sentences = list(doc.sents)
+def extract_summary(text, analysis=None):
+    if analysis is None:
+        analysis = ResumeAnalysis(text)
+    summary = analysis.sections.get("summary")
+    if summary:
+        return summary
+
+    sentences = list(analysis.doc.sents)
     return " ".join([sent.text for sent in sentences[:3]]) if sentences else "No summary found"
 
 
 # ------------------- Experience Extraction -------------------
-def extract_experience(text):
-    exp_keywords = ["experience", "work experience", "employment history", "professional experience"]
-
-    for keyword in exp_keywords:
-        pattern = re.compile(
-            rf"{keyword}[:\-]?\s*(.+?)(?=\n[A-Z])",
-            re.IGNORECASE | re.DOTALL,
-        )
-        match = pattern.search(text)
-        if match:
-            return match.group(1).strip()
-
-    doc = nlp(text)
-    companies = [ent.text for ent in doc.ents if ent.label_ == "ORG"]
+def extract_experience(text, analysis=None):
+    if analysis is None:
+        analysis = ResumeAnalysis(text)
+    experience = analysis.sections.get("experience")
+    if experience:
+        return experience
+
+    companies = [ent.text for ent in analysis.doc.ents if ent.label_ == "ORG"]
     if companies:
         return f"Companies: {', '.join(companies[:3])}"
 
     return "Fresher"
 
 #<------------------Education information------------------>
-def extract_education(text):
-    education_keywords = ["education", "academic background", "qualifications", "educational qualifications"]
-    for keyword in education_keywords:
-        pattern = re.compile(
-            rf"{keyword}[:\-]?\s*(.+?)(?=\n[A-Z])",
-            re.IGNORECASE | re.DOTALL,
-        )
-        match = pattern.search(text)
-        if match:
-            return match.group(1).strip()
-    return None
+def extract_education(text, analysis=None):
+    if analysis is None:
+        analysis = ResumeAnalysis(text)
+    return analysis.sections.get("education")
 
 #<-------------------Projects------------------->
-def extract_projects(text):
-    project_keywords = ["projects", "project experience", "notable projects"]
-    for keyword in project_keywords:
-        pattern = re.compile(
-            rf"{keyword}[:\-]?\s*(.+?)(?=\n[A-Z])",
-            re.IGNORECASE | re.DOTALL,
-        )
-        match = pattern.search(text)
-        if match:
-            return match.group(1).strip()
-    return None
-
-    
+def extract_projects(text, analysis=None):
+    if analysis is None:
+        analysis = ResumeAnalysis(text)
+    return analysis.sections.get("projects")
 
 
 # ------------------- Skills Extraction -------------------
 def extract_skills(text):
-    skills_file = settings.BASE_DIR / "skills" / "skills.json"
-    try:
-        with open(skills_file, "r") as f:
-            skills = json.load(f).get("skills", [])
-    except FileNotFoundError:
-        return []
-
-    text = text.lower()
-    extracted = []
-    for skill in skills:
-        if re.search(rf"\b{re.escape(skill.lower())}\b", text):
-            extracted.append(skill)
+    return get_skill_matcher().match(text)
 
-    return list(set(extracted))
 
 #<----------achivement---------->
 
-def extract_achievements(texts):
-    achievement_keywords = ["achievements", "certifications", "awards", "recognitions", "honors"]
-    results = []
-
-    for keyword in achievement_keywords:
-        # Match the section until the next heading (newline + capitalized word) or end of text
-        pattern = re.compile(
-            rf"{keyword}[:\-]?\s*(.+?)(?=\n[A-Z]|\Z)",
-            re.IGNORECASE | re.DOTALL
-        )
-        match = pattern.search(texts)
-        if match:
-            results.append(match.group(1).strip())
-
+def extract_achievements(texts, analysis=None):
+    if analysis is None:
+        analysis = ResumeAnalysis(texts)
+    results = analysis.sections.all("achievements")
     return results if results else None
 
 #<----------github links---------->
@@ -186,36 +106,81 @@ def extract_github_links(text):
         
 
 # ---------- Main Extractor ----------
-def extract_resume_data(file, file_type="pdf"):
-    # 1. Extract text
+# Bump when extract_fields changes its output, so cached results get recomputed
+EXTRACTOR_VERSION = 3
+# Bump when extract_text changes its output (PDF engine, page/character caps), so cached text is re-extracted
+TEXT_VERSION = 1
+
+
+def extract_text(file, file_type="pdf"):
+    """Return the text of a PDF/DOCX file, or None for an unsupported type."""
     if file_type == "docx":
-        text = extract_text_from_docx(file)
+        return extract_text_from_docx(file)
     elif file_type == "pdf":
-        text = extract_text_from_pdf(file)
-    else:
-        return {"error": "Unsupported file format"}
+        return extract_text_from_pdf(file)
+    return None
 
-    # 2. Extract fields
-    data = {
-        "summary": extract_summary(text),
-        "experience": extract_experience(text),
+
+def extract_fields(text, analysis=None):
+    # Without a parsed analysis to reuse, the shared NLP service does the work when it is running
+    if analysis is None:
+        return nlp_service.call("extract", [text])[0]
+    return extract_fields_local(text, analysis)
+
+
+def extract_fields_local(text, analysis=None):
+    # Shared per-resume state: section headings, and a spaCy Doc parsed at most once
+    if analysis is None:
+        analysis = ResumeAnalysis(text)
+    timeline = experience_timeline(text)
+
+    return {
+        "summary": extract_summary(text, analysis),
+        "experience": extract_experience(text, analysis),
         "skills": extract_skills(text),
-        "total_experience": calculate_experience(text),
-        "achievements": extract_achievements(text),
-        "education": extract_education(text),
-        "projects": extract_projects(text),
+        "total_experience": timeline.describe(),
+        "experience_timeline": timeline.as_dict(),
+        "achievements": extract_achievements(text, analysis),
+        "education": extract_education(text, analysis),
+        "projects": extract_projects(text, analysis),
         "github_links": extract_github_links(text),
-        
     }
-    return data
+
+
+def extract_resume_data(file, file_type="pdf"):
+    # 1. Extract text
+    text = extract_text(file, file_type)
+    if text is None:
+        return {"error": "Unsupported file format"}
+
+    # 2. Extract fields
+    return extract_fields(text)
+
+
+def resume_model_fields(data):
+    """Map ``extract_resume_data`` output onto the text fields of ``Resume``."""
+    achievements = data.get("achievements")
+    if isinstance(achievements, list):
+        achievements = ", ".join(achievements)
+    return {
+        "skills": ", ".join(data.get("skills", [])),
+        "summary": data.get("summary", ""),
+        "experience": data.get("experience", "Fresher"),
+        "education": data.get("education") or "",
+        "projects": data.get("projects") or "",
+        "achievements": achievements or "",
+        "github_links": data.get("github_links", ""),
+    }
+
+
 #<-------------------ats checker------------------->
 def ats_checker(resume_text, job_description):
     resume_text = resume_text.lower()
-    job_description = job_description.lower()
 
      # Extract keywords (simple split by non-words, can be improved using NLP)
-    jd_keywords = set(re.findall(r'\b[a-zA-Z]+\b', job_description))
-    resume_keywords = set(re.findall(r'\b[a-zA-Z]+\b', resume_text))
+    # The job description's keywords are cached, it is usually checked against many resumes
+    jd_keywords = job_keywords(job_description).keywords
+    resume_keywords = set(KEYWORD_RE.findall(resume_text))
 
     if not jd_keywords:
         return {"error": "No keywords found in job description."}
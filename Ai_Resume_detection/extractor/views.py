@@ -1,7 +1,14 @@
-import re
+import json
+
+from django.conf import settings
+from django.http import JsonResponse, StreamingHttpResponse
 from django.shortcuts import render, redirect
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_POST
 from .form import ResumeForm
-from .utils import extract_resume_data, calculate_experience, extract_text_from_docx, extract_text_from_pdf
+from .blobs import get_or_create_blob, blob_data, cached_text
+from .skill_index import sync_resume_skills
+from .utils import calculate_experience, resume_model_fields
 
 def upload_resume(request):
     if request.method == "POST":
@@ -20,43 +27,27 @@ def upload_resume(request):
                 form.add_error('file', 'Unsupported file type. Please upload a PDF or DOCX file.')
                 return render(request, "extractor/upload.html", {"form": form})
 
-            # Extract resume data using utility function
-            data = extract_resume_data(resume_file, file_type=file_type)
+            # Identical files share one stored blob, and are only ever extracted once
+            blob = get_or_create_blob(resume_file, file_type)
+            data = blob_data(blob, resume_file)
 
             # Check if extraction returned error or empty text
             if "error" in data or not data.get("summary"):
                 form.add_error('file', 'Failed to extract data from the resume. Please upload a valid PDF or DOCX file.')
                 return render(request, "extractor/upload.html", {"form": form})
 
-            # Assign extracted data to resume instance
-            resume_instance.skills = ", ".join(data.get("skills", []))
-            resume_instance.summary = data.get("summary", "")
-            resume_instance.experience = data.get("experience", "Fresher")
-            resume_instance.education = data.get("education", "")
-            resume_instance.projects = data.get("projects", "")
-            achievements = data.get("achievements")
-            if isinstance(achievements, list):
-                resume_instance.achievements = ", ".join(achievements)
-            else:
-                resume_instance.achievements = achievements or ""
-
-            # Add GitHub links and career objective manually or from extracted data if available
-            github_links = data.get("github_links", "")
-            if not github_links:
-                # Try to extract GitHub links from the text if not directly extracted
-                text = ""
-                if file_type == "docx":
-                    text = extract_text_from_docx(resume_file)
-                elif file_type == "pdf":
-                    text = extract_text_from_pdf(resume_file)
-                github_links = ", ".join(re.findall(r"https?://github\.com/[^\s]+", text))
-            resume_instance.github_links = github_links
+            # Assign extracted data to resume instance, pointing at the shared file
+            for field, value in resume_model_fields(data).items():
+                setattr(resume_instance, field, value)
+            resume_instance.blob = blob
+            resume_instance.file = blob.file.name
 
             # Update career objective manually as per user request
             career_objective = "Actively seeking Python/Backend Developer roles where I can apply my skills in API development, databases, and backend systems."
             resume_instance.summary = career_objective
 
             resume_instance.save()
+            sync_resume_skills([resume_instance])
 
             return render(request, "extractor/upload.html", {
                 "form": ResumeForm(),
@@ -97,10 +88,10 @@ def ats_checker_view(request):
         file_name = resume_file.name.lower()
         if file_name.endswith('.pdf'):
             file_type = "pdf"
-            resume_text = extract_text_from_pdf(resume_file)
+            resume_text = cached_text(resume_file, file_type)
         elif file_name.endswith('.docx'):
             file_type = "docx"
-            resume_text = extract_text_from_docx(resume_file)
+            resume_text = cached_text(resume_file, file_type)
         else:
             return render(request, "extractor/ats_checker.html", {
                 "error": "Unsupported file type. Please upload a PDF or DOCX file."
@@ -138,7 +129,7 @@ def ats_checker_view(request):
 
 from rest_framework.decorators import api_view
 from rest_framework.response import Response
-from .utils import extract_text_from_pdf, extract_text_from_docx, ats_checker
+from .utils import ats_checker
 
 @api_view(["POST"])
 def ats_checker_api(request):
@@ -152,9 +143,9 @@ def ats_checker_api(request):
 
     file_name = resume_file.name.lower()
     if file_name.endswith('.pdf'):
-        resume_text = extract_text_from_pdf(resume_file)
+        resume_text = cached_text(resume_file, "pdf")
     elif file_name.endswith('.docx'):
-        resume_text = extract_text_from_docx(resume_file)
+        resume_text = cached_text(resume_file, "docx")
     else:
         return Response({"error": "Unsupported file type."}, status=400)
 
@@ -173,9 +164,202 @@ def ats_checker_api(request):
     })
 
 
+def readiness(request):
+    """
+    Report whether this process can parse resumes yet, with cache counters.
 
+    With the shared NLP service running, the process never loads models of its
+    own (see ExtractorConfig.ready), so the service answering counts as ready;
+    otherwise the local models must be loaded. ``serving`` says which it is.
+    """
+    from .jd_cache import get_jd_cache
+    from .model_registry import status
+    from .nlp_service import service_available
 
+    models = status()
+    if service_available():
+        serving, ready = "nlp_service", True
+    else:
+        serving, ready = "local", all(models.get(name) for name in settings.NLP_WARMUP_MODELS)
+    return JsonResponse(
+        {"ready": ready, "serving": serving, "models": models, "ats_jd_cache": get_jd_cache().stats()},
+        status=200 if ready else 503,
+    )
 
-    
 
-    
+def _list_param(data, name):
+    """All values of ``name`` from a multipart form (repeated field) or a JSON body (list)."""
+    if hasattr(data, "getlist"):
+        return data.getlist(name)
+    value = data.get(name, [])
+    return value if isinstance(value, list) else [value]
+
+
+@api_view(["POST"])
+def ats_checker_bulk_api(request):
+    """
+    Score several resumes against several job descriptions in one go.
+
+    Resumes come as uploaded ``resume_files`` and/or stored ``resume_ids``;
+    ``job_descriptions`` is a list. Every document is tokenized once.
+    """
+    from .ats import ats_score_matrix
+    from .blobs import stored_resume_text
+    from .models import Resume
+
+    job_descriptions = _list_param(request.data, "job_descriptions")
+    if not all(isinstance(jd, str) for jd in job_descriptions):
+        return Response({"error": "Every job description must be a string."}, status=400)
+    job_descriptions = [jd.strip() for jd in job_descriptions if jd.strip()]
+    if not job_descriptions:
+        return Response({"error": "Please provide at least one job description."}, status=400)
+
+    resumes, texts, errors = [], [], []
+    for resume_file in request.FILES.getlist("resume_files"):
+        file_name = resume_file.name.lower()
+        file_type = "pdf" if file_name.endswith('.pdf') else "docx" if file_name.endswith('.docx') else None
+        text = cached_text(resume_file, file_type) if file_type else None
+        if text:
+            resumes.append({"file": resume_file.name})
+            texts.append(text)
+        else:
+            errors.append({"file": resume_file.name, "error": "Unsupported file type or no text found."})
+
+    resume_ids = _list_param(request.data, "resume_ids")
+    # isdigit() alone also accepts digits such as "²", which int() rejects
+    pks = [int(pk) if str(pk).isascii() and str(pk).isdigit() else None for pk in resume_ids]
+    stored = Resume.objects.select_related("blob").in_bulk([pk for pk in pks if pk is not None])
+    for value, pk in zip(resume_ids, pks):
+        resume = stored.get(pk) if pk is not None else None
+        if resume is None:
+            errors.append({"resume_id": value, "error": "Resume not found."})
+            continue
+        resumes.append({"resume_id": resume.pk, "name": resume.name})
+        texts.append(stored_resume_text(resume))
+
+    if not texts:
+        return Response({"error": "Please upload resume files or pass resume IDs.", "errors": errors}, status=400)
+
+    with_keywords = str(request.data.get("with_keywords", "true")).lower() not in ("0", "false", "no")
+    scores = ats_score_matrix(texts, job_descriptions, with_keywords=with_keywords)
+    return Response({
+        "job_descriptions": len(job_descriptions),
+        "results": [dict(resume, scores=row) for resume, row in zip(resumes, scores)],
+        "errors": errors,
+    })
+
+
+from django.shortcuts import get_object_or_404
+from django.urls import reverse
+from .jobs import enqueue, job_status
+from .models import ResumeJob
+
+@api_view(["POST"])
+def upload_resume_async(request):
+    """Queue a resume for background extraction and return its job ID at once."""
+    form = ResumeForm(request.data, request.FILES)
+    if not form.is_valid():
+        return Response({"errors": form.errors}, status=400)
+
+    resume_file = request.FILES["file"]
+    file_name = resume_file.name.lower()
+    if file_name.endswith('.pdf'):
+        file_type = "pdf"
+    elif file_name.endswith('.docx'):
+        file_type = "docx"
+    else:
+        return Response({"error": "Unsupported file type. Please upload a PDF or DOCX file."}, status=400)
+
+    blob = get_or_create_blob(resume_file, file_type)
+    job = enqueue(blob, form.cleaned_data["name"], form.cleaned_data["email"])
+    return Response({
+        "job_id": job.pk,
+        "status": job.status,
+        "status_url": reverse("resume_job_status", args=[job.pk]),
+    }, status=202)
+
+
+@api_view(["GET"])
+def resume_job_status(request, job_id):
+    job = get_object_or_404(ResumeJob.objects.select_related("blob"), pk=job_id)
+    return Response(job_status(job))
+
+
+
+@api_view(["GET"])
+def search_candidates(request):
+    """Resumes that list every skill in ``?skills=python,django`` (or repeated ``skill=``), newest first."""
+    from .skill_index import find_resumes
+
+    skills = request.query_params.getlist("skill") + request.query_params.get("skills", "").split(",")
+    try:
+        limit = max(1, min(int(request.query_params.get("limit", 50)), 500))
+    except ValueError:
+        return Response({"error": "limit must be a number."}, status=400)
+    resumes = find_resumes(skills, limit)
+    return Response({
+        "count": len(resumes),
+        "results": [
+            {"id": resume.pk, "name": resume.name, "email": resume.email, "skills": resume.skills}
+            for resume in resumes
+        ],
+    })
+
+
+@api_view(["GET"])
+def search_resumes_api(request):
+    """Full-text search over stored resumes: ``?q=django "rest api" devel*``, BM25-ranked with snippets."""
+    from .search import search_resumes
+
+    query = request.query_params.get("q", "").strip()
+    if not query:
+        return Response({"error": "Please provide a search query (q)."}, status=400)
+    try:
+        limit = max(1, min(int(request.query_params.get("limit", 20)), 100))
+        offset = int(request.query_params.get("offset", 0))
+    except ValueError:
+        return Response({"error": "limit and offset must be numbers."}, status=400)
+    if offset < 0:
+        return Response({"error": "offset must not be negative."}, status=400)
+    results = search_resumes(query, limit=limit, offset=offset)
+    return Response({"query": query, "count": len(results), "results": results})
+
+
+@csrf_exempt
+@require_POST
+def ats_checker_stream_api(request):
+    """
+    Score a batch of resumes against one job description, streaming one
+    NDJSON line per resume as soon as it is scored.
+
+    Send multipart/form-data with ``job_description`` first, then any number
+    of resume files and/or ``resume_ids`` fields; or JSON with
+    ``job_description`` and a ``resume_ids`` list.
+    """
+    from .ats_stream import parse_ids, stream_ids, stream_multipart
+
+    if request.content_type == "application/json":
+        try:
+            payload = json.loads(request.body or b"{}")
+        except ValueError:
+            return JsonResponse({"error": "Invalid JSON body."}, status=400)
+        if not isinstance(payload, dict):
+            return JsonResponse({"error": "The JSON body must be an object."}, status=400)
+        job_description = str(payload.get("job_description", "")).strip()
+        resume_ids = payload.get("resume_ids") or []
+        if not job_description:
+            return JsonResponse({"error": "Please provide a job description."}, status=400)
+        if not isinstance(resume_ids, list) or not resume_ids:
+            return JsonResponse({"error": "Please pass a list of resume_ids."}, status=400)
+        results = stream_ids(job_description, parse_ids(resume_ids))
+    elif request.content_type == "multipart/form-data":
+        # Nothing may touch request.POST / request.FILES first, or the body is parsed all at once
+        results = stream_multipart(request)
+    else:
+        return JsonResponse({"error": "Send multipart/form-data or application/json."}, status=415)
+
+    response = StreamingHttpResponse(results, content_type="application/x-ndjson")
+    # Let proxies pass each line on as it is written
+    response["X-Accel-Buffering"] = "no"
+    response["Cache-Control"] = "no-cache"
+    return response
@@ -0,0 +1,57 @@
+"""
+Production server for the Django project (gunicorn picks this file up from
+the working directory):
+
+    gunicorn Ai_Resume_detection.wsgi:application
+    GUNICORN_WORKER_CLASS=uvicorn.workers.UvicornWorker gunicorn Ai_Resume_detection.asgi:application
+
+The master loads the NLP models and the skill dictionary once, freezes them
+and forks the workers, which share that memory copy-on-write (see
+extractor/prefork.py). Everything below can be set from the environment.
+"""
+import gc
+import os
+
+
+def env_int(name, default):
+    value = os.environ.get(name, "").strip()
+    return int(value) if value else default
+
+
+# Nothing the master allocates from here on is collected; see extractor/prefork.py
+gc.disable()
+# The master loads the models itself before forking; a background warm-up
+# thread started by ExtractorConfig.ready() could still be running at fork time
+os.environ["NLP_WARMUP"] = "0"
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+# Every worker is a full process; the models are shared, but requests are not
+workers = env_int("WEB_CONCURRENCY", os.cpu_count() or 1)
+worker_class = os.environ.get("GUNICORN_WORKER_CLASS", "sync")
+threads = env_int("GUNICORN_THREADS", 1)
+preload_app = True
+
+# Workers are replaced after this many requests (plus up to the jitter, so
+# they do not all restart together), which returns memory they have unshared
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+# Large PDFs can take a while to parse
+timeout = env_int("GUNICORN_TIMEOUT", 120)
+graceful_timeout = env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+
+accesslog = "-"
+
+
+def when_ready(server):
+    from extractor.prefork import preload
+    server.log.info("Models and dictionaries preloaded in %.1fs", preload())
+
+
+def pre_fork(server, worker):
+    from extractor.prefork import freeze
+    server.log.debug("%d objects frozen before forking", freeze())
+
+
+def post_fork(server, worker):
+    from extractor.prefork import worker_started
+    worker_started()
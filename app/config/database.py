@@ -1 +1,54 @@
- 
+import os
+import json
+
+from sqlalchemy import create_engine, select, func
+from sqlalchemy.orm import DeclarativeBase, sessionmaker
+
+from app.config.settings import DATABASE_URL, JOBS_SEED_FILE
+
+
+class Base(DeclarativeBase):
+    pass
+
+
+# SQLite connections are used from FastAPI's thread pool as well
+connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+if DATABASE_URL.startswith("sqlite:///"):
+    os.makedirs(os.path.dirname(DATABASE_URL[len("sqlite:///"):]) or ".", exist_ok=True)
+
+engine = create_engine(DATABASE_URL, connect_args=connect_args, pool_pre_ping=True)
+SessionLocal = sessionmaker(bind=engine, expire_on_commit=False)
+
+
+def get_db():
+    """FastAPI dependency: one session per request."""
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+_initialized = False
+
+
+def init_db():
+    """
+    Create the tables, and seed the jobs table from JOBS_SEED_FILE when it is empty.
+
+    Runs once per process. Under gunicorn it runs in the master before the
+    fork (see resume_pipeline.preload), so the workers skip it instead of all
+    seeding the empty table at once.
+    """
+    global _initialized
+    if _initialized:
+        return
+    from app.models.job import Job
+
+    Base.metadata.create_all(engine)
+    with SessionLocal() as db:
+        if not db.scalar(select(func.count()).select_from(Job)) and os.path.exists(JOBS_SEED_FILE):
+            with open(JOBS_SEED_FILE, "r", encoding="utf-8") as f:
+                db.add_all(Job(**job) for job in json.load(f))
+            db.commit()
+    _initialized = True
@@ -1 +1,50 @@
- 
+from datetime import datetime, timezone
+from typing import Optional
+
+from sqlalchemy import JSON, DateTime, Integer, String, Text, UniqueConstraint
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.config.database import Base
+
+
+def utcnow():
+    return datetime.now(timezone.utc)
+
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    title: Mapped[str] = mapped_column(String(200))
+    company: Mapped[str] = mapped_column(String(200), default="")
+    location: Mapped[str] = mapped_column(String(200), default="")
+    # Posting page; fetched postings are upserted on it, seeded ones may leave it empty
+    url: Mapped[str] = mapped_column(String(500), default="")
+    description: Mapped[str] = mapped_column(Text, default="")
+    # Required skills, as names from the skills dictionary
+    skills: Mapped[list] = mapped_column(JSON, default=list)
+    updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), default=utcnow, onupdate=utcnow, index=True)
+
+    # Set by app/utils/job_fetcher.py for postings pulled from a job board
+    source: Mapped[Optional[str]] = mapped_column(String(100), nullable=True, index=True)
+    # Validators for conditional GETs, and a hash of the last body we parsed
+    etag: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+    fetched_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # NULLs are distinct, so seeded jobs without a source never collide
+        UniqueConstraint("source", "url", name="uq_jobs_source_url"),
+    )
+
+
+class JobSource(Base):
+    """A job board listing page and the validators from its last fetch."""
+    __tablename__ = "job_sources"
+
+    name: Mapped[str] = mapped_column(String(100), primary_key=True)
+    listing_url: Mapped[str] = mapped_column(String(500))
+    etag: Mapped[Optional[str]] = mapped_column(String(200), nullable=True)
+    last_modified: Mapped[Optional[str]] = mapped_column(String(100), nullable=True)
+    synced_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
@@ -1 +1,26 @@
-"" 
+from typing import List, Optional, Union
+
+from pydantic import BaseModel
+
+
+class JobMatch(BaseModel):
+    job_id: int
+    title: str
+    score: float
+    matched: List[str]
+    missing: List[str]
+
+
+class ResumeResult(BaseModel):
+    filename: str
+    sha256: str
+    skills: List[str]
+    summary: Optional[str] = None
+    experience: Optional[str] = None
+    education: Optional[str] = None
+    projects: Optional[str] = None
+    achievements: Optional[Union[List[str], str]] = None
+    github_links: str = ""
+    total_experience: str = ""
+    experience_timeline: dict = {}
+    matches: List[JobMatch] = []
@@ -1 +1,247 @@
- 
+"""
+Dense embeddings for resumes and job postings, for offline use only.
+
+Nothing on the request path imports this module: the model is fitted and the
+vector stores are filled from scripts or a notebook (``EmbeddingEngine.build``,
+then ``add_resumes`` / ``add_jobs``), and ``similarity.IVFIndex`` can index a
+store for nearest-neighbour search. The web apps keep matching on skills.
+"""
+import os
+import json
+import hashlib
+import threading
+
+import joblib
+import numpy as np
+from sklearn.decomposition import TruncatedSVD
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+EMBEDDINGS_DIR = os.path.join(BASE_DIR, "data", "embeddings")
+
+DEFAULT_DIM = 256
+BATCH_SIZE = 512
+
+
+# ------------------- Embedding Model -------------------
+class EmbeddingModel:
+    """
+    Offline text embeddings: TF-IDF over our own corpus projected to ``dim``
+    dimensions with truncated SVD (LSA). Vectors are float32 and L2-normalized,
+    so a dot product is a cosine similarity.
+    """
+
+    def __init__(self, dim=DEFAULT_DIM, max_features=50_000):
+        self.dim = dim
+        self.vectorizer = TfidfVectorizer(
+            lowercase=True, stop_words="english", sublinear_tf=True, max_features=max_features, dtype=np.float32,
+        )
+        self.svd = None
+
+    def fit(self, corpus):
+        tfidf = self.vectorizer.fit_transform(corpus)
+        # SVD cannot have more components than the smaller side of the matrix
+        components = max(1, min(self.dim, tfidf.shape[0] - 1, tfidf.shape[1] - 1))
+        self.svd = TruncatedSVD(n_components=components, random_state=42)
+        self.svd.fit(tfidf)
+        self.dim = components
+        return self
+
+    def encode(self, texts, batch_size=BATCH_SIZE):
+        """Embed ``texts`` a batch at a time, so the sparse TF-IDF matrix never holds the whole input."""
+        if self.svd is None:
+            raise RuntimeError("EmbeddingModel is not fitted; call fit() or load() first")
+        texts = list(texts)
+        out = np.empty((len(texts), self.dim), dtype=np.float32)
+        for start in range(0, len(texts), batch_size):
+            batch = self.svd.transform(self.vectorizer.transform(texts[start:start + batch_size]))
+            norms = np.linalg.norm(batch, axis=1, keepdims=True)
+            out[start:start + batch_size] = batch / np.maximum(norms, 1e-12)
+        return out
+
+    def fingerprint(self):
+        """Hash of the fitted vocabulary and projection; vectors are only comparable within one fingerprint."""
+        if self.svd is None:
+            raise RuntimeError("EmbeddingModel is not fitted; call fit() or load() first")
+        digest = hashlib.sha256()
+        vocabulary = sorted((term, int(column)) for term, column in self.vectorizer.vocabulary_.items())
+        digest.update(json.dumps(vocabulary).encode("utf-8"))
+        digest.update(np.ascontiguousarray(self.svd.components_, dtype=np.float32).tobytes())
+        return digest.hexdigest()
+
+    def save(self, path):
+        joblib.dump({"dim": self.dim, "vectorizer": self.vectorizer, "svd": self.svd}, path)
+
+    @classmethod
+    def load(cls, path):
+        state = joblib.load(path)
+        model = cls(dim=state["dim"])
+        model.vectorizer = state["vectorizer"]
+        model.svd = state["svd"]
+        return model
+
+
+# ------------------- Vector Store -------------------
+class VectorStore:
+    """
+    Append-only float32 vectors on disk, read back through a memory map.
+
+    ``vectors.f32`` holds the raw rows and ``ids.txt`` their ids, one per line.
+    Every process maps the same file, so the OS page cache is the only copy in
+    RAM. Appends write to the end of both files; readers see them on their
+    next call to ``vectors()``. Appends are expected from one process at a time.
+
+    ``meta.json`` records the dimension and the fingerprint of the model that
+    produced the vectors; opening the store for another model is an error,
+    since its vectors live in a different space.
+    """
+
+    def __init__(self, directory, dim, fingerprint=None):
+        self.directory = directory
+        self.dim = dim
+        self.fingerprint = fingerprint
+        self.vectors_path = os.path.join(directory, "vectors.f32")
+        self.ids_path = os.path.join(directory, "ids.txt")
+        self.meta_path = os.path.join(directory, "meta.json")
+        self._lock = threading.Lock()
+        self._ids = []
+        self._rows = {}
+        self._offset = 0
+        os.makedirs(directory, exist_ok=True)
+        if os.path.exists(self.meta_path):
+            with open(self.meta_path, "r", encoding="utf-8") as f:
+                meta = json.load(f)
+            if meta["dim"] != dim:
+                raise ValueError(f"{directory} holds {meta['dim']}-d vectors, not {dim}-d")
+            if fingerprint is not None and meta.get("fingerprint") != fingerprint:
+                raise ValueError(f"{directory} holds vectors from another embedding model; rebuild it")
+        else:
+            self._write_meta()
+
+    def _write_meta(self):
+        with open(self.meta_path, "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "dtype": "float32", "fingerprint": self.fingerprint}, f)
+
+    def clear(self):
+        """Drop every row, and take over the store for this store's model."""
+        with self._lock:
+            for path in (self.vectors_path, self.ids_path):
+                if os.path.exists(path):
+                    os.remove(path)
+            self._ids, self._rows, self._offset = [], {}, 0
+            self._write_meta()
+
+    def __len__(self):
+        # A crash between the two writes leaves one file ahead; only rows present in both count
+        size = os.path.getsize(self.vectors_path) if os.path.exists(self.vectors_path) else 0
+        return min(size // (self.dim * 4), self._refresh())
+
+    def _refresh(self):
+        """Pick up ids appended since the last call, reading only the new lines."""
+        with self._lock:
+            if os.path.exists(self.ids_path):
+                with open(self.ids_path, "rb") as f:
+                    f.seek(self._offset)
+                    tail = f.read()
+                # Leave a half-written last line for the next call
+                complete = tail[:tail.rfind(b"\n") + 1]
+                self._offset += len(complete)
+                for line in complete.decode("utf-8").splitlines():
+                    self._rows[line] = len(self._ids)
+                    self._ids.append(line)
+            return len(self._ids)
+
+    def ids(self):
+        """Ids in row order."""
+        self._refresh()
+        return list(self._ids)
+
+    def row_of(self, id):
+        self._refresh()
+        return self._rows.get(str(id))
+
+    def vectors(self):
+        """Read-only (n, dim) float32 memory map of every stored vector."""
+        count = len(self)
+        if count == 0:
+            return np.empty((0, self.dim), dtype=np.float32)
+        return np.memmap(self.vectors_path, dtype=np.float32, mode="r", shape=(count, self.dim))
+
+    def get(self, id):
+        row = self.row_of(id)
+        return None if row is None else np.array(self.vectors()[row])
+
+    def append(self, ids, vectors):
+        """Add rows to the end of the store; existing rows are never rewritten."""
+        vectors = np.ascontiguousarray(vectors, dtype=np.float32)
+        ids = [str(id) for id in ids]
+        if vectors.ndim != 2 or vectors.shape != (len(ids), self.dim):
+            raise ValueError(f"Expected {len(ids)} vectors of dimension {self.dim}, got {vectors.shape}")
+        if any("\n" in id for id in ids):
+            raise ValueError("Vector ids may not contain line breaks")
+
+        with self._lock:
+            with open(self.vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            with open(self.ids_path, "a", encoding="utf-8") as f:
+                f.writelines(f"{id}\n" for id in ids)
+                f.flush()
+                os.fsync(f.fileno())
+        return len(self)
+
+
+# ------------------- Embedding Engine -------------------
+class EmbeddingEngine:
+    """The fitted model plus one vector store each for resumes and jobs, all under ``directory``."""
+
+    def __init__(self, model, directory=EMBEDDINGS_DIR, reset=False):
+        self.model = model
+        self.directory = directory
+        fingerprint = model.fingerprint()
+        self.resumes = self._store("resumes", fingerprint, reset)
+        self.jobs = self._store("jobs", fingerprint, reset)
+
+    def _store(self, name, fingerprint, reset):
+        path = os.path.join(self.directory, name)
+        if not reset:
+            return VectorStore(path, self.model.dim, fingerprint)
+        # Start from an empty store: the old vectors came from another projection (maybe another dimension)
+        meta_path = os.path.join(path, "meta.json")
+        if os.path.exists(meta_path):
+            os.remove(meta_path)
+        store = VectorStore(path, self.model.dim, fingerprint)
+        store.clear()
+        return store
+
+    @classmethod
+    def build(cls, corpus, directory=EMBEDDINGS_DIR, dim=DEFAULT_DIM):
+        """
+        Fit a new model on ``corpus`` (resume and job texts) and save it to
+        ``directory``. Both vector stores start empty: vectors from the previous
+        model are not comparable with the new ones.
+        """
+        os.makedirs(directory, exist_ok=True)
+        model = EmbeddingModel(dim=dim).fit(corpus)
+        model.save(os.path.join(directory, "model.joblib"))
+        return cls(model, directory, reset=True)
+
+    @classmethod
+    def load(cls, directory=EMBEDDINGS_DIR):
+        return cls(EmbeddingModel.load(os.path.join(directory, "model.joblib")), directory)
+
+    def _add(self, store, ids, texts, batch_size):
+        ids, texts = list(ids), list(texts)
+        for start in range(0, len(texts), batch_size):
+            store.append(ids[start:start + batch_size], self.model.encode(texts[start:start + batch_size]))
+        return len(store)
+
+    def add_resumes(self, ids, texts, batch_size=BATCH_SIZE):
+        """Embed and store new resumes; earlier vectors are left as they are."""
+        return self._add(self.resumes, ids, texts, batch_size)
+
+    def add_jobs(self, ids, texts, batch_size=BATCH_SIZE):
+        """Embed and store new job postings; earlier vectors are left as they are."""
+        return self._add(self.jobs, ids, texts, batch_size)
+
@@ -1 +1,275 @@
- 
+import os
+import json
+
+import numpy as np
+
+# Rows scored against the centroids at a time while assigning
+ASSIGN_CHUNK = 65_536
+# Cap on the sample k-means trains on; more points barely move the centroids
+MAX_TRAIN_POINTS = 100_000
+
+
+# ------------------- Clustering -------------------
+def _assign(vectors, centroids):
+    """Index of the most similar centroid (inner product) for every row."""
+    labels = np.empty(len(vectors), dtype=np.int32)
+    for start in range(0, len(vectors), ASSIGN_CHUNK):
+        chunk = np.asarray(vectors[start:start + ASSIGN_CHUNK], dtype=np.float32)
+        labels[start:start + ASSIGN_CHUNK] = np.argmax(chunk @ centroids.T, axis=1)
+    return labels
+
+
+def kmeans(vectors, k, iterations=15, seed=0, spherical=True):
+    """
+    Lloyd's k-means on a sample of ``vectors``.
+
+    ``spherical`` keeps the centroids unit length, which is what inner-product
+    search over normalized embeddings wants.
+    """
+    rng = np.random.default_rng(seed)
+    n = len(vectors)
+    sample = np.asarray(vectors if n <= MAX_TRAIN_POINTS else vectors[np.sort(rng.choice(n, MAX_TRAIN_POINTS, replace=False))],
+                        dtype=np.float32)
+    k = min(k, len(sample))
+    centroids = sample[rng.choice(len(sample), k, replace=False)].copy()
+
+    for _ in range(iterations):
+        if spherical:
+            labels = _assign(sample, centroids)
+        else:
+            # argmin ||x - c||^2 == argmax (x.c - ||c||^2 / 2)
+            labels = np.argmax(sample @ centroids.T - 0.5 * (centroids ** 2).sum(axis=1), axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, labels, sample)
+        counts = np.bincount(labels, minlength=k).astype(np.float32)
+        empty = counts == 0
+        # Re-seed empty clusters with random points so no list goes unused
+        sums[empty] = sample[rng.choice(len(sample), int(empty.sum()))]
+        counts[empty] = 1
+        centroids = sums / counts[:, None]
+        if spherical:
+            centroids /= np.maximum(np.linalg.norm(centroids, axis=1, keepdims=True), 1e-12)
+    return centroids.astype(np.float32)
+
+
+# ------------------- Product Quantization -------------------
+class ProductQuantizer:
+    """
+    Splits vectors into ``m`` sub-vectors and stores each as the uint8 index of
+    its nearest sub-centroid: ``dim * 4`` bytes per vector become ``m`` bytes.
+    Inner products are estimated with one lookup table per query.
+    """
+
+    def __init__(self, dim, m):
+        if dim % m:
+            raise ValueError(f"PQ needs the dimension ({dim}) to be a multiple of m ({m})")
+        self.dim = dim
+        self.m = m
+        self.sub_dim = dim // m
+        self.codebooks = None
+
+    def _split(self, vectors):
+        return np.asarray(vectors, dtype=np.float32).reshape(len(vectors), self.m, self.sub_dim)
+
+    def train(self, vectors, seed=0):
+        parts = self._split(vectors)
+        self.codebooks = np.stack([
+            kmeans(parts[:, j], 256, seed=seed + j, spherical=False) for j in range(self.m)
+        ])
+        return self
+
+    def encode(self, vectors):
+        parts = self._split(vectors)
+        codes = np.empty((len(vectors), self.m), dtype=np.uint8)
+        for j in range(self.m):
+            book = self.codebooks[j]
+            codes[:, j] = np.argmax(parts[:, j] @ book.T - 0.5 * (book ** 2).sum(axis=1), axis=1)
+        return codes
+
+    def tables(self, query):
+        """(m, 256) inner products of each query sub-vector with each sub-centroid."""
+        return np.einsum("js,jcs->jc", query.reshape(self.m, self.sub_dim), self.codebooks)
+
+    def scores(self, tables, codes):
+        return tables[np.arange(self.m), codes].sum(axis=1)
+
+
+# ------------------- IVF Index -------------------
+def _top(ids, scores, k):
+    """The ``k`` best (ids, scores), best first, without sorting everything."""
+    if len(scores) > k:
+        top = np.argpartition(-scores, k - 1)[:k]
+    else:
+        top = np.arange(len(scores))
+    top = top[np.argsort(-scores[top], kind="stable")]
+    return ids[top], scores[top]
+
+
+class IVFIndex:
+    """
+    Inverted-file index for top-k inner-product search.
+
+    Vectors are grouped by their nearest of ``nlist`` k-means centroids; a query
+    only scores the vectors in its ``nprobe`` nearest lists. ``nprobe`` is the
+    recall-vs-latency knob: 1 is fastest, ``nlist`` is exact brute force.
+    With ``pq_m`` set, each vector's residual from its centroid is stored
+    product-quantized instead of the raw vector.
+    """
+
+    def __init__(self, dim, nlist=None, nprobe=8, pq_m=None):
+        self.dim = dim
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.pq = ProductQuantizer(dim, pq_m) if pq_m else None
+        self.centroids = None
+        # Each list is a sequence of chunks, joined on the next query
+        self._ids = []
+        self._data = []
+
+    def __len__(self):
+        return sum(len(chunk) for chunks in self._ids for chunk in chunks)
+
+    @property
+    def is_trained(self):
+        return self.centroids is not None
+
+    def train(self, vectors, seed=0):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if self.nlist is None:
+            # Rule of thumb: about 4 * sqrt(n) lists
+            self.nlist = max(1, int(4 * np.sqrt(len(vectors))))
+        self.centroids = kmeans(vectors, self.nlist, seed=seed)
+        self.nlist = len(self.centroids)
+        if self.pq is not None:
+            # Quantize what the centroid leaves unexplained, it is much smaller than the vector
+            self.pq.train(vectors - self.centroids[_assign(vectors, self.centroids)], seed=seed)
+        self._ids = [[] for _ in range(self.nlist)]
+        self._data = [[] for _ in range(self.nlist)]
+        return self
+
+    def add(self, ids, vectors):
+        """Add vectors to their nearest lists; nothing already indexed is touched."""
+        if not self.is_trained:
+            raise RuntimeError("Train the index (or use IVFIndex.build) before adding vectors")
+        ids = np.asarray(ids)
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.shape != (len(ids), self.dim):
+            raise ValueError(f"Expected {len(ids)} vectors of dimension {self.dim}, got {vectors.shape}")
+
+        labels = _assign(vectors, self.centroids)
+        data = self.pq.encode(vectors - self.centroids[labels]) if self.pq is not None else vectors
+        order = np.argsort(labels, kind="stable")
+        bounds = np.searchsorted(labels[order], np.arange(self.nlist + 1))
+        for lst in np.flatnonzero(np.diff(bounds)):
+            rows = order[bounds[lst]:bounds[lst + 1]]
+            self._ids[lst].append(ids[rows])
+            self._data[lst].append(data[rows])
+        return self
+
+    @classmethod
+    def build(cls, ids, vectors, nlist=None, nprobe=8, pq_m=None, seed=0):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        return cls(vectors.shape[1], nlist, nprobe, pq_m).train(vectors, seed).add(ids, vectors)
+
+    @classmethod
+    def from_vector_store(cls, store, **kwargs):
+        """
+        Index every vector of an ``embedding_model.VectorStore``.
+
+        Ids are row numbers, so ``store.vectors()`` can be passed to ``search``
+        as ``refine`` and ``store.ids()[row]`` gives the stored id.
+        """
+        vectors = store.vectors()
+        return cls.build(np.arange(len(vectors)), vectors, **kwargs)
+
+    def _list(self, lst):
+        if len(self._ids[lst]) > 1:
+            self._ids[lst] = [np.concatenate(self._ids[lst])]
+            self._data[lst] = [np.concatenate(self._data[lst])]
+        if not self._ids[lst]:
+            return None, None
+        return self._ids[lst][0], self._data[lst][0]
+
+    def search(self, query, k=10, nprobe=None, refine=None, refine_factor=10):
+        """
+        Top ``k`` (ids, scores) for one query vector, best first.
+
+        For a PQ index, ``refine`` (raw vectors indexed by id, e.g. a memory
+        map) re-scores the best ``k * refine_factor`` approximate matches exactly.
+        """
+        query = np.asarray(query, dtype=np.float32).reshape(self.dim)
+        nprobe = min(nprobe or self.nprobe, self.nlist)
+        coarse = self.centroids @ query
+        probe = np.argpartition(-coarse, nprobe - 1)[:nprobe] if nprobe < self.nlist else np.arange(self.nlist)
+
+        tables = self.pq.tables(query) if self.pq is not None else None
+        found_ids, found_scores = [], []
+        for lst in probe:
+            ids, data = self._list(lst)
+            if ids is None:
+                continue
+            found_ids.append(ids)
+            if tables is not None:
+                # q.x = q.centroid + q.residual; the tables only cover the residual
+                found_scores.append(coarse[lst] + self.pq.scores(tables, data))
+            else:
+                found_scores.append(data @ query)
+        if not found_ids:
+            return np.array([]), np.array([], dtype=np.float32)
+
+        ids = np.concatenate(found_ids)
+        scores = np.concatenate(found_scores)
+        if tables is not None and refine is not None:
+            ids, _ = _top(ids, scores, k * refine_factor)
+            # Read the raw vectors in id order, a memory map prefers that
+            order = np.argsort(ids)
+            scores = np.empty(len(ids), dtype=np.float32)
+            scores[order] = np.asarray(refine[ids[order]], dtype=np.float32) @ query
+        return _top(ids, scores, k)
+
+    def search_many(self, queries, k=10, nprobe=None, refine=None, refine_factor=10):
+        return [self.search(query, k, nprobe, refine, refine_factor) for query in np.asarray(queries, dtype=np.float32)]
+
+    # ------------------- Persistence -------------------
+    def save(self, directory):
+        """Write the index as plain .npy files, so ``load`` can memory-map the big arrays."""
+        os.makedirs(directory, exist_ok=True)
+        for lst in range(self.nlist):
+            self._list(lst)
+        sizes = np.array([len(self._ids[lst][0]) if self._ids[lst] else 0 for lst in range(self.nlist)])
+        width = self.pq.m if self.pq is not None else self.dim
+        dtype = np.uint8 if self.pq is not None else np.float32
+        id_chunks = [self._ids[lst][0] for lst in range(self.nlist) if self._ids[lst]]
+        ids = np.concatenate(id_chunks) if id_chunks else np.array([], dtype=str)
+        data = np.concatenate(
+            [self._data[lst][0] if self._data[lst] else np.empty((0, width), dtype) for lst in range(self.nlist)]
+        )
+
+        np.save(os.path.join(directory, "centroids.npy"), self.centroids)
+        np.save(os.path.join(directory, "offsets.npy"), np.concatenate([[0], np.cumsum(sizes)]))
+        # Object arrays would need pickle and cannot be memory-mapped
+        np.save(os.path.join(directory, "ids.npy"), ids.astype(str) if ids.dtype == object else ids)
+        np.save(os.path.join(directory, "data.npy"), data)
+        if self.pq is not None:
+            np.save(os.path.join(directory, "codebooks.npy"), self.pq.codebooks)
+        with open(os.path.join(directory, "index.json"), "w", encoding="utf-8") as f:
+            json.dump({"dim": self.dim, "nlist": self.nlist, "nprobe": self.nprobe,
+                       "pq_m": self.pq.m if self.pq is not None else None}, f)
+
+    @classmethod
+    def load(cls, directory, mmap=True):
+        with open(os.path.join(directory, "index.json"), "r", encoding="utf-8") as f:
+            meta = json.load(f)
+        index = cls(meta["dim"], meta["nlist"], meta["nprobe"], meta["pq_m"])
+        mode = "r" if mmap else None
+        index.centroids = np.load(os.path.join(directory, "centroids.npy"))
+        if index.pq is not None:
+            index.pq.codebooks = np.load(os.path.join(directory, "codebooks.npy"))
+        offsets = np.load(os.path.join(directory, "offsets.npy"))
+        ids = np.load(os.path.join(directory, "ids.npy"), mmap_mode=mode)
+        data = np.load(os.path.join(directory, "data.npy"), mmap_mode=mode)
+        # Each list is a slice of the mapped arrays; nothing is read until a query probes it
+        index._ids = [[ids[a:b]] if b > a else [] for a, b in zip(offsets[:-1], offsets[1:])]
+        index._data = [[data[a:b]] if b > a else [] for a, b in zip(offsets[:-1], offsets[1:])]
+        return index
+
@@ -2,15 +2,15 @@ import sys, os
 
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
 sys.path.append(BASE_DIR)
+# The Django project holds the shared NLP service client
+sys.path.append(os.path.join(BASE_DIR, "Ai_Resume_detection"))
 
 from app.utils import resume_parser
+from extractor import nlp_service
 
 import re
-import spacy
 
 
-nlp = spacy.load("en_core_web_sm")
-
 def clean_resume_text(text):
     """
     Cleans extracted resume text:
@@ -32,16 +32,13 @@ def clean_resume_text(text):
     text = re.sub(r'[^a-z0-9@\.\-\+\s]', ' ', text)
 
     # 5. Process with spaCy for lemmatization & stopword cleaning (optional at this stage)
-    doc = nlp(text)
-    tokens = [token.lemma_ for token in doc if not token.is_punct]
-
-    return " ".join(tokens)
+    # Runs in the shared NLP service when it is up, otherwise with this process's own model
+    return nlp_service.call("lemmatize", [text])[0]
 
-raw_text = resume_parser.extract_text_from_pdf("D:\\Minor-Project\\data\\resume1.pdf")
-    
-cleaned_text = clean_resume_text(raw_text)
-print("Before Cleaning:\n", raw_text)
-print("\nAfter Cleaning:\n", cleaned_text)
 
-    
+if __name__ == "__main__":
+    raw_text = resume_parser.extract_text_from_pdf(sys.argv[1] if len(sys.argv) > 1 else "D:\\Minor-Project\\data\\resume1.pdf")
 
+    cleaned_text = clean_resume_text(raw_text)
+    print("Before Cleaning:\n", raw_text)
+    print("\nAfter Cleaning:\n", cleaned_text)
@@ -1 +1,123 @@
- 
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
+from starlette.datastructures import UploadFile
+from starlette.formparsers import MultiPartException, MultiPartParser
+
+from app.config.database import get_db
+from app.config.settings import (
+    MAX_UPLOAD_BYTES, PARSE_CONCURRENCY, PARSE_WORKERS, RESULTS_TOP_K, UPLOAD_SPOOL_BYTES,
+)
+from app.models.schemas import ResumeResult
+from app.utils.matcher import get_matcher
+from app.utils.resume_pipeline import FILE_TYPES, init_worker, parse_resume
+
+router = APIRouter(prefix="/api/resumes", tags=["resumes"])
+
+
+# ------------------- Upload -------------------
+class UploadParser(MultiPartParser):
+    # Files are spooled in memory up to this size, then to a temporary file on disk
+    spool_max_size = max_file_size = UPLOAD_SPOOL_BYTES
+
+
+async def _limited(stream, limit):
+    received = 0
+    async for chunk in stream:
+        received += len(chunk)
+        if received > limit:
+            raise HTTPException(status_code=413, detail=f"Upload is larger than {limit} bytes.")
+        yield chunk
+
+
+async def receive_upload(request, field="file"):
+    """
+    Stream the multipart body into a spooled temporary file, failing with 413
+    as soon as it exceeds MAX_UPLOAD_BYTES. Returns (form, upload, file type);
+    the caller closes the form.
+    """
+    length = request.headers.get("content-length", "")
+    if length.isdigit() and int(length) > MAX_UPLOAD_BYTES:
+        raise HTTPException(status_code=413, detail=f"Upload is larger than {MAX_UPLOAD_BYTES} bytes.")
+    if not request.headers.get("content-type", "").startswith("multipart/form-data"):
+        raise HTTPException(status_code=415, detail="Send the resume as multipart/form-data.")
+
+    parser = UploadParser(request.headers, _limited(request.stream(), MAX_UPLOAD_BYTES), max_files=1, max_fields=10)
+    try:
+        form = await parser.parse()
+    except MultiPartException as exc:
+        raise HTTPException(status_code=400, detail=exc.message)
+
+    upload = form.get(field)
+    file_type = FILE_TYPES.get(os.path.splitext(upload.filename or "")[1].lower()) if isinstance(upload, UploadFile) else None
+    if file_type is None:
+        await form.close()
+        raise HTTPException(status_code=415, detail="Upload a PDF or DOCX resume in the 'file' field.")
+    return form, upload, file_type
+
+
+# ------------------- Parsing -------------------
+_pool = None
+# Uploads parsing or waiting for a worker; later ones wait here, before their file is read into memory
+_slots = None
+
+
+def get_pool():
+    """
+    The parsing process pool, or None with PARSE_WORKERS=0: uploads are then
+    parsed in this process's thread pool, with the models it already holds.
+    """
+    global _pool, _slots
+    if _slots is None:
+        _slots = asyncio.Semaphore(PARSE_CONCURRENCY)
+        if PARSE_WORKERS > 0:
+            # Spawned, not forked: the server process runs threads (thread pool, model warm-up)
+            _pool = ProcessPoolExecutor(PARSE_WORKERS, mp_context=multiprocessing.get_context("spawn"),
+                                        initializer=init_worker)
+        else:
+            init_worker()
+    return _pool
+
+
+@router.on_event("startup")
+def start_pool():
+    get_pool()
+
+
+@router.on_event("shutdown")
+def stop_pool():
+    global _pool, _slots
+    if _pool is not None:
+        _pool.shutdown(cancel_futures=True)
+    _pool = _slots = None
+
+
+async def process_upload(request):
+    """Receive a resume upload and extract its fields in the parsing pool, without blocking the event loop."""
+    pool = get_pool()
+    form, upload, file_type = await receive_upload(request)
+    try:
+        async with _slots:
+            content = await upload.read()
+            data = await asyncio.get_running_loop().run_in_executor(pool, parse_resume, content, file_type)
+    finally:
+        await form.close()
+
+    if "error" in data:
+        raise HTTPException(status_code=422, detail=data["error"])
+    data["filename"] = upload.filename
+    return data
+
+
+# ------------------- Endpoints -------------------
+@router.post("", response_model=ResumeResult)
+async def upload_resume(request: Request, db=Depends(get_db)):
+    """Extract a resume's fields and skills, and match it against the jobs table."""
+    data = await process_upload(request)
+    matcher = await run_in_threadpool(get_matcher, db)
+    data["matches"] = matcher.top_k(data["skills"], RESULTS_TOP_K)
+    return data
@@ -1 +1,245 @@
- 
+import hashlib
+import logging
+from datetime import datetime, timezone
+from urllib.parse import urljoin, urldefrag
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+from sqlalchemy import bindparam, delete, select
+from urllib3.util.retry import Retry
+
+from app.config.database import SessionLocal
+from app.models.job import Job, JobSource
+from app.utils.skill_extractor import get_skill_extractor
+
+logger = logging.getLogger(__name__)
+
+USER_AGENT = "ResumeMatcher-JobFetcher/1.0"
+# Rows per INSERT ... ON CONFLICT statement, well below SQLite's bound-parameter limit
+UPSERT_CHUNK = 200
+UPSERT_COLUMNS = ("title", "company", "location", "description", "skills",
+                  "etag", "last_modified", "content_hash", "fetched_at", "updated_at")
+
+
+class Board:
+    """Where a job board lists its postings, and the CSS selectors for a posting's fields."""
+
+    def __init__(self, name, listing_url, link_selector="a[href]", title_selector="h1",
+                 company_selector=".company", location_selector=".location", description_selector=None):
+        self.name = name
+        self.listing_url = listing_url
+        self.link_selector = link_selector
+        self.title_selector = title_selector
+        self.company_selector = company_selector
+        self.location_selector = location_selector
+        # None uses the text of the whole page
+        self.description_selector = description_selector
+
+
+# ------------------- HTTP -------------------
+def make_session(pool_size=16, retries=3):
+    """A session whose connection pool is as large as the fetch concurrency, with retries on 5xx."""
+    session = requests.Session()
+    retry = Retry(total=retries, backoff_factor=0.5, status_forcelist=(500, 502, 503, 504),
+                  allowed_methods=("GET",))
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers["User-Agent"] = USER_AGENT
+    return session
+
+
+def conditional_get(session, url, etag=None, last_modified=None, timeout=10):
+    """GET ``url``, letting the server answer 304 Not Modified when our copy is current."""
+    headers = {}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    response = session.get(url, headers=headers, timeout=timeout)
+    if response.status_code != 304:
+        response.raise_for_status()
+    return response
+
+
+# ------------------- Parsing -------------------
+def _text(soup, selector):
+    node = soup.select_one(selector) if selector else None
+    return " ".join(node.get_text(" ").split()) if node else ""
+
+
+def parse_listing(html, board, base_url):
+    """Absolute posting URLs on a listing page, in page order, without duplicates."""
+    soup = BeautifulSoup(html, "html.parser")
+    urls = {}
+    for link in soup.select(board.link_selector):
+        href = link.get("href")
+        if href:
+            urls.setdefault(urldefrag(urljoin(base_url, href))[0], None)
+    return list(urls)
+
+
+def parse_posting(html, board):
+    soup = BeautifulSoup(html, "html.parser")
+    description = _text(soup, board.description_selector) if board.description_selector else ""
+    if not description:
+        for node in soup(["script", "style"]):
+            node.decompose()
+        description = " ".join(soup.get_text(" ").split())
+    return {
+        "title": (_text(soup, board.title_selector) or _text(soup, "title"))[:200],
+        "company": _text(soup, board.company_selector)[:200],
+        "location": _text(soup, board.location_selector)[:200],
+        "description": description,
+        "skills": get_skill_extractor().extract(description),
+    }
+
+
+# ------------------- Storage -------------------
+def upsert_jobs(db, rows):
+    """Insert or update ``rows`` (dicts of Job columns) keyed on (source, url), a chunk per statement."""
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert
+    else:
+        # No portable upsert; fall back to one merge per row
+        for row in rows:
+            job = db.scalar(select(Job).where(Job.source == row["source"], Job.url == row["url"])) or Job()
+            for column, value in row.items():
+                setattr(job, column, value)
+            db.add(job)
+        return
+
+    for start in range(0, len(rows), UPSERT_CHUNK):
+        statement = insert(Job).values(rows[start:start + UPSERT_CHUNK])
+        statement = statement.on_conflict_do_update(
+            index_elements=["source", "url"],
+            set_={column: statement.excluded[column] for column in UPSERT_COLUMNS},
+        )
+        db.execute(statement)
+
+
+def refresh_validators(db, source, rows):
+    """Store new validators for postings whose content did not change, leaving updated_at alone."""
+    if not rows:
+        return
+    table = Job.__table__
+    statement = (
+        table.update()
+        .where(table.c.source == source, table.c.url == bindparam("b_url"))
+        .values(etag=bindparam("b_etag"), last_modified=bindparam("b_last_modified"),
+                fetched_at=bindparam("b_fetched_at"), updated_at=table.c.updated_at)
+    )
+    db.execute(statement, [{f"b_{key}": value for key, value in row.items()} for row in rows])
+
+
+# ------------------- Fetcher -------------------
+class JobFetcher:
+    """
+    Incrementally syncs a job board into the jobs table.
+
+    Every request is a conditional GET with the ETag / Last-Modified stored from
+    the previous sync, so unchanged pages cost a 304 and no parsing. Postings
+    are fetched ``concurrency`` at a time over one pooled session and parsed in
+    a separate thread pool while the remaining downloads continue; a posting
+    whose body hashes the same as last time is not parsed again.
+    """
+
+    def __init__(self, session=None, concurrency=8, parse_workers=4, timeout=10):
+        self.session = session or make_session(pool_size=concurrency)
+        self.concurrency = concurrency
+        self.parse_workers = parse_workers
+        self.timeout = timeout
+
+    def _fetch(self, url, known):
+        etag, last_modified, _ = known.get(url, (None, None, None))
+        return conditional_get(self.session, url, etag, last_modified, self.timeout)
+
+    def sync(self, board):
+        stats = {"postings": 0, "not_modified": 0, "unchanged": 0, "upserted": 0, "removed": 0, "errors": 0}
+        now = datetime.now(timezone.utc)
+
+        with SessionLocal() as db:
+            source = db.get(JobSource, board.name) or JobSource(name=board.name, listing_url=board.listing_url)
+            known = {
+                url: (etag, last_modified, content_hash)
+                for url, etag, last_modified, content_hash in db.execute(
+                    select(Job.url, Job.etag, Job.last_modified, Job.content_hash).where(Job.source == board.name)
+                )
+            }
+
+            # An unchanged listing still lists the postings we already know
+            same_listing = source.listing_url == board.listing_url
+            listing = conditional_get(self.session, board.listing_url, source.etag if same_listing else None,
+                                      source.last_modified if same_listing else None, self.timeout)
+            if listing.status_code == 304:
+                urls = list(known)
+            else:
+                urls = parse_listing(listing.text, board, listing.url)
+                source.listing_url = board.listing_url
+                source.etag = listing.headers.get("ETag")
+                source.last_modified = listing.headers.get("Last-Modified")
+            stats["postings"] = len(urls)
+
+            changed, validators = [], []
+            with ThreadPoolExecutor(self.concurrency) as fetchers, ThreadPoolExecutor(self.parse_workers) as parsers:
+                downloads = {fetchers.submit(self._fetch, url, known): url for url in urls}
+                parses = {}
+                for future in as_completed(downloads):
+                    url = downloads[future]
+                    try:
+                        response = future.result()
+                    except requests.RequestException as exc:
+                        logger.warning("Fetching %s failed: %s", url, exc)
+                        stats["errors"] += 1
+                        continue
+                    if response.status_code == 304:
+                        stats["not_modified"] += 1
+                        continue
+
+                    row = {
+                        "source": board.name,
+                        "url": url,
+                        "etag": response.headers.get("ETag"),
+                        "last_modified": response.headers.get("Last-Modified"),
+                        "fetched_at": now,
+                    }
+                    content_hash = hashlib.sha256(response.content).hexdigest()
+                    if url in known and known[url][2] == content_hash:
+                        stats["unchanged"] += 1
+                        validators.append(row)
+                        continue
+                    row["content_hash"] = content_hash
+                    row["updated_at"] = now
+                    parses[parsers.submit(parse_posting, response.text, board)] = row
+
+                for future in as_completed(parses):
+                    row = parses[future]
+                    try:
+                        row.update(future.result())
+                    except Exception:
+                        logger.exception("Parsing %s failed", row["url"])
+                        stats["errors"] += 1
+                        continue
+                    changed.append(row)
+
+            upsert_jobs(db, changed)
+            refresh_validators(db, board.name, validators)
+            stats["upserted"] = len(changed)
+
+            if listing.status_code != 304:
+                # Postings that left the listing are gone from the board
+                gone = set(known) - set(urls)
+                if gone:
+                    result = db.execute(delete(Job).where(Job.source == board.name, Job.url.in_(gone)))
+                    stats["removed"] = result.rowcount
+
+            source.synced_at = now
+            db.merge(source)
+            db.commit()
+        return stats
+
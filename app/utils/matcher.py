@@ -1 +1,121 @@
- 
+import threading
+
+import numpy as np
+from sqlalchemy import func, select
+
+
+def normalize_skill(name):
+    return " ".join(name.split()).lower()
+
+
+class JobMatcher:
+    """
+    Scores a resume's skills against every job at once.
+
+    Each job's required skills are one row of a bit-packed matrix, one bit per
+    skill in the vocabulary and 8 skills per byte. The matrix is stored column
+    major, so the bits of one skill for all jobs sit in one contiguous byte
+    column. Scoring a resume is then a shift-and-mask over one column per
+    resume skill, and its cost does not depend on the size of the vocabulary.
+    """
+
+    # Identifies the jobs data the matcher was built from (see get_matcher)
+    version = None
+
+    def __init__(self, jobs):
+        """``jobs`` is a sequence of (job_id, title, skills) tuples."""
+        self.job_ids = np.array([job_id for job_id, _, _ in jobs], dtype=np.int64)
+        self.titles = [title for _, title, _ in jobs]
+
+        names = {}
+        for _, _, skills in jobs:
+            for skill in skills or []:
+                names.setdefault(normalize_skill(skill), skill)
+        self.vocabulary = sorted(names)
+        self.labels = [names[skill] for skill in self.vocabulary]
+        self.columns = {skill: column for column, skill in enumerate(self.vocabulary)}
+
+        rows, columns = [], []
+        for row, (_, _, skills) in enumerate(jobs):
+            for column in {self.columns[normalize_skill(skill)] for skill in skills or []}:
+                rows.append(row)
+                columns.append(column)
+        rows = np.array(rows, dtype=np.int64)
+        columns = np.array(columns, dtype=np.int64)
+
+        self.packed = np.zeros((len(jobs), max(-(-len(self.vocabulary) // 8), 1)), dtype=np.uint8, order="F")
+        np.bitwise_or.at(self.packed, (rows, columns >> 3), (0x80 >> (columns & 7)).astype(np.uint8))
+        self.required = np.bincount(rows, minlength=len(jobs)).astype(np.int32)
+
+    def __len__(self):
+        return len(self.job_ids)
+
+    def _resume_columns(self, skills):
+        """Vocabulary columns of ``skills``; skills no job asks for are dropped."""
+        return sorted({self.columns[s] for s in map(normalize_skill, skills) if s in self.columns})
+
+    def scores(self, skills):
+        """(matched skill count, match percentage) for every job."""
+        matched = np.zeros(len(self), dtype=np.int32)
+        bit = np.empty(len(self), dtype=np.uint8)
+        for column in self._resume_columns(skills):
+            np.right_shift(self.packed[:, column >> 3], np.uint8(7 - (column & 7)), out=bit)
+            np.bitwise_and(bit, np.uint8(1), out=bit)
+            matched += bit
+        with np.errstate(divide="ignore", invalid="ignore"):
+            percentage = np.where(self.required > 0, matched * np.float32(100) / self.required, np.float32(0))
+        return matched, percentage
+
+    def _unpack(self, row):
+        return np.unpackbits(self.packed[row])[:len(self.vocabulary)].astype(bool)
+
+    def top_k(self, skills, k=10):
+        """
+        The ``k`` best-matching jobs for ``skills``, best first, each with its
+        matched and missing skills. Only those ``k`` rows are ever unpacked.
+        """
+        if not len(self):
+            return []
+        matched, percentage = self.scores(skills)
+        # Percentage first, then the number of matched skills breaks ties
+        rank = percentage * 1000 + matched
+        k = min(k, len(rank))
+        top = np.argpartition(-rank, k - 1)[:k]
+        top = top[np.argsort(-rank[top], kind="stable")]
+
+        resume = np.zeros(len(self.vocabulary), dtype=bool)
+        resume[self._resume_columns(skills)] = True
+        results = []
+        for row in top:
+            required = self._unpack(row)
+            results.append({
+                "job_id": int(self.job_ids[row]),
+                "title": self.titles[row],
+                "score": round(float(percentage[row]), 2),
+                "matched": [self.labels[c] for c in np.flatnonzero(required & resume)],
+                "missing": [self.labels[c] for c in np.flatnonzero(required & ~resume)],
+            })
+        return results
+
+
+# ------------------- Shared Matcher -------------------
+_matcher = None
+_signature = None
+_lock = threading.Lock()
+
+
+def get_matcher(db):
+    """
+    The process-wide matcher over the jobs table, rebuilt only when a job was
+    added, removed or updated since it was built.
+    """
+    global _matcher, _signature
+    from app.models.job import Job
+
+    signature = db.execute(select(func.count(Job.id), func.max(Job.updated_at))).one()
+    with _lock:
+        if _matcher is None or tuple(signature) != _signature:
+            jobs = db.execute(select(Job.id, Job.title, Job.skills)).all()
+            _matcher = JobMatcher([tuple(job) for job in jobs])
+            _matcher.version = _signature = tuple(signature)
+        return _matcher
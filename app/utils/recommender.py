@@ -1 +1,180 @@
- 
+import os
+import json
+import hashlib
+import threading
+from collections import OrderedDict
+
+from app.config.settings import COURSES_FILE
+from app.utils.matcher import normalize_skill
+
+LEVELS = {"beginner": 0, "intermediate": 1, "advanced": 2}
+
+
+class CourseCatalog:
+    """
+    Courses indexed by the skills they teach, plus the skill prerequisite graph.
+
+    Everything that does not depend on a resume is computed once here: the
+    ranked courses for each skill, and for each skill its learning path (all
+    transitive prerequisites in the order they should be learned).
+    """
+
+    def __init__(self, courses, prerequisites):
+        self.courses = {course["id"]: course for course in courses}
+        self.labels = {}
+
+        by_skill = {}
+        for course in courses:
+            for skill in course["skills"]:
+                self.labels.setdefault(normalize_skill(skill), skill)
+                by_skill.setdefault(normalize_skill(skill), []).append(course["id"])
+        # Easiest first, then the most focused course
+        self.by_skill = {
+            skill: sorted(ids, key=lambda i: (LEVELS.get(self.courses[i].get("level"), 1),
+                                              len(self.courses[i]["skills"]), self.courses[i]["title"]))
+            for skill, ids in by_skill.items()
+        }
+
+        self.prerequisites = {}
+        for skill, needs in prerequisites.items():
+            self.labels.setdefault(normalize_skill(skill), skill)
+            for need in needs:
+                self.labels.setdefault(normalize_skill(need), need)
+            self.prerequisites[normalize_skill(skill)] = [normalize_skill(need) for need in needs]
+        self.paths = {skill: self._path(skill) for skill in self.labels}
+
+    def _path(self, skill):
+        """``skill``'s prerequisites in learning order (depth-first post-order), then ``skill``."""
+        path, done, visiting = [], set(), set()
+
+        def visit(node):
+            if node in done:
+                return
+            if node in visiting:
+                raise ValueError(f"Prerequisite cycle through {self.labels.get(node, node)!r}")
+            visiting.add(node)
+            for need in self.prerequisites.get(node, []):
+                visit(need)
+            visiting.discard(node)
+            done.add(node)
+            path.append(node)
+
+        visit(skill)
+        return path
+
+    @classmethod
+    def load(cls, path=COURSES_FILE):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return cls(data.get("courses", []), data.get("prerequisites", {}))
+
+    def learning_path(self, missing, known):
+        """Skills to learn for ``missing``, prerequisites first, skipping what is already ``known``."""
+        path = {}
+        for skill in map(normalize_skill, missing):
+            for step in self.paths.get(skill, [skill]):
+                if step not in known:
+                    path.setdefault(step, None)
+        return list(path)
+
+    def plan(self, path):
+        """One course per skill on ``path``; a course that covers several of them is used once."""
+        chosen, covered = [], set()
+        for skill in path:
+            if skill in covered or skill not in self.by_skill:
+                continue
+            course = self.courses[self.by_skill[skill][0]]
+            teaches = [s for s in map(normalize_skill, course["skills"]) if s in path]
+            covered.update(teaches)
+            chosen.append(dict(course, covers=[self.labels.get(s, s) for s in teaches]))
+        return chosen
+
+
+class Recommender:
+    """
+    Skill-gap course recommendations for a resume's top matching jobs.
+
+    A job's gap only depends on the resume's skill set and the job, so plans
+    are memoized per (skill-set hash, job id) in a bounded LRU; the results
+    page re-uses them instead of recomputing gaps on every view.
+    """
+
+    def __init__(self, catalog, maxsize=4096):
+        self.catalog = catalog
+        self.maxsize = maxsize
+        self._plans = OrderedDict()
+        self._lock = threading.Lock()
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def skill_set_key(skills):
+        normalized = sorted({normalize_skill(skill) for skill in skills})
+        return hashlib.sha1("\n".join(normalized).encode("utf-8")).hexdigest()
+
+    def job_plan(self, skills_key, known, job_id, missing):
+        key = (skills_key, job_id)
+        with self._lock:
+            plan = self._plans.get(key)
+            if plan is not None:
+                self._plans.move_to_end(key)
+                self.hits += 1
+                return plan
+            self.misses += 1
+
+        path = self.catalog.learning_path(missing, known)
+        plan = {
+            "path": [self.catalog.labels.get(skill, skill) for skill in path],
+            "courses": self.catalog.plan(path),
+        }
+        with self._lock:
+            self._plans[key] = plan
+            while len(self._plans) > self.maxsize:
+                self._plans.popitem(last=False)
+        return plan
+
+    def recommend(self, skills, matches, limit=5, version=None):
+        """
+        Plans for each of ``matches`` (``JobMatcher.top_k`` results), and the
+        ``limit`` courses that help with the most (and best-matching) jobs.
+
+        ``version`` identifies the jobs data; when it changes the memo is dropped.
+        """
+        with self._lock:
+            if version != self._version:
+                self._plans.clear()
+                self._version = version
+
+        skills_key = self.skill_set_key(skills)
+        known = {normalize_skill(skill) for skill in skills}
+        plans, weights, courses = [], {}, {}
+        for match in matches:
+            plan = self.job_plan(skills_key, known, match["job_id"], match["missing"])
+            plans.append(plan)
+            for course in plan["courses"]:
+                # A closer match makes its gap more worth closing
+                weights[course["id"]] = weights.get(course["id"], 0.0) + 1.0 + match["score"] / 100
+                courses.setdefault(course["id"], course)
+        ranked = sorted(weights, key=lambda i: (-weights[i], courses[i]["title"]))[:limit]
+        return plans, [courses[i] for i in ranked]
+
+    def stats(self):
+        with self._lock:
+            return {"size": len(self._plans), "maxsize": self.maxsize, "hits": self.hits, "misses": self.misses}
+
+
+_recommender = None
+_mtime = None
+_lock = threading.Lock()
+
+
+def get_recommender(path=COURSES_FILE):
+    """The process-wide recommender, rebuilt when the courses file changes."""
+    global _recommender, _mtime
+    mtime = os.stat(path).st_mtime_ns
+    with _lock:
+        if _recommender is None or mtime != _mtime:
+            _recommender = Recommender(CourseCatalog.load(path))
+            _mtime = mtime
+        return _recommender
@@ -1,11 +1,16 @@
-import pdfplumber
+import sys, os
+
+BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", ".."))
+# The Django project holds the shared PDF extraction engine
+sys.path.append(os.path.join(BASE_DIR, "Ai_Resume_detection"))
+
+from extractor.pdf_text import extract_pdf_text
+
 
 def extract_text_from_pdf(file_path):
-    text = ""
-    with pdfplumber.open(file_path) as pdf:
-        for page in pdf.pages:
-            text += page.extract_text() + "\n"
-    return text
-
-parsed_text = extract_text_from_pdf("D:\\Minor-Project\\data\\resume1.pdf")
-print(parsed_text)
\ No newline at end of file
+    # Memory-mapped, page-parallel for long files; pdfplumber when PyPDF2 finds no text
+    return extract_pdf_text(file_path)
+
+if __name__ == "__main__":
+    parsed_text = extract_text_from_pdf(sys.argv[1] if len(sys.argv) > 1 else "D:\\Minor-Project\\data\\resume1.pdf")
+    print(parsed_text)
@@ -0,0 +1,74 @@
+import io
+import sys, os
+import time
+import hashlib
+
+from app.config.settings import BASE_DIR
+
+# The Django project holds the extraction stack
+sys.path.append(os.path.join(BASE_DIR, "Ai_Resume_detection"))
+
+FILE_TYPES = {".pdf": "pdf", ".docx": "docx"}
+
+
+def setup_django():
+    os.environ.setdefault("DJANGO_SETTINGS_MODULE", "Ai_Resume_detection.settings")
+    import django
+    django.setup()
+
+
+def init_worker():
+    """
+    Process pool initializer: set up Django, and load the NLP models before the
+    first upload arrives unless the shared NLP service will run them.
+    """
+    from django.conf import settings
+
+    setup_django()
+    from extractor.model_registry import warm_up
+    from extractor.nlp_service import service_available
+    from extractor.pdf_text import mark_worker_process
+    mark_worker_process()
+    if not service_available():
+        warm_up(settings.NLP_WARMUP_MODELS)
+
+
+def preload():
+    """
+    Load everything ``parse_resume`` and the results page use, and create and
+    seed the jobs database, in the gunicorn master before it forks the workers;
+    returns the seconds it took.
+    """
+    from extractor.prefork import preload as preload_extractor
+    from app.config.database import engine, init_db
+    from app.utils.recommender import get_recommender
+    from app.utils.skill_extractor import get_skill_extractor
+
+    setup_django()
+    elapsed = preload_extractor()
+    started = time.monotonic()
+    init_db()
+    # Connections must not be shared between forked workers
+    engine.dispose()
+    get_skill_extractor()
+    get_recommender()
+    return elapsed + time.monotonic() - started
+
+
+def parse_resume(content, file_type):
+    """
+    Extract every field of one resume; runs in a pool process, since text
+    extraction and spaCy hold the GIL for the whole call.
+    """
+    from extractor.utils import extract_fields, extract_text
+    from app.utils.skill_extractor import get_skill_extractor
+
+    text = extract_text(io.BytesIO(content), file_type)
+    if not text:
+        return {"error": "No text could be extracted from the file."}
+
+    data = extract_fields(text)
+    # Aliases and typos ("ReactJS", "Javscript") count too
+    data["skills"] = get_skill_extractor().extract(text)
+    data["sha256"] = hashlib.sha256(content).hexdigest()
+    return data
@@ -1 +1,207 @@
- 
+import os
+import re
+import json
+import threading
+from functools import lru_cache
+from itertools import combinations
+
+from app.config.settings import SKILL_ALIASES_FILE, SKILLS_FILE
+
+# Words, keeping the inside of "node.js", "c++", "c#" and ".net" together
+_TOKEN_RE = re.compile(r"\.?[a-z0-9+#]+(?:[.\-_][a-z0-9+#]+)*")
+# Separators that do not change what a skill is: "Node.js" == "node js" == "NodeJS"
+_SEPARATOR_RE = re.compile(r"[\s\-_]+|(?<=\w)\.(?=\w)")
+
+
+def compact(text):
+    return _SEPARATOR_RE.sub("", text.lower())
+
+
+def _tokens(text):
+    return [compact(token) for token in _TOKEN_RE.findall(text.lower())]
+
+
+def edit_distance(a, b, limit):
+    """
+    Optimal string alignment distance (Levenshtein plus adjacent transpositions)
+    between ``a`` and ``b``, or ``limit + 1`` as soon as it is known to exceed ``limit``.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2, previous = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        current = [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], previous2[j - 2] + 1)
+        if min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class SkillExtractor:
+    """
+    Finds skills in a text, tolerating aliases, spacing and typos.
+
+    Every skill name and alias is reduced to a compact key without case,
+    spaces, dashes or inner dots, so "Node JS", "nodejs" and "Node.js" share
+    one key, and word n-grams of the text are looked up by the same key.
+
+    Keys that find no exact match are looked up in a SymSpell deletion
+    dictionary: every key is stored under all the strings obtained by deleting
+    up to ``max_distance`` of its characters, and a term is looked up under its
+    own deletions. The number of lookups depends only on the term's length,
+    not on the number of skills; the few candidates found are then checked
+    with a real edit distance.
+    """
+
+    def __init__(self, skills, aliases=None, fuzzy_min_length=6, long_term_length=9, cache_size=65536):
+        self.skills = []
+        self.keys = {}
+        self.names = []
+        for skill in skills:
+            self._add(skill, skill)
+        for skill, names in (aliases or {}).items():
+            self._add(skill, skill)
+            for name in names:
+                self._add(skill, name)
+        self.order = {skill: i for i, skill in enumerate(self.skills)}
+        # Longest name in words, which bounds the n-grams to look up
+        self.max_words = max((len(_tokens(name)) for name in self.names), default=1)
+
+        # Short words are too easy to mistype into another word ("flash", "reach")
+        self.fuzzy_min_length = fuzzy_min_length
+        self.long_term_length = long_term_length
+        self.deletes = {}
+        for key in self.keys:
+            if len(key) >= fuzzy_min_length:
+                for variant in self._variants(key):
+                    self.deletes.setdefault(variant, set()).add(key)
+        self.fuzzy_lookup = lru_cache(maxsize=cache_size)(self._fuzzy_lookup)
+
+    def _add(self, skill, name):
+        key = compact(name)
+        if not key:
+            return
+        if skill not in self.skills:
+            self.skills.append(skill)
+        self.keys.setdefault(key, skill)
+        self.names.append(name)
+
+    @classmethod
+    def load(cls, skills_file=SKILLS_FILE, aliases_file=SKILL_ALIASES_FILE, **kwargs):
+        with open(skills_file, "r", encoding="utf-8") as f:
+            skills = json.load(f).get("skills", [])
+        aliases = {}
+        if os.path.exists(aliases_file):
+            with open(aliases_file, "r", encoding="utf-8") as f:
+                aliases = json.load(f).get("aliases", {})
+        return cls(skills, aliases, **kwargs)
+
+    # ------------------- Lookup -------------------
+    def max_distance(self, term):
+        if len(term) < self.fuzzy_min_length:
+            return 0
+        return 2 if len(term) >= self.long_term_length else 1
+
+    def _variants(self, term):
+        """``term`` and every string made by deleting up to ``max_distance`` characters from it."""
+        variants = {term}
+        for count in range(1, self.max_distance(term) + 1):
+            for positions in combinations(range(len(term)), count):
+                variants.add("".join(c for i, c in enumerate(term) if i not in positions))
+        return variants
+
+    def _fuzzy_lookup(self, term):
+        limit = self.max_distance(term)
+        if not limit:
+            return None
+        candidates = set()
+        for variant in self._variants(term):
+            candidates.update(self.deletes.get(variant, ()))
+
+        best = None
+        for key in candidates:
+            # Typos rarely hit the first letter; requiring it keeps out most real words
+            if key[0] != term[0]:
+                continue
+            distance = edit_distance(term, key, min(limit, self.max_distance(key)))
+            if distance <= min(limit, self.max_distance(key)):
+                rank = (distance, self.order[self.keys[key]])
+                if best is None or rank < best[0]:
+                    best = (rank, self.keys[key])
+        return best[1] if best else None
+
+    def lookup(self, term):
+        """The skill ``term`` names (exactly, by alias or with a typo), or None."""
+        key = compact(term)
+        if key.startswith(".") and key not in self.keys:
+            key = key[1:]
+        return self.keys.get(key) or self.fuzzy_lookup(key)
+
+    # ------------------- Extraction -------------------
+    def _scan(self, text):
+        tokens = _tokens(text)
+        found = set()
+        i = 0
+        while i < len(tokens):
+            # Longest n-gram first, so "java script" is JavaScript rather than Java
+            for n in range(min(self.max_words, len(tokens) - i), 0, -1):
+                skill = self.lookup("".join(tokens[i:i + n]))
+                if skill:
+                    found.add(skill)
+                    i += n
+                    break
+            else:
+                i += 1
+        return sorted(found, key=self.order.__getitem__)
+
+    def extract(self, text):
+        """The skills found in ``text``, in dictionary order."""
+        return self._scan(text or "")
+
+    def extract_many(self, texts):
+        """
+        Batch version of ``extract`` for bulk ingestion. Identical texts are
+        scanned once, and typo lookups are shared through the lookup cache, so
+        the words that recur across a batch are only corrected once.
+        """
+        results, found = {}, []
+        for text in texts:
+            text = text or ""
+            if text not in results:
+                results[text] = self._scan(text)
+            found.append(list(results[text]))
+        return found
+
+    def stats(self):
+        info = self.fuzzy_lookup.cache_info()
+        return {"skills": len(self.skills), "keys": len(self.keys), "deletes": len(self.deletes),
+                "cache_hits": info.hits, "cache_misses": info.misses}
+
+
+_extractor = None
+_signature = None
+_lock = threading.Lock()
+
+
+def _stat(path):
+    try:
+        return os.stat(path).st_mtime_ns
+    except FileNotFoundError:
+        return None
+
+
+def get_skill_extractor(skills_file=SKILLS_FILE, aliases_file=SKILL_ALIASES_FILE):
+    """The process-wide extractor, rebuilt when the skills or aliases file changes."""
+    global _extractor, _signature
+    signature = (skills_file, aliases_file, _stat(skills_file), _stat(aliases_file))
+    with _lock:
+        if _extractor is None or signature != _signature:
+            _extractor = SkillExtractor.load(skills_file, aliases_file)
+            _signature = signature
+        return _extractor
+
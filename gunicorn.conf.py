@@ -0,0 +1,58 @@
+"""
+Production server for the FastAPI app (gunicorn picks this file up from the
+working directory):
+
+    gunicorn run:app
+
+Uvicorn workers forked from one master. The master loads the NLP models,
+the skill dictionaries and the course catalog once, freezes them and forks;
+the workers share that memory copy-on-write and parse uploads themselves
+(PARSE_WORKERS=0) instead of each starting a pool of processes with their
+own copies of the models. See Ai_Resume_detection/extractor/prefork.py.
+Everything below can be set from the environment.
+"""
+import gc
+import os
+
+
+def env_int(name, default):
+    value = os.environ.get(name, "").strip()
+    return int(value) if value else default
+
+
+# Nothing the master allocates from here on is collected; see extractor/prefork.py
+gc.disable()
+# The master loads the models itself before forking; a background warm-up
+# thread started by the Django app's ready() could still be running at fork time
+os.environ["NLP_WARMUP"] = "0"
+os.environ.setdefault("PARSE_WORKERS", "0")
+
+bind = os.environ.get("GUNICORN_BIND", "0.0.0.0:8000")
+workers = env_int("WEB_CONCURRENCY", os.cpu_count() or 1)
+worker_class = "uvicorn.workers.UvicornWorker"
+preload_app = True
+
+# Workers are replaced after this many requests (plus up to the jitter, so
+# they do not all restart together), which returns memory they have unshared
+max_requests = env_int("GUNICORN_MAX_REQUESTS", 1000)
+max_requests_jitter = env_int("GUNICORN_MAX_REQUESTS_JITTER", 100)
+# Large PDFs can take a while to parse
+timeout = env_int("GUNICORN_TIMEOUT", 120)
+graceful_timeout = env_int("GUNICORN_GRACEFUL_TIMEOUT", 30)
+
+accesslog = "-"
+
+
+def when_ready(server):
+    from app.utils.resume_pipeline import preload
+    server.log.info("Models and dictionaries preloaded in %.1fs", preload())
+
+
+def pre_fork(server, worker):
+    from extractor.prefork import freeze
+    server.log.debug("%d objects frozen before forking", freeze())
+
+
+def post_fork(server, worker):
+    from extractor.prefork import worker_started
+    worker_started()
@@ -1,9 +1,16 @@
- 
-from fastapi import FastAPI, Request, UploadFile, File, Form
+from urllib.parse import urlencode
+
+from fastapi import FastAPI, Request, Depends
 from fastapi.responses import HTMLResponse, RedirectResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 
+from app.config.database import get_db, init_db
+from app.config.settings import RESULTS_TOP_K
+from app.utils.matcher import get_matcher
+from app.utils.recommender import get_recommender
+from app.routers import resume
+
 app = FastAPI()
 
 # Static & Templates config
@@ -11,26 +18,44 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 
 templates = Jinja2Templates(directory="templates")
 
+app.include_router(resume.router)
+
+
+@app.on_event("startup")
+def startup():
+    init_db()
+
+
 # Home page (resume upload)
 @app.get("/", response_class=HTMLResponse)
 async def index(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
-# Upload resume (dummy handling)
+# Upload resume: extract its skills and show the matching jobs
 @app.post("/upload_resume")
-async def upload_resume(file: UploadFile = File(...)):
-    # ⚡ For now, we are not parsing the resume
-    # Later: save file, extract skills via NLP
-    return RedirectResponse(url="/results", status_code=303)
+async def upload_resume(request: Request):
+    # Parsed in the resume router's process pool, so other requests keep being served
+    data = await resume.process_upload(request)
+    skills = data["skills"]
+    return RedirectResponse(url="/results?" + urlencode({"skills": ",".join(skills)}), status_code=303)
 
-# Results page (dummy data)
+# Results page: top matching jobs for the resume's skills
 @app.get("/results", response_class=HTMLResponse)
-async def results(request: Request):
-    dummy_data = {
-        "skills": ["Python", "SQL", "Machine Learning"],
-        "jobs": [
-            {"title": "Data Analyst", "score": "75%", "missing": "PowerBI", "course": "https://www.coursera.org"},
-            {"title": "ML Engineer", "score": "60%", "missing": "TensorFlow", "course": "https://www.youtube.com"},
-        ]
-    }
-    return templates.TemplateResponse("results.html", {"request": request, "data": dummy_data})
+def results(request: Request, skills: str = "", db=Depends(get_db)):
+    skills = [skill.strip() for skill in skills.split(",") if skill.strip()]
+    matcher = get_matcher(db)
+    matches = matcher.top_k(skills, RESULTS_TOP_K)
+    # Course plans are memoized per (skill set, job), so reloading the page is cheap
+    plans, courses = get_recommender().recommend(skills, matches, version=matcher.version)
+    jobs = []
+    for match, plan in zip(matches, plans):
+        course = plan["courses"][0] if plan["courses"] else None
+        jobs.append({
+            "title": match["title"],
+            "score": f"{match['score']:g}%",
+            "missing": ", ".join(match["missing"]) or "Nothing",
+            "course": course["url"] if course else "",
+            "course_title": course["title"] if course else "",
+        })
+    data = {"skills": skills, "jobs": jobs, "courses": courses}
+    return templates.TemplateResponse("results.html", {"request": request, "data": data})
@@ -13,7 +13,7 @@ document.getElementById("resumeForm")?.addEventListener("submit", async (e) => {
     });
   
     if (response.ok) {
-      window.location.href = "/results"; // Redirect to results page
+      window.location.href = response.url; // Results page for the extracted skills
     } else {
       alert("Upload failed!");
     }
@@ -0,0 +1,81 @@
+import numpy as np
+import pytest
+
+from app.nlp.embedding_model import EmbeddingEngine, EmbeddingModel, VectorStore
+
+CORPUS = [
+    "Python developer building Django REST APIs on PostgreSQL",
+    "Backend engineer, Python, Flask and Redis caching",
+    "Frontend developer with React, TypeScript and CSS",
+    "Data engineer running Spark and Airflow pipelines on AWS",
+    "DevOps engineer: Docker, Kubernetes, Terraform and Jenkins",
+    "Machine learning engineer training PyTorch models in Python",
+    "Java Spring Boot microservices with Kafka",
+    "Full stack developer, Node.js, React and MongoDB",
+]
+
+
+@pytest.fixture(scope="module")
+def model():
+    return EmbeddingModel(dim=4).fit(CORPUS)
+
+
+def test_encode_shape_and_normalisation(model):
+    vectors = model.encode(CORPUS + ["", "nothing in the vocabulary"], batch_size=3)
+    assert vectors.shape == (len(CORPUS) + 2, 4)
+    assert vectors.dtype == np.float32
+    assert np.allclose(np.linalg.norm(vectors[:len(CORPUS)], axis=1), 1.0, atol=1e-5)
+    # Texts without known words stay zero instead of dividing by zero
+    assert not np.isnan(vectors).any()
+    assert np.allclose(model.encode(CORPUS[:1]), vectors[:1])
+
+
+def test_unfitted_model_raises():
+    with pytest.raises(RuntimeError):
+        EmbeddingModel().encode(["python"])
+
+
+def test_append_then_reopen(model, tmp_path):
+    store = VectorStore(tmp_path, model.dim, model.fingerprint())
+    reader = VectorStore(tmp_path, model.dim, model.fingerprint())
+    assert len(reader) == 0 and reader.vectors().shape == (0, model.dim)
+
+    vectors = model.encode(CORPUS)
+    assert store.append(range(4), vectors[:4]) == 4
+    assert store.append(["a", "b"], vectors[4:6]) == 6
+    # An open reader sees the appended rows through a fresh memory map
+    assert reader.ids() == ["0", "1", "2", "3", "a", "b"]
+    assert np.array_equal(reader.vectors(), vectors[:6])
+    assert np.array_equal(reader.get("a"), vectors[4])
+    assert reader.get("missing") is None
+
+    reopened = VectorStore(tmp_path, model.dim, model.fingerprint())
+    assert len(reopened) == 6
+    assert reopened.row_of("b") == 5
+    with pytest.raises(ValueError):
+        store.append(["c"], vectors[:2])
+
+
+def test_fingerprint_mismatch_raises(model, tmp_path):
+    VectorStore(tmp_path, model.dim, model.fingerprint()).append(["0"], model.encode(CORPUS[:1]))
+    other = EmbeddingModel(dim=4).fit(CORPUS[::-1] + ["Golang and gRPC services"])
+    assert other.fingerprint() != model.fingerprint()
+    with pytest.raises(ValueError, match="another embedding model"):
+        VectorStore(tmp_path, other.dim, other.fingerprint())
+    with pytest.raises(ValueError, match="4-d"):
+        VectorStore(tmp_path, 8)
+
+
+def test_engine_build_resets_and_load_reopens(tmp_path):
+    engine = EmbeddingEngine.build(CORPUS, tmp_path, dim=4)
+    assert engine.add_resumes(range(len(CORPUS)), CORPUS, batch_size=3) == len(CORPUS)
+    assert engine.add_jobs(["job-1"], ["Python Django developer"]) == 1
+
+    loaded = EmbeddingEngine.load(tmp_path)
+    assert loaded.model.fingerprint() == engine.model.fingerprint()
+    assert np.array_equal(loaded.resumes.vectors(), engine.resumes.vectors())
+
+    # A new model starts from empty stores instead of mixing projections
+    rebuilt = EmbeddingEngine.build(CORPUS[:6], tmp_path, dim=3)
+    assert len(rebuilt.resumes) == 0 and len(rebuilt.jobs) == 0
+    assert EmbeddingEngine.load(tmp_path).resumes.dim == rebuilt.model.dim
@@ -1 +1,148 @@
- 
+import hashlib
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import sessionmaker
+
+from app.config.database import Base
+from app.models.job import Job
+from app.utils import job_fetcher
+from app.utils.job_fetcher import Board, JobFetcher
+
+LAST_MODIFIED = "Mon, 06 Jan 2025 10:00:00 GMT"
+
+
+def posting(title, skills):
+    return (f"<html><head><title>{title}</title></head><body><h1>{title}</h1>"
+            f"<p class='company'>Acme</p><p class='location'>Remote</p>"
+            f"<div class='description'>We need {skills}.</div></body></html>")
+
+
+class Feed:
+    """Pages served by the stand-in board, and the requests it received."""
+
+    def __init__(self):
+        self.pages = {
+            "/jobs": "<a href='/jobs/1'>1</a> <a href='/jobs/2'>2</a> <a href='/jobs/3'>3</a>",
+            "/jobs/1": posting("Backend Developer", "Python and Django"),
+            "/jobs/2": posting("Frontend Developer", "JavaScript and React"),
+            "/jobs/3": posting("DevOps Engineer", "Docker and Kubernetes"),
+        }
+        self.requests = []
+        self.lock = threading.Lock()
+
+    def etag(self, path):
+        return '"' + hashlib.sha256(self.pages[path].encode()).hexdigest()[:16] + '"'
+
+    def log(self, path, status, headers):
+        with self.lock:
+            self.requests.append((path, status, headers.get("If-None-Match"), headers.get("If-Modified-Since")))
+
+    def take(self):
+        with self.lock:
+            requests, self.requests = self.requests, []
+        return requests
+
+
+def make_handler(feed):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path not in feed.pages:
+                feed.log(self.path, 404, self.headers)
+                self.send_error(404)
+                return
+            etag = feed.etag(self.path)
+            if self.headers.get("If-None-Match") == etag:
+                feed.log(self.path, 304, self.headers)
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            body = feed.pages[self.path].encode()
+            feed.log(self.path, 200, self.headers)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Last-Modified", LAST_MODIFIED)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    return Handler
+
+
+@pytest.fixture
+def feed():
+    feed = Feed()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(feed))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    feed.url = f"http://127.0.0.1:{server.server_address[1]}"
+    yield feed
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def session_factory(tmp_path, monkeypatch):
+    engine = create_engine(f"sqlite:///{tmp_path / 'jobs.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, expire_on_commit=False)
+    monkeypatch.setattr(job_fetcher, "SessionLocal", factory)
+    yield factory
+    engine.dispose()
+
+
+def stored_jobs(factory):
+    with factory() as db:
+        return {
+            job.url: (job.title, job.etag, job.content_hash, job.fetched_at, job.updated_at)
+            for job in db.scalars(select(Job).where(Job.source == "stand-in"))
+        }
+
+
+def test_sync_is_incremental(feed, session_factory):
+    board = Board("stand-in", feed.url + "/jobs", link_selector="a[href]",
+                  description_selector=".description")
+    fetcher = JobFetcher(concurrency=2, parse_workers=1, timeout=5)
+    posting_urls = {feed.url + f"/jobs/{n}" for n in (1, 2, 3)}
+
+    # First sync: every posting is fetched and upserted
+    stats = fetcher.sync(board)
+    assert stats["postings"] == 3
+    assert stats["upserted"] == 3
+    assert stats["errors"] == 0
+    first = stored_jobs(session_factory)
+    assert set(first) == posting_urls
+    assert first[feed.url + "/jobs/1"][0] == "Backend Developer"
+    assert all(status == 200 for _, status, _, _ in feed.take())
+
+    # Second sync: conditional GETs everywhere, all answered 304, nothing written
+    stats = fetcher.sync(board)
+    assert stats["not_modified"] == 3
+    assert stats["upserted"] == 0
+    requests = feed.take()
+    assert len(requests) == 4
+    for path, status, if_none_match, if_modified_since in requests:
+        assert status == 304
+        assert if_none_match == feed.etag(path)
+        assert if_modified_since == LAST_MODIFIED
+    assert stored_jobs(session_factory) == first
+
+    # One posting changes: only it is downloaded again and upserted
+    feed.pages["/jobs/2"] = posting("Senior Frontend Developer", "TypeScript and React")
+    stats = fetcher.sync(board)
+    assert stats["not_modified"] == 2
+    assert stats["upserted"] == 1
+    assert [path for path, status, _, _ in feed.take() if status == 200] == ["/jobs/2"]
+    third = stored_jobs(session_factory)
+    assert third[feed.url + "/jobs/2"][0] == "Senior Frontend Developer"
+    assert third[feed.url + "/jobs/2"][2] != first[feed.url + "/jobs/2"][2]
+    for n in (1, 3):
+        url = feed.url + f"/jobs/{n}"
+        assert third[url] == first[url]
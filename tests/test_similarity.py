@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+from app.nlp.similarity import IVFIndex
+
+
+@pytest.fixture(scope="module")
+def vectors():
+    rng = np.random.default_rng(0)
+    vectors = rng.standard_normal((5_000, 32)).astype(np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+
+def exact_top(vectors, query, k):
+    return set(np.argsort(-(vectors @ query))[:k])
+
+
+def recall(index, vectors, k=10, **kwargs):
+    hits = 0
+    for row in range(0, len(vectors), 250):
+        ids, _ = index.search(vectors[row], k=k, **kwargs)
+        hits += len(set(ids) & exact_top(vectors, vectors[row], k))
+    return hits / (k * len(range(0, len(vectors), 250)))
+
+
+def test_probing_every_list_is_exact(vectors):
+    index = IVFIndex.build(np.arange(len(vectors)), vectors, nlist=32)
+    assert recall(index, vectors, nprobe=32) == 1.0
+    ids, scores = index.search(vectors[42], k=5, nprobe=32)
+    assert ids[0] == 42
+    assert list(scores) == sorted(scores, reverse=True)
+
+
+def test_recall_grows_with_nprobe(vectors):
+    index = IVFIndex.build(np.arange(len(vectors)), vectors, nlist=32)
+    assert recall(index, vectors, nprobe=1) <= recall(index, vectors, nprobe=8) <= recall(index, vectors, nprobe=32)
+
+
+def test_pq_with_refine(vectors):
+    index = IVFIndex.build(np.arange(len(vectors)), vectors, nlist=16, pq_m=8)
+    assert recall(index, vectors, nprobe=16, refine=vectors) >= 0.9
+
+
+def test_save_and_load(vectors, tmp_path):
+    index = IVFIndex.build(np.array([f"doc-{i}" for i in range(len(vectors))]), vectors, nlist=16)
+    index.save(tmp_path)
+    loaded = IVFIndex.load(tmp_path)
+    for row in (0, 7, 4_999):
+        before, after = index.search(vectors[row], k=5), loaded.search(vectors[row], k=5)
+        assert list(before[0]) == list(after[0])
+        assert np.allclose(before[1], after[1])
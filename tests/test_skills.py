@@ -1 +1,40 @@
- 
+import pytest
+
+from app.utils.skill_extractor import SkillExtractor, edit_distance
+
+
+@pytest.fixture(scope="module")
+def extractor():
+    return SkillExtractor.load()
+
+
+def test_names_aliases_and_spacing(extractor):
+    assert extractor.extract("Built services in Python 3 with DRF, Node JS and ReactJS on K8s") == \
+        ["Python", "Django", "React", "Node.js", "Kubernetes"]
+
+
+def test_typos(extractor):
+    assert extractor.extract("Djnago and Kuberentes") == ["Django", "Kubernetes"]
+    # Too short to correct safely
+    assert extractor.extract("Jaav") == []
+
+
+@pytest.mark.parametrize("text", [
+    "Code on github.com/someone",
+    "Pipelines on GitLab CI",
+    "Lit a torch",
+    "500 ml of water",
+])
+def test_ambiguous_words_are_not_skills(extractor, text):
+    assert extractor.extract(text) == []
+
+
+def test_extract_many_matches_extract(extractor):
+    texts = ["Python and Git", "", None, "Python and Git", "PyTorch, Machine Learning"]
+    assert extractor.extract_many(texts) == [extractor.extract(text) for text in texts]
+
+
+def test_edit_distance():
+    assert edit_distance("django", "djnago", 2) == 1
+    assert edit_distance("kubernetes", "kuberentes", 2) == 1
+    assert edit_distance("python", "java", 2) == 3